@@ -0,0 +1,6 @@
+"""Reproducible benchmarks of the stepping engines.
+
+Run with:
+
+    python -m benchmarks --output results.json --baseline benchmarks/baseline.json
+"""
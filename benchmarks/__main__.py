@@ -0,0 +1,98 @@
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+
+from benchmarks.suite import (REPEATS, RUNNERS, SIZES, cases, environment, reference,
+                              regressions, run_isolated_case, same_environment)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Game of Life engines')
+    parser.add_argument('--engines', nargs='+', choices=sorted(RUNNERS), default=sorted(RUNNERS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(SIZES),
+                        help='sides of the random square boards (default: %(default)s)')
+    parser.add_argument('--no-patterns', action='store_true',
+                        help='skip the files in the "patterns" folder')
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help='minimum seconds to step each case (default: %(default)s)')
+    parser.add_argument('--repeats', type=int, default=REPEATS,
+                        help='timed repeats of each case, the fastest one counts '
+                             '(default: %(default)s)')
+    parser.add_argument('--output', default='bench_results.json',
+                        help='results file (default: %(default)s)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='results of an earlier run on this machine to compare with '
+                             '(default: %(default)s)')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='slowdown reported as a regression (default: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store the results as the new baseline')
+    args = parser.parse_args()
+
+    results = {'environment': environment(), 'results': []}
+
+    for name, board in cases(sizes=args.sizes, patterns=not args.no_patterns):
+        # Stepped once per case, the per-cell reference is slow
+        expected = reference(board)
+        for engine in args.engines:
+            record = run_isolated_case(engine, name, board, expected=expected,
+                                       min_time=args.min_time, repeats=args.repeats)
+            if record is None:
+                continue
+
+            results['results'].append(record)
+            print('{engine:>10} {case:>24} {seconds_per_generation:10.6f} s/gen '
+                  '{allocated_bytes:>12} B {identical}'.format(**record))
+
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+    failed = False
+
+    mismatches = [record for record in results['results'] if not record['identical']]
+    for record in mismatches:
+        print('MISMATCH: {engine} differs from the {reference} engine on {case}'.format(**record))
+        failed = True
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        if same_environment(results, baseline):
+            slower = regressions(results, baseline, threshold=args.threshold)
+            if slower:
+                # A slowdown has to show up in a second run of the case as well
+                names = set(record['case'] for record in slower)
+                boards = dict((name, board) for name, board in
+                              cases(sizes=args.sizes, patterns=not args.no_patterns)
+                              if name in names)
+                reruns = [run_isolated_case(record['engine'], record['case'],
+                                            boards[record['case']], min_time=args.min_time,
+                                            repeats=args.repeats)
+                          for record in slower]
+                slower = regressions({'results': reruns}, baseline, threshold=args.threshold)
+
+            for record in slower:
+                print('REGRESSION: {engine} on {case} takes {ratio:.2f}x the median baseline time'
+                      .format(**record))
+                failed = True
+        else:
+            # Timings of another machine or Python say nothing about this change
+            print('WARNING: {} was made in another environment, not comparing: {}'.format(
+                args.baseline, json.dumps(baseline['environment'], sort_keys=True)))
+    else:
+        print('No baseline at {}, run with --save-baseline to create one'.format(args.baseline))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
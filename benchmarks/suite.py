@@ -0,0 +1,373 @@
+"""Benchmark cases and engine runners.
+
+Every engine is measured in its own native representation (tuples for the
+per-cell engine, packed words for the bit-packed engine and so on), so the
+conversion from and to flat cell tuples is not part of the timings.
+
+Every case runs in a fresh process (see :func:`run_isolated_case`), so the
+peak resident memory recorded is that of the case alone. The time of a case
+is the fastest of several repeats, which is the least disturbed by whatever
+else runs on the machine; the median is recorded next to it.
+"""
+import gc
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from queue import Empty
+
+import numpy
+
+from gol_core import bitpacked, blocks, hashlife, sparse, tiled, vectorized
+from gol_core.engines import ENGINES
+from gol_core.loaders import load
+from gol_core.metrics import peak_memory
+
+import gol
+
+PATTERNS_DIR = os.path.join(os.path.dirname(__file__), '..', 'patterns')
+
+SIZES = (64, 256, 1024, 2048, 4096, 8192)
+DENSITY = 0.3
+SEED = 1
+REPEATS = 5
+
+
+class Runner(object):
+    """Steps one engine in its native representation.
+
+    ``max_cells`` is the largest board the engine is benchmarked on, to keep
+    the slow engines from taking hours.
+    """
+
+    max_cells = None
+
+    def __init__(self, board):
+        self.rows, self.cols = board.shape
+
+    @classmethod
+    def supports(cls, board):
+        """Whether the engine can step the board at all."""
+        return cls.max_cells is None or board.size <= cls.max_cells
+
+    def step(self):
+        raise NotImplementedError
+
+    def result(self):
+        """Return the current generation as a ``uint8`` array."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PythonRunner(Runner):
+    max_cells = 256 * 256
+
+    def __init__(self, board):
+        super(PythonRunner, self).__init__(board)
+        self.cells = tuple(board.astype(bool).ravel().tolist())
+
+    def step(self):
+        self.cells = gol.calculate_next_generation(self.rows, self.cols, self.cells)
+
+    def result(self):
+        return vectorized.to_array(self.rows, self.cols, self.cells)
+
+
+class NumpyRunner(Runner):
+
+    def __init__(self, board):
+        super(NumpyRunner, self).__init__(board)
+        self.board = vectorized.DoubleBuffer(board)
+
+    def step(self):
+        self.board.step()
+
+    def result(self):
+        return self.board.current.copy()
+
+
+class BitPackedRunner(Runner):
+
+    def __init__(self, board):
+        super(BitPackedRunner, self).__init__(board)
+        self.board = bitpacked.pack(self.rows, self.cols, board.ravel())
+
+    def step(self):
+        self.board = bitpacked.step(self.board, self.cols)
+
+    def result(self):
+        return bitpacked.unpack(self.board, self.cols)
+
+
+class BlocksRunner(Runner):
+    max_cells = 1024 * 1024
+
+    def __init__(self, board):
+        super(BlocksRunner, self).__init__(board)
+        self.board = blocks.BlockBoard(self.rows, self.cols, board.ravel().tolist())
+
+    def step(self):
+        self.board.step()
+
+    def result(self):
+        return vectorized.to_array(self.rows, self.cols, self.board.cells())
+
+
+class HashLifeRunner(Runner):
+    max_cells = 128 * 128
+
+    def __init__(self, board):
+        super(HashLifeRunner, self).__init__(board)
+        self.board = hashlife.HashLifeBoard(self.rows, self.cols, board.ravel().tolist())
+
+    def step(self):
+        self.board.step()
+
+    def result(self):
+        return vectorized.to_array(self.rows, self.cols, self.board.cells())
+
+
+class SparseRunner(Runner):
+    max_cells = 1024 * 1024
+
+    def __init__(self, board):
+        super(SparseRunner, self).__init__(board)
+        ys, xs = numpy.nonzero(board)
+        self.live = set(zip(xs.tolist(), ys.tolist()))
+
+    def step(self):
+        self.live = sparse.step(self.live, self.rows, self.cols)
+
+    def result(self):
+        board = numpy.zeros((self.rows, self.cols), dtype=numpy.uint8)
+        if self.live:
+            xs, ys = zip(*self.live)
+            board[list(ys), list(xs)] = 1
+        return board
+
+
+class TiledRunner(Runner):
+
+    def __init__(self, board):
+        super(TiledRunner, self).__init__(board)
+        self.board = tiled.TiledBoard(board)
+
+    def step(self):
+        self.board.step()
+
+    def result(self):
+        return self.board.to_array()
+
+
+class ParallelRunner(Runner):
+
+    def __init__(self, board):
+        from gol_core import parallel
+
+        super(ParallelRunner, self).__init__(board)
+        self.board = parallel.ParallelBoard(board)
+
+    def step(self):
+        self.board.step()
+
+    def result(self):
+        return self.board.to_array()
+
+    def close(self):
+        self.board.close()
+
+
+RUNNERS = {
+    'python': PythonRunner,
+    'numpy': NumpyRunner,
+    'bitpacked': BitPackedRunner,
+    'blocks': BlocksRunner,
+    'hashlife': HashLifeRunner,
+    'sparse': SparseRunner,
+    'tiled': TiledRunner,
+    'parallel': ParallelRunner,
+}
+
+assert set(RUNNERS) == set(ENGINES), 'Every engine needs a benchmark runner'
+
+
+def cases(sizes=SIZES, patterns=True):
+    """Yield ``(name, board)`` for the random boards and the pattern files."""
+    for size in sizes:
+        random_state = numpy.random.RandomState(SEED)
+        board = (random_state.random_sample((size, size)) < DENSITY).astype(numpy.uint8)
+        yield 'random-{}'.format(size), board
+
+    if patterns:
+        for filename in sorted(os.listdir(PATTERNS_DIR)):
+            pattern = load(os.path.join(PATTERNS_DIR, filename))
+            yield os.path.splitext(filename)[0], pattern.array()
+
+
+def _time(runner, min_time, max_generations, repeats=REPEATS):
+    """Return the fastest and median seconds per generation and the generations stepped.
+
+    Every repeat steps for at least ``min_time / repeats`` seconds.
+    """
+    timings = []
+    total = 0
+    for _ in range(repeats):
+        generations = 0
+        started = time.time()
+        elapsed = 0
+        while (generations < max(max_generations // repeats, 1)
+               and (elapsed < min_time / repeats or generations == 0)):
+            runner.step()
+            generations += 1
+            elapsed = time.time() - started
+
+        timings.append(elapsed / generations)
+        total += generations
+
+    timings.sort()
+    return timings[0], timings[len(timings) // 2], total
+
+
+def _allocated(runner):
+    """Return the peak number of bytes allocated while stepping one generation."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        runner.step()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def reference(board, generations=4):
+    """Return the board ``generations`` later and the name of the engine which stepped it.
+
+    The per-cell engine of :mod:`gol` is the reference. Boards it would take
+    minutes to step are stepped with the NumPy engine instead, which the
+    smaller cases check against the per-cell engine.
+    """
+    if PythonRunner.supports(board):
+        rows, cols = board.shape
+        cells = tuple(board.astype(bool).ravel().tolist())
+        for _ in range(generations):
+            cells = gol.calculate_next_generation(rows, cols, cells)
+
+        return vectorized.to_array(rows, cols, cells), 'python'
+
+    for _ in range(generations):
+        board = vectorized.step(board)
+
+    return board, 'numpy'
+
+
+def run_case(engine, name, board, expected=None, min_time=0.5, max_generations=1000,
+             verify_generations=4, repeats=REPEATS):
+    """Benchmark one engine on one board, returns a result record or None when not supported.
+
+    ``expected`` is the result of :func:`reference` for the board, which is
+    calculated when not given.
+    """
+    runner_class = RUNNERS[engine]
+    if not runner_class.supports(board):
+        return None
+
+    if expected is None:
+        expected = reference(board, verify_generations)
+    expected, reference_engine = expected
+
+    runner = runner_class(board)
+    try:
+        for _ in range(verify_generations):
+            runner.step()
+        identical = bool(numpy.array_equal(runner.result(), expected))
+
+        seconds, median, generations = _time(runner, min_time, max_generations, repeats)
+        allocated = _allocated(runner)
+    finally:
+        runner.close()
+
+    return {
+        'engine': engine,
+        'case': name,
+        'rows': int(board.shape[0]),
+        'cols': int(board.shape[1]),
+        'generations': generations,
+        'seconds_per_generation': seconds,
+        'median_seconds_per_generation': median,
+        'cell_updates_per_second': board.size / seconds if seconds else None,
+        'allocated_bytes': allocated,
+        'peak_rss_bytes': peak_memory(),
+        'identical': identical,
+        'reference': reference_engine,
+    }
+
+
+def _run_case_in_child(queue, args, kwargs):
+    queue.put(run_case(*args, **kwargs))
+
+
+def run_isolated_case(engine, name, board, **kwargs):
+    """Run :func:`run_case` in a new process, see the module documentation."""
+    if not RUNNERS[engine].supports(board):
+        return None
+
+    # A fresh interpreter, a forked one would inherit the peak of this process
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_run_case_in_child,
+                              args=(queue, (engine, name, board), kwargs))
+    process.start()
+    try:
+        while True:
+            try:
+                return queue.get(timeout=1)
+            except Empty:
+                if not process.is_alive():
+                    raise RuntimeError('The benchmark of {} on {} died with exit code {}'.format(
+                        engine, name, process.exitcode))
+    finally:
+        process.join()
+
+
+def environment():
+    return {
+        'python': sys.version.split()[0],
+        'numpy': numpy.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def same_environment(results, baseline):
+    """Whether two runs were made with the same Python, NumPy and machine."""
+    return results['environment'] == baseline['environment']
+
+
+def regressions(results, baseline, threshold=0.25):
+    """Return the results which are more than ``threshold`` slower than the baseline.
+
+    A case is only slower when even its fastest repeat is slower than the
+    median of the baseline, so that a single disturbed run is not reported.
+    Only compare runs of the same environment (see :func:`same_environment`).
+    """
+    previous_records = dict(((record['engine'], record['case']), record)
+                            for record in baseline['results'])
+
+    slower = []
+    for record in results['results']:
+        previous = previous_records.get((record['engine'], record['case']))
+        if previous is None:
+            continue
+
+        baseline_seconds = previous['median_seconds_per_generation']
+        ratio = record['seconds_per_generation'] / baseline_seconds
+        if ratio > 1 + threshold:
+            slower.append(dict(record, baseline_seconds_per_generation=baseline_seconds,
+                               ratio=ratio))
+
+    return slower
@@ -24,21 +24,111 @@ Example:
 Run with:
 
     python gol.py <filename>
+
+Patterns in the RLE and Life 1.06 formats can be loaded as well.
+
+Select another stepping engine (see ``gol_core.engines``) with:
+
+    python gol.py --engine numpy <filename>
+
+Record the run to a compact binary file (see ``gol_core.recording``) with:
+
+    python gol.py --record <recording> <filename>
+
+Run without rendering, for example to compare engines, and write the final
+state to a file:
+
+    python gol.py --headless --generations 1000 --engine numpy --output <out> <filename>
+
+Stop as soon as the board turns into a still life or oscillator with:
+
+    python gol.py --auto-stop <filename>
+
+Run another Life-like rule (see ``gol_core.rules``) with:
+
+    python gol.py --rule B36/S23 <filename>
+
+Show the step and draw times, population, changed cells, generations per
+second and dropped frames, updated every second, with:
+
+    python gol.py --metrics 1 <filename>
+
+Write a timeline of the time spent stepping and drawing, to open in a trace
+viewer like chrome://tracing, with:
+
+    python gol.py --trace <trace.json> <filename>
+
+Write a checkpoint every 10 minutes and, when the same command is run again
+after the process died, resume from it instead of starting over:
+
+    python gol.py --checkpoint <run.ckpt> --checkpoint-interval 600 --resume <filename>
+
+Step a board once for any number of viewers: serve it on a Unix socket (or
+``localhost:<port>``) and show it in terminals or GTK windows connected to it:
+
+    python gol.py --serve /tmp/gol.sock <filename>
+    python gol.py --connect /tmp/gol.sock
 """
+from __future__ import print_function
+
 __author__ = 'Peter Slump <peter@yarf.nl>'
 __license__ = 'MIT'
 __version__ = '$Revision$'
 
-def calculate_next_generation(rows, cols, cells):
+from gol_core.rules import CONWAY, get_rule
+
+
+def calculate_next_generation(rows, cols, cells, rule=None):
     """Calculate next generation based on given cells. This function returns
     also a list of cells which it's easy to add again.
+
+    The rule is a :class:`gol_core.rules.Rule`, a rulestring like ``B36/S23``
+    or the name of a rule, Conway's Game of Life by default.
+    """
+    rule = get_rule(rule)
+
+    return tuple(get_new_state(i, rows, cols, cells, rule) for i, _ in enumerate(cells))
+
+
+def calculate_next_generation_delta(rows, cols, cells, rule=None):
+    """Calculate next generation together with the cells which changed.
+
+    Returns the new cells, the indices of the cells which came to life
+    (births) and the indices of the cells which died (deaths).
+
+    >>> cells = [
+    ...    False, False, False, False,
+    ...    True,  True,  True,  False,
+    ...    False, False, False, False,
+    ...    False, False, False, False
+    ... ]
+    >>> _, births, deaths = calculate_next_generation_delta(4, 4, cells)
+    >>> births, deaths
+    ((1, 9), (4, 6))
     """
-    return tuple(get_new_state(i, rows, cols, cells) for i, _ in enumerate(cells))
+    rule = get_rule(rule)
+
+    next_cells = []
+    births = []
+    deaths = []
+    for index, cell in enumerate(cells):
+        alive = get_new_state(index, rows, cols, cells, rule)
+        if alive and not cell:
+            births.append(index)
+        elif cell and not alive:
+            deaths.append(index)
+        next_cells.append(alive)
+
+    return tuple(next_cells), tuple(births), tuple(deaths)
 
 
-def get_new_state(index, rows, cols, cells):
+def get_new_state(index, rows, cols, cells, rule=CONWAY):
     """Calculate the new state of a cell in a next generation.
 
+    The 3x3 neighbourhood of the cell is looked up in the table of the rule
+    (a :class:`gol_core.rules.Rule`), the rules below are those of Conway's
+    Game of Life.
+
     ----
     Test all rules for the center cell.
     ----
@@ -50,7 +140,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, True,  False,
     ...    True,  False, False
     ... ]
-    >>> calculate_new_state(4, 3, 3, cells)
+    >>> get_new_state(4, 3, 3, cells)
     False
 
     Rule Two: Any live cell with two or three live neighbours lives on to the
@@ -60,7 +150,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, True,  False,
     ...    True,  False, False
     ... ]
-    >>> calculate_new_state(4, 3, 3, cells)
+    >>> get_new_state(4, 3, 3, cells)
     True
 
     >>> cells = [
@@ -68,7 +158,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, True,  True,
     ...    True,  False, False
     ... ]
-    >>> calculate_new_state(4, 3, 3, cells)
+    >>> get_new_state(4, 3, 3, cells)
     True
 
     Rule Three: Any live cell with more than three live neighbours dies, as if
@@ -78,7 +168,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, True,  False,
     ...    True,  False, True
     ... ]
-    >>> calculate_new_state(4, 3, 3, cells)
+    >>> get_new_state(4, 3, 3, cells)
     False
 
     Any dead cell with exactly three live neighbours becomes a live cell, as if
@@ -88,7 +178,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, False, False,
     ...    True,  False, False
     ... ]
-    >>> calculate_new_state(4, 3, 3, cells)
+    >>> get_new_state(4, 3, 3, cells)
     True
 
     >>> cells = [
@@ -96,7 +186,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, False, False,
     ...    True,  False, False
     ... ]
-    >>> calculate_new_state(4, 3, 3, cells)
+    >>> get_new_state(4, 3, 3, cells)
     False
 
     >>> cells = [
@@ -104,7 +194,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, False, False,
     ...    True,  False, True
     ... ]
-    >>> calculate_new_state(4, 3, 3, cells)
+    >>> get_new_state(4, 3, 3, cells)
     False
 
     ----
@@ -118,7 +208,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, False, True,
     ...    False, False, False
     ... ]
-    >>> calculate_new_state(0, 3, 3, cells)
+    >>> get_new_state(0, 3, 3, cells)
     False
 
     Rule Two: Any live cell with two or three live neighbours lives on to the
@@ -128,7 +218,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, False, True,
     ...    False, False, True
     ... ]
-    >>> calculate_new_state(0, 3, 3, cells)
+    >>> get_new_state(0, 3, 3, cells)
     True
 
     >>> cells = [
@@ -136,7 +226,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, False, True,
     ...    False, False, True
     ... ]
-    >>> calculate_new_state(0, 3, 3, cells)
+    >>> get_new_state(0, 3, 3, cells)
     True
 
     Rule Three: Any live cell with more than three live neighbours dies, as if
@@ -146,7 +236,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, True,  True,
     ...    False, True,  True
     ... ]
-    >>> calculate_new_state(0, 3, 3, cells)
+    >>> get_new_state(0, 3, 3, cells)
     False
 
     Rule Four: Any dead cell with exactly three live neighbours becomes a live
@@ -156,7 +246,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, True, False,
     ...    False, True, True
     ... ]
-    >>> calculate_new_state(0, 3, 3, cells)
+    >>> get_new_state(0, 3, 3, cells)
     True
 
     >>> cells = [
@@ -164,7 +254,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, False, True,
     ...    False, False, True
     ... ]
-    >>> calculate_new_state(0, 3, 3, cells)
+    >>> get_new_state(0, 3, 3, cells)
     False
 
     >>> cells = [
@@ -172,7 +262,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, True,  True,
     ...    False, True,  True
     ... ]
-    >>> calculate_new_state(0, 3, 3, cells)
+    >>> get_new_state(0, 3, 3, cells)
     False
 
     ----
@@ -185,7 +275,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, False, False,
     ...    False, False, True
     ... ]
-    >>> calculate_new_state(8, 3, 3, cells)
+    >>> get_new_state(8, 3, 3, cells)
     False
 
     Rule Two: Any live cell with two or three live neighbours lives on to the
@@ -195,7 +285,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, True, False,
     ...    False, False, True
     ... ]
-    >>> calculate_new_state(8, 3, 3, cells)
+    >>> get_new_state(8, 3, 3, cells)
     True
 
     >>> cells = [
@@ -203,7 +293,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, True,  False,
     ...    True,  False, True
     ... ]
-    >>> calculate_new_state(8, 3, 3, cells)
+    >>> get_new_state(8, 3, 3, cells)
     True
 
     Rule Three: Any live cell with more than three live neighbours dies, as if
@@ -213,7 +303,7 @@ def get_new_state(index, rows, cols, cells):
     ...    True,  True,  False,
     ...    False, False, True
     ... ]
-    >>> calculate_new_state(8, 3, 3, cells)
+    >>> get_new_state(8, 3, 3, cells)
     False
 
     Any dead cell with exactly three live neighbours becomes a live cell, as if
@@ -223,7 +313,7 @@ def get_new_state(index, rows, cols, cells):
     ...    True,  True,  False,
     ...    False, False, False
     ... ]
-    >>> calculate_new_state(8, 3, 3, cells)
+    >>> get_new_state(8, 3, 3, cells)
     True
 
     >>> cells = [
@@ -231,7 +321,7 @@ def get_new_state(index, rows, cols, cells):
     ...    False, False, False,
     ...    False, True, False
     ... ]
-    >>> calculate_new_state(8, 3, 3, cells)
+    >>> get_new_state(8, 3, 3, cells)
     False
 
     >>> cells = [
@@ -239,7 +329,7 @@ def get_new_state(index, rows, cols, cells):
     ...    True,  True,  False,
     ...    False, False, False
     ... ]
-    >>> calculate_new_state(8, 3, 3, cells)
+    >>> get_new_state(8, 3, 3, cells)
     False
 
     ----
@@ -250,14 +340,14 @@ def get_new_state(index, rows, cols, cells):
     ...    False, False, False, True,
     ...    False, False, True,  True
     ... ]
-    >>> calculate_new_state(11, 3, 4, cells)
+    >>> get_new_state(11, 3, 4, cells)
     True
     """
 
-    number_alive = 0
+    neighbourhood = 0
 
     # Calculate in which row and column we currently are
-    current_row = index / cols
+    current_row = index // cols
     current_col = index % cols
 
     # Loop through the rows from above to below current row
@@ -268,51 +358,310 @@ def get_new_state(index, rows, cols, cells):
             # torodial array (when you get of the grid you will enter
             # at the other side)
             cursor_index = (cursor_row % rows) * cols + (cursor_col % cols)
-            # Increase number if cell is alive and it's not the current cell
-            if cursor_index != index and cells[cursor_index]:
-                number_alive += 1
-
-                if number_alive > 3:
-                    break
-        if number_alive > 3:
-                    break
+            # Add the cell as the next bit of the table index
+            neighbourhood <<= 1
+            if cells[cursor_index]:
+                neighbourhood |= 1
 
-    return number_alive == 3 or (cells[index] and number_alive == 2)
+    return rule.table[neighbourhood] == 1
 
 if __name__ == '__main__':
+    import argparse
     import os
+    import sys
+    import threading
     import time
-    import fileinput
-
-    cols = None
-    rows = 0
-    cells = []
-    for line in fileinput.input():
-        line = line.strip()
-        if cols is None:
-            cols = len(line)
+
+    from gol_core.cycles import CycleDetector
+    from gol_core.engines import DEFAULT_ENGINE, ENGINES
+    from gol_core.loaders import dumps, load, loads
+    from gol_core.metrics import Metrics, throughput_report
+    from gol_core.rules import RULES
+    from gol_core.stream import generations
+    from gol_core.terminal import TerminalRenderer
+    from gol_core.tracing import Tracer
+
+    parser = argparse.ArgumentParser(description='Conway\'s Game of Life')
+    parser.add_argument('--engine', choices=sorted(ENGINES),
+                        help='stepping engine to use (default: {}, or the engine of a resumed '
+                             'checkpoint)'.format(DEFAULT_ENGINE))
+    parser.add_argument('--rule',
+                        help='rulestring like B36/S23 or one of {} (default: the rule in the '
+                             'pattern file, or B3/S23)'.format(', '.join(sorted(RULES))))
+    parser.add_argument('--auto-stop', action='store_true',
+                        help='stop when the board becomes periodic')
+    parser.add_argument('--record', metavar='FILE',
+                        help='record all generations to a file')
+    parser.add_argument('--fps', type=float,
+                        help='target frame rate, skip frames when stepping is faster')
+    parser.add_argument('--half-blocks', action='store_true',
+                        help='draw two rows of cells per line')
+    parser.add_argument('--generations', type=int, metavar='N',
+                        help='stop after N generations')
+    parser.add_argument('--headless', action='store_true',
+                        help='do not render, step as fast as possible and report the throughput')
+    parser.add_argument('--metrics', type=float, nargs='?', const=1.0, metavar='SECONDS',
+                        help='show live metrics, updated every SECONDS (default: 1)')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='write a timeline of stepping and drawing to a trace-event JSON file')
+    parser.add_argument('--checkpoint', metavar='FILE',
+                        help='periodically write a checkpoint to resume from to a file')
+    parser.add_argument('--checkpoint-interval', type=float, default=60, metavar='SECONDS',
+                        help='seconds between two checkpoints (default: %(default)s)')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue from the checkpoint file if it exists, instead of the '
+                             'pattern')
+    parser.add_argument('--serve', metavar='ADDRESS',
+                        help='do not render but serve the generations to clients on a Unix '
+                             'socket path or host:port (requires Python 3)')
+    parser.add_argument('--connect', metavar='ADDRESS',
+                        help='show the generations of a server instead of stepping a board')
+    parser.add_argument('--output', metavar='FILE',
+                        help='write the final state in the plaintext format (- for stdout)')
+    parser.add_argument('file', nargs='?',
+                        help='pattern file (plaintext, RLE or Life 1.06), or stdin')
+    args = parser.parse_args()
+
+    if args.resume and not args.checkpoint:
+        parser.error('--resume needs --checkpoint')
+
+    if args.checkpoint:
+        # Checkpoints need NumPy, the other engines and formats do not
+        from gol_core import checkpoint
+
+    if args.connect:
+        import socket
+
+        from gol_core.client import RemoteSimulation
+
+        remote = RemoteSimulation(args.connect)
+        try:
+            remote.start()
+        except (socket.error, ValueError) as error:
+            parser.error('Could not connect to {}: {}'.format(args.connect, error))
+
+        renderer = None
+        try:
+            while not remote.exhausted:
+                latest = remote.latest()
+                if latest is None:
+                    time.sleep(1.0 / args.fps if args.fps else .01)
+                    continue
+
+                generation, cells = latest[:2]
+                if renderer is None or (renderer.rows, renderer.cols) != (remote.rows, remote.cols):
+                    # The first board, or the server started another one
+                    if renderer:
+                        renderer.close()
+                    renderer = TerminalRenderer(remote.rows, remote.cols, fps=args.fps,
+                                                half_blocks=args.half_blocks)
+                renderer.render(generation, cells)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            remote.stop()
+            if renderer:
+                renderer.close()
+
+        if remote.error:
+            print(u'Lost the connection to {}: {}'.format(args.connect, remote.error),
+                  file=sys.stderr)
+        sys.exit()
+
+    engine = args.engine or DEFAULT_ENGINE
+    # The generation the run starts at
+    start = 0
+
+    if args.resume and os.path.exists(args.checkpoint):
+        if args.record:
+            # A recording starts at generation 0, a new one would replace the one of the run
+            parser.error('--record cannot continue the recording of a resumed run')
+
+        try:
+            resumed = checkpoint.load(args.checkpoint)
+        except ValueError as error:
+            parser.error('{}: {}'.format(args.checkpoint, error))
+
+        rows, cols, cells = resumed.rows, resumed.cols, resumed.cells()
+        start = resumed.generation
+        engine = args.engine or resumed.engine
+        pattern_rule = resumed.rule
+    else:
+        if args.file:
+            pattern = load(args.file)
         else:
-            assert cols == len(line)
-
-        cells += [x == 'X' for x in line]
-        rows += 1
-
-    generation = 0
-
-    while True:
-        os.system('clear')
-
-        generation += 1
-        line = []
-        print u' ' + (u'-' * cols)
-        for index, cell in enumerate(cells):
-            line.append(u'⚫' if cell else u' ')
-            if (index + 1) % cols == 0:
-                print u'|' + u''.join(line) + u'|'
-                line = []
-        print u' ' + (u'-' * cols)
-        print u'Rows: {}, Columns: {}, Generation: {}'.format(rows, cols,
-                                                              generation)
-        time.sleep(.01)
-
-        cells = calculate_next_generation(rows, cols, cells)
+            pattern = loads(getattr(sys.stdin, 'buffer', sys.stdin).read())
+
+        rows, cols, cells = pattern.rows, pattern.cols, pattern.cells()
+        pattern_rule = pattern.rule
+
+    try:
+        rule = get_rule(args.rule or pattern_rule)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.headless and args.generations is None and not args.auto_stop:
+        parser.error('--headless needs --generations or --auto-stop')
+
+    detector = CycleDetector()
+    recorder = None
+    if args.record:
+        # Recordings need NumPy, the other engines and formats do not
+        from gol_core.recording import Recorder
+
+        recorder = Recorder(args.record, rows, cols)
+    renderer = None
+    if not (args.headless or args.serve):
+        renderer = TerminalRenderer(rows, cols, fps=args.fps, half_blocks=args.half_blocks)
+
+    checkpointer = None
+    if args.checkpoint:
+        checkpointer = checkpoint.Checkpointer(args.checkpoint, rows, cols, rule=rule,
+                                               engine=engine, interval=args.checkpoint_interval)
+
+    # Stop at generation N, also when resumed beyond the start
+    limit = None
+    if args.generations is not None:
+        limit = max(args.generations - start, 0)
+
+    if args.serve:
+        from gol_core.server import SimulationServer
+
+        server = SimulationServer(rows, cols, cells, generation=start, engine=engine, rule=rule,
+                                  limit=limit, detector=detector if args.auto_stop else None,
+                                  checkpointer=checkpointer)
+        def announce():
+            server.listening.wait()
+            print(u'Serving on {}'.format(server.address), file=sys.stderr)
+
+        announcer = threading.Thread(target=announce)
+        announcer.daemon = True
+        announcer.start()
+        try:
+            server.run(args.serve)
+        except KeyboardInterrupt:
+            pass
+        except ValueError as error:
+            # The engine does not support the rule
+            parser.error(str(error))
+        finally:
+            if checkpointer:
+                checkpointer.offer(server.generation, server.cells, force=True)
+                checkpointer.close()
+        sys.exit()
+
+    # Without anyone looking at the generations in between, skip right to the last one. Live
+    # metrics are reported every interval, so they keep stepping one generation at a time.
+    stride = 1
+    if args.headless and limit and not (recorder or args.auto_stop or args.metrics is not None):
+        stride = limit
+
+    metrics = Metrics(enabled=args.metrics is not None, rate_interval=args.metrics or 1.0)
+    # The number of changed cells comes with the births and deaths
+    deltas = metrics.enabled and stride == 1
+    population = sum(1 for cell in cells if cell)
+    status = None
+    reported = step_started = started = time.time()
+    tracer = Tracer(enabled=args.trace is not None)
+    trace_started = tracer.now()
+    last_generation = start
+
+    stream = generations(rows, cols, cells, engine=engine, stride=stride, limit=limit, rule=rule,
+                         deltas=deltas, metrics=metrics)
+    try:
+        for state in stream:
+            generation, cells = state[:2]
+            generation += start
+            last_generation = generation
+
+            if tracer.enabled:
+                tracer.add('step', trace_started, tracer.now())
+
+            if metrics.enabled:
+                stepped = time.time()
+                changed = None
+                if deltas:
+                    births, deaths = state[2:]
+                    population += len(births) - len(deaths)
+                    changed = len(births) + len(deaths)
+                else:
+                    population = sum(1 for cell in cells if cell)
+                metrics.record_step(generation, stepped - step_started,
+                                    generations=stride if generation > start else 1)
+                metrics.record_cells(population, changed)
+
+                if stepped - reported >= args.metrics or status is None:
+                    reported = stepped
+                    status = metrics.summary()
+                    if args.headless:
+                        print(u'Generation {}: {}'.format(generation, status), file=sys.stderr)
+
+            if recorder:
+                with tracer.span('record'):
+                    recorder.add(cells)
+
+            if checkpointer:
+                checkpointer.offer(generation, cells)
+
+            if renderer:
+                with tracer.span('render'):
+                    if metrics.enabled:
+                        draw_started = time.time()
+                        if renderer.render(generation + 1, cells,
+                                           status=u'Generation: {}, {}'.format(generation + 1,
+                                                                              status)):
+                            metrics.record_draw(time.time() - draw_started)
+                        else:
+                            metrics.record_dropped()
+                    else:
+                        renderer.render(generation + 1, cells)
+
+            if args.auto_stop and detector.add(generation, cells):
+                break
+
+            if renderer and not args.fps:
+                time.sleep(.01)
+
+            if metrics.enabled:
+                step_started = time.time()
+            if tracer.enabled:
+                trace_started = tracer.now()
+    except KeyboardInterrupt:
+        pass
+    except ValueError as error:
+        # The engine does not support the rule
+        parser.error(str(error))
+    finally:
+        # Stops the workers of the parallel engine
+        stream.close()
+        if renderer:
+            renderer.close()
+        if recorder:
+            recorder.close()
+        if tracer.enabled:
+            tracer.save(args.trace)
+        if checkpointer:
+            checkpointer.offer(last_generation, cells, force=True)
+            checkpointer.close()
+            if checkpointer.error:
+                print(u'Could not write checkpoint {}: {}'.format(args.checkpoint,
+                                                                  checkpointer.error),
+                      file=sys.stderr)
+
+    elapsed = time.time() - started
+
+    if detector.settled:
+        print(u'Settled at generation {} with period {}'.format(detector.onset,
+                                                               detector.period),
+              file=sys.stderr if args.headless else sys.stdout)
+
+    if args.output:
+        output = dumps(rows, cols, cells)
+        if args.output == '-':
+            getattr(sys.stdout, 'buffer', sys.stdout).write(output)
+        else:
+            with open(args.output, 'wb') as file:
+                file.write(output)
+
+    if args.headless:
+        print(throughput_report(last_generation - start, rows * cols, elapsed), file=sys.stderr)
@@ -0,0 +1,5 @@
+"""Stepping engines and supporting tools shared by ``gol.py`` and ``gol_gtk``.
+
+Every engine exposes ``calculate_next_generation(rows, cols, cells)`` with the
+same flat, row-major cell layout as :func:`gol.calculate_next_generation`.
+"""
@@ -0,0 +1,194 @@
+"""Bit-packed stepping engine storing 64 cells per machine word.
+
+Each row of the board is packed into ``uint64`` words, cell ``n`` of a row
+being bit ``n % 64`` of word ``n // 64``. Padding bits at the end of a row are
+always kept zero. Neighbour sums are calculated with bitwise full-adder logic,
+so every array operation handles 64 cells at once. The rule is applied by
+selecting the cells whose sum has one of the values the rule lets live. The
+grid is toroidal: the wrap at the row edges is stitched in explicitly, even
+when the number of columns is not a multiple of 64.
+
+:func:`gol_core.stream.generations` keeps a :class:`BitPackedBoard` between
+generations, so a board is held as packed words (one bit per cell) and only
+unpacked for the generations which are yielded.
+"""
+import numpy
+
+from gol_core.rules import get_rule
+
+WORD_BITS = 64
+
+_ONE = numpy.uint64(1)
+_HIGH_BIT_SHIFT = numpy.uint64(WORD_BITS - 1)
+
+
+def words_per_row(cols):
+    return (cols + WORD_BITS - 1) // WORD_BITS
+
+
+def _last_word_mask(cols):
+    """Mask with the bits of the last word of a row that hold real cells."""
+    used = cols - (words_per_row(cols) - 1) * WORD_BITS
+
+    return numpy.uint64((1 << used) - 1)
+
+
+def pack(rows, cols, cells, chunk_cells=1 << 20):
+    """Pack a flat sequence of cells into a ``rows`` x ``words`` array.
+
+    The rows are packed a few at a time, so besides the packed words only
+    about ``chunk_cells`` bytes are used for the unpacked cells.
+    """
+    words = words_per_row(cols)
+    board = numpy.zeros((rows, words), dtype=numpy.uint64)
+
+    chunk_rows = max(chunk_cells // max(cols, 1), 1)
+    for start in range(0, rows, chunk_rows):
+        stop = min(start + chunk_rows, rows)
+
+        bits = numpy.zeros((stop - start, words * WORD_BITS), dtype=numpy.uint8)
+        bits[:, :cols] = numpy.array(cells[start * cols:stop * cols],
+                                     dtype=numpy.uint8).reshape(stop - start, cols)
+        board[start:stop] = numpy.packbits(bits, axis=1, bitorder='little').view('<u8')
+
+    return board
+
+
+def unpack(board, cols):
+    """Unpack a board into a two dimensional ``uint8`` array of cells."""
+    packed = board.astype('<u8').view(numpy.uint8)
+
+    return numpy.unpackbits(packed, axis=1, count=cols, bitorder='little')
+
+
+def _west(board, cols):
+    """Every cell replaced by the state of its left neighbour."""
+    shifted = board << _ONE
+    shifted[:, 1:] |= board[:, :-1] >> _HIGH_BIT_SHIFT
+
+    last_word, last_bit = divmod(cols - 1, WORD_BITS)
+    shifted[:, 0] |= (board[:, last_word] >> numpy.uint64(last_bit)) & _ONE
+    shifted[:, -1] &= _last_word_mask(cols)
+
+    return shifted
+
+
+def _east(board, cols):
+    """Every cell replaced by the state of its right neighbour."""
+    shifted = board >> _ONE
+    shifted[:, :-1] |= board[:, 1:] << _HIGH_BIT_SHIFT
+
+    last_word, last_bit = divmod(cols - 1, WORD_BITS)
+    shifted[:, last_word] |= (board[:, 0] & _ONE) << numpy.uint64(last_bit)
+    shifted[:, -1] &= _last_word_mask(cols)
+
+    return shifted
+
+
+def _row_sums(board, cols):
+    """Bit-sliced sum of each cell with its left and right neighbour.
+
+    Returns the ``(ones, twos)`` bit planes of the sum.
+    """
+    west = _west(board, cols)
+    east = _east(board, cols)
+
+    ones = west ^ board ^ east
+    twos = (west & board) | (east & (west ^ board))
+
+    return ones, twos
+
+
+def _equals(planes, total):
+    """Mask of the cells whose bit-sliced sum equals ``total``."""
+    mask = None
+    for bit, plane in enumerate(planes):
+        term = plane if total >> bit & 1 else ~plane
+        mask = term if mask is None else mask & term
+
+    return mask
+
+
+def step(board, cols, rule=None):
+    """Calculate the next generation of a packed board.
+
+    The sum of the 3x3 block around every cell (the cell included) is built
+    from the sums of three rows. For Conway's Game of Life a cell lives when
+    that sum is 3, or when it is 4 and the cell itself is alive.
+    """
+    if board.size == 0:
+        return board.copy()
+
+    rule = get_rule(rule)
+
+    ones, twos = _row_sums(board, cols)
+
+    above_ones, above_twos = numpy.roll(ones, 1, axis=0), numpy.roll(twos, 1, axis=0)
+    below_ones, below_twos = numpy.roll(ones, -1, axis=0), numpy.roll(twos, -1, axis=0)
+
+    # Weight one: full adder over the ones of the three rows
+    total_ones = above_ones ^ ones ^ below_ones
+    carry = (above_ones & ones) | (below_ones & (above_ones ^ ones))
+
+    # Weight two: the twos of the three rows and the carry
+    partial = above_twos ^ twos ^ below_twos
+    fours = (above_twos & twos) | (below_twos & (above_twos ^ twos))
+    total_twos = partial ^ carry
+    more_fours = partial & carry
+
+    # Weight four and eight
+    planes = (total_ones, total_twos, fours ^ more_fours, fours & more_fours)
+
+    result = numpy.zeros_like(board)
+    for total in range(10):
+        # A dead cell has ``total`` living neighbours, a living one one less
+        born = total in rule.births
+        survives = total - 1 in rule.survivals
+
+        if born and survives:
+            result |= _equals(planes, total)
+        elif born:
+            result |= _equals(planes, total) & ~board
+        elif survives:
+            result |= _equals(planes, total) & board
+
+    # Rules with B0 bring the padding bits to life
+    result[:, -1] &= _last_word_mask(cols)
+
+    return result
+
+
+class BitPackedBoard(object):
+    """A board kept as packed words between generations."""
+
+    def __init__(self, rows, cols, cells, rule=None):
+        self.rows = rows
+        self.cols = cols
+        self.rule = get_rule(rule)
+        self.board = pack(rows, cols, cells)
+
+    def step(self, generations=1):
+        """Advance the board by the given number of generations."""
+        for _ in range(generations):
+            self.board = step(self.board, self.cols, self.rule)
+
+    def to_array(self):
+        """Return the cells as a ``rows`` x ``cols`` ``uint8`` array."""
+        return unpack(self.board, self.cols)
+
+    def cells(self):
+        """Return the cells as a flat tuple, like :func:`gol.calculate_next_generation`."""
+        return tuple(self.to_array().view(bool).ravel().tolist())
+
+
+def create_board(rows, cols, cells, rule=None):
+    """Return a :class:`BitPackedBoard`, kept between generations by :mod:`gol_core.stream`."""
+    return BitPackedBoard(rows, cols, cells, rule=rule)
+
+
+def calculate_next_generation(rows, cols, cells, rule=None):
+    """Calculate next generation, see :func:`gol.calculate_next_generation`."""
+    board = create_board(rows, cols, cells, rule=rule)
+    board.step()
+
+    return board.cells()
@@ -0,0 +1,138 @@
+"""Pure Python stepping engine working on 2x2 blocks with a lookup table.
+
+The next generation of a 2x2 block only depends on the 4x4 block around it,
+so all 65,536 possible 4x4 blocks are calculated once per rule and stored in a
+table. The board is kept as rows of 2-bit pair codes (the left cell of a pair
+being the high bit). Stepping combines the codes of neighbouring pairs into
+4-bit row fragments, two rows of fragments into a byte and two bytes into the
+16-bit table index, so a generation costs a few list operations per block
+instead of a neighbour count per cell. Only the standard library is used.
+
+The index of a 4x4 block holds the rows from top to bottom, each as a nibble
+with the leftmost cell as its highest bit. The result holds the top left, top
+right, bottom left and bottom right cell from high to low bit.
+
+Blocks need an even number of rows and columns. A board with an odd number
+of either is stepped as two copies of itself next to (or on top of) each
+other: the copies wrap around into each other exactly like the board wraps
+around into itself, so the first copy goes through the same generations.
+"""
+from itertools import chain, islice
+
+from gol_core.rules import get_rule
+
+# Cells of the 2x2 centre of a 4x4 block: the shifts which move their 3x3
+# neighbourhood rows to the lowest three bits
+_CENTRE_SHIFTS = ((13, 9, 5), (12, 8, 4), (9, 5, 1), (8, 4, 0))
+
+# Row fragment (cells 2j - 1 until 2j + 2) from the pair codes of the pairs
+# j - 1, j and j + 1
+_FRAGMENTS = [((left & 1) << 3) | (centre << 1) | (right >> 1)
+              for left in range(4) for centre in range(4) for right in range(4)]
+
+_PAIR_CELLS = ((False, False), (False, True), (True, False), (True, True))
+
+_tables = {}
+
+
+def block_table(rule=None):
+    """Return the 65,536 entry table of a rule, it is calculated on first use."""
+    rule = get_rule(rule)
+    try:
+        return _tables[rule]
+    except KeyError:
+        pass
+
+    neighbourhoods = rule.table
+    table = []
+    for index in range(1 << 16):
+        result = 0
+        for top, middle, bottom in _CENTRE_SHIFTS:
+            neighbourhood = ((((index >> top) & 7) << 6)
+                             | (((index >> middle) & 7) << 3)
+                             | ((index >> bottom) & 7))
+            result = (result << 1) | neighbourhoods[neighbourhood]
+        table.append(result)
+
+    _tables[rule] = table
+    return table
+
+
+class BlockBoard(object):
+    """A torodial board, doubled along its sides of odd length."""
+
+    def __init__(self, rows, cols, cells, rule=None):
+        self.rows = rows
+        self.cols = cols
+        self.generation = 0
+
+        self._table = block_table(rule)
+
+        lines = [list(cells[start:start + cols]) for start in range(0, rows * cols, cols)]
+        if cols % 2:
+            lines = [line + line for line in lines]
+        if rows % 2:
+            lines = lines + lines
+
+        self._pairs = [[(2 if line[index] else 0) | (1 if line[index + 1] else 0)
+                        for index in range(0, len(line), 2)]
+                       for line in lines]
+
+    def _fragments(self, pairs):
+        fragments = _FRAGMENTS
+        left = pairs[-1:] + pairs[:-1]
+        right = pairs[1:] + pairs[:1]
+
+        return [fragments[(l << 4) | (c << 2) | r] for l, c, r in zip(left, pairs, right)]
+
+    def step(self, generations=1):
+        """Advance the board by the given number of generations."""
+        for _ in range(generations):
+            self._step()
+
+    def _step(self):
+        table = self._table
+        fragments = [self._fragments(pairs) for pairs in self._pairs]
+
+        # Rows 2i - 1 and 2i as one byte per block column: the top half of
+        # the index for block row i and the bottom half for block row i - 1
+        halves = [[(upper << 4) | lower for upper, lower in zip(fragments[row - 1], fragments[row])]
+                  for row in range(0, len(self._pairs), 2)]
+
+        pairs = []
+        for top, bottom in zip(halves, halves[1:] + halves[:1]):
+            results = [table[(upper << 8) | lower] for upper, lower in zip(top, bottom)]
+            pairs.append([result >> 2 for result in results])
+            pairs.append([result & 3 for result in results])
+
+        self._pairs = pairs
+        self.generation += 1
+
+    def cells(self):
+        """Return the board as a flat tuple of cells."""
+        # Only the first copy of a doubled board
+        cols = self.cols
+        width = (cols + 1) // 2
+        lines = (chain.from_iterable(_PAIR_CELLS[code] for code in pairs[:width])
+                 for pairs in self._pairs[:self.rows])
+        if cols % 2:
+            lines = (islice(line, cols) for line in lines)
+
+        return tuple(chain.from_iterable(lines))
+
+
+def create_board(rows, cols, cells, rule=None):
+    """Return a :class:`BlockBoard`, kept between generations by :mod:`gol_core.stream`."""
+    return BlockBoard(rows, cols, cells, rule)
+
+
+def calculate_next_generation(rows, cols, cells, rule=None):
+    """Calculate next generation, see :func:`gol.calculate_next_generation`.
+
+    The table index is built from the cells for every call,
+    :func:`gol_core.stream.generations` keeps a :class:`BlockBoard` instead.
+    """
+    board = BlockBoard(rows, cols, cells, rule)
+    board.step()
+
+    return board.cells()
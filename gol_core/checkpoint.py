@@ -0,0 +1,211 @@
+"""Checkpoints to resume long runs from.
+
+File layout (all numbers little-endian)::
+
+    header   b'GOLC', version (u8), rows (u32), cols (u32), generation (u64),
+             rule length (u16), engine length (u16)
+    rule     the rulestring, ASCII
+    engine   the engine name, ASCII
+    cells    the bit-packed cells, zlib compressed
+
+A checkpoint is written to a temporary file next to it which then replaces
+the old one, so a crash while writing leaves the previous checkpoint intact.
+
+A :class:`Checkpointer` is offered every generation of a run and writes one
+at most every ``interval`` seconds from a background thread. The stepping
+thread only keeps a reference to the cells (or copies them when they are
+mutable), packing, compressing and writing happen in the background.
+
+Only the cells are stored, the state engines keep besides them is left out
+on purpose: it can be rebuilt from the cells, and storing it would tie the
+file format to the internals of every engine. A resumed run pays for that
+once. The tiled engine evaluates every tile in its first generation before
+it follows the changing ones again, HashLife starts with an empty cache of
+memoized results, so its first jumps are as slow as those of a new run, and
+the lookup tables of the rule (like those of the block engine) are
+calculated again.
+"""
+import os
+import struct
+import threading
+import time
+import zlib
+
+import numpy
+
+from gol_core.engines import DEFAULT_ENGINE
+from gol_core.rules import get_rule
+
+MAGIC = b'GOLC'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBIIQHH')
+
+
+class Checkpoint(object):
+    """A loaded checkpoint, ``packed`` holds the bit-packed cells."""
+
+    def __init__(self, rows, cols, generation, rule, engine, packed):
+        self.rows = rows
+        self.cols = cols
+        self.generation = generation
+        self.rule = rule
+        self.engine = engine
+        self.packed = packed
+
+    def array(self):
+        """Return the cells as a ``rows`` x ``cols`` array."""
+        cells = numpy.unpackbits(self.packed, count=self.rows * self.cols)
+
+        return cells.reshape(self.rows, self.cols)
+
+    def cells(self):
+        """Return the cells as a flat tuple, like :func:`gol.calculate_next_generation`."""
+        return tuple(self.array().astype(bool).ravel().tolist())
+
+
+def dumps(rows, cols, generation, cells, rule=None, engine=DEFAULT_ENGINE):
+    """Return a checkpoint as bytes."""
+    rulestring = get_rule(rule).rulestring.encode('ascii')
+    engine = engine.encode('ascii')
+    packed = numpy.packbits(numpy.asarray(cells, dtype=bool).ravel())
+
+    return b''.join((_HEADER.pack(MAGIC, VERSION, rows, cols, generation,
+                                  len(rulestring), len(engine)),
+                     rulestring, engine, zlib.compress(packed.tobytes(), 1)))
+
+
+def loads(data):
+    """Parse a checkpoint from bytes."""
+    if len(data) < _HEADER.size:
+        raise ValueError('Not a checkpoint: the file is too short')
+
+    magic, version, rows, cols, generation, rule_length, engine_length = \
+        _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError('Not a checkpoint')
+    if version != VERSION:
+        raise ValueError('Unsupported checkpoint version {} (expected {})'.format(version, VERSION))
+
+    position = _HEADER.size
+    rule = data[position:position + rule_length].decode('ascii')
+    position += rule_length
+    engine = data[position:position + engine_length].decode('ascii')
+    position += engine_length
+
+    try:
+        packed = numpy.frombuffer(zlib.decompress(data[position:]), dtype=numpy.uint8)
+    except zlib.error as error:
+        raise ValueError('The checkpoint is damaged: {}'.format(error))
+    if len(packed) != (rows * cols + 7) // 8:
+        raise ValueError('The checkpoint is damaged: it holds {} bytes of cells instead of {}'
+                         .format(len(packed), (rows * cols + 7) // 8))
+
+    return Checkpoint(rows, cols, generation, rule, engine, packed)
+
+
+def _replace(source, destination):
+    try:
+        os.replace(source, destination)
+    except AttributeError:
+        # Python 2, renaming replaces the destination on POSIX systems
+        os.rename(source, destination)
+
+
+def save(filename, rows, cols, generation, cells, rule=None, engine=DEFAULT_ENGINE):
+    """Write a checkpoint, replacing the previous one at once."""
+    data = dumps(rows, cols, generation, cells, rule=rule, engine=engine)
+
+    temporary = '{}.tmp'.format(filename)
+    with open(temporary, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+    _replace(temporary, filename)
+
+
+def load(filename):
+    """Load a checkpoint file."""
+    with open(filename, 'rb') as file:
+        return loads(file.read())
+
+
+class Checkpointer(object):
+    """Write checkpoints of a run in a background thread, see the module documentation.
+
+    :param interval: the minimum number of seconds between two checkpoints
+    """
+
+    def __init__(self, filename, rows, cols, rule=None, engine=DEFAULT_ENGINE, interval=60,
+                 clock=time.time):
+        self.filename = filename
+        self.rows = rows
+        self.cols = cols
+        self.rule = get_rule(rule)
+        self.engine = engine
+        self.interval = interval
+
+        # The generation of the last checkpoint written, and the number written
+        self.generation = None
+        self.written = 0
+        self.error = None
+
+        self._clock = clock
+        self._offered = clock()
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._write, name='checkpoint')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def offer(self, generation, cells, force=False):
+        """Offer a generation, returns whether it will be written.
+
+        It is written when ``interval`` seconds passed since the last
+        checkpoint, or with ``force``. A checkpoint still waiting to be
+        written is replaced by the newer one.
+        """
+        now = self._clock()
+        if not force and now - self._offered < self.interval:
+            return False
+        self._offered = now
+
+        if not isinstance(cells, (tuple, bytes)):
+            # The cells may change while the checkpoint is written
+            cells = numpy.array(cells, dtype=bool)
+
+        with self._condition:
+            self._pending = (generation, cells)
+            self._condition.notify()
+
+        return True
+
+    def _write(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                generation, cells = self._pending
+                self._pending = None
+
+            try:
+                save(self.filename, self.rows, self.cols, generation, cells, rule=self.rule,
+                     engine=self.engine)
+            except (IOError, OSError) as error:
+                self.error = error
+            else:
+                self.generation = generation
+                self.written += 1
+
+    def close(self):
+        """Wait until a pending checkpoint is written and stop the thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        self._thread.join()
@@ -0,0 +1,196 @@
+"""Thin client following a simulation server, see :mod:`gol_core.server`.
+
+:class:`RemoteSimulation` has the interface of
+:class:`gol_core.pipeline.GenerationPipeline`, so a display which shows the
+generations of a local pipeline shows those of a server just as well. A
+background thread receives the frames and keeps the board up to date, the
+display takes the newest generation whenever it is ready to draw.
+
+Only the standard library and NumPy are used, no asyncio, so the GTK main
+loop and the terminal renderer can use it as is.
+"""
+import socket
+import threading
+import zlib
+
+from gol_core import protocol
+
+
+def connect(address, timeout=None):
+    """Return a socket connected to a server address, see :func:`gol_core.protocol.parse_address`."""
+    kind, target = protocol.parse_address(address)
+    if kind == 'unix':
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+    connection.settimeout(timeout)
+    try:
+        connection.connect(target)
+    except socket.error:
+        connection.close()
+        raise
+    connection.settimeout(None)
+
+    return connection
+
+
+def _receive_exactly(connection, size):
+    chunks = []
+    while size:
+        chunk = connection.recv(min(size, 1 << 20))
+        if not chunk:
+            raise EOFError('The server closed the connection')
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b''.join(chunks)
+
+
+def frames(connection):
+    """Yield the frames received on a connection until it is closed."""
+    while True:
+        try:
+            header = _receive_exactly(connection, protocol.HEADER.size)
+        except EOFError:
+            return
+        kind, generation, length = protocol.HEADER.unpack(header)
+
+        yield protocol.decode(kind, generation, _receive_exactly(connection, length))
+
+
+class RemoteSimulation(object):
+    """Follow the simulation of a server, see the module documentation.
+
+    ``rows``, ``cols`` and ``rule`` are known once the first frame arrived.
+    :meth:`latest` returns None for the births and deaths when the board was
+    replaced (the first frame, or the server started another board), the
+    display then shows the cells as a whole.
+    """
+
+    detector = None
+
+    def __init__(self, address, timeout=10):
+        self.address = address
+        self.timeout = timeout
+
+        self.rows = None
+        self.cols = None
+        self.rule = None
+
+        # Generations received but never taken
+        self.dropped = 0
+        self.finished = False
+        self.error = None
+
+        self._board = None
+        self._generation = None
+        self._changed = set()
+        self._replaced = False
+        self._fresh = False
+        self._lock = threading.Lock()
+        self._connection = None
+        self._thread = None
+
+    def start(self):
+        """Connect, raises ``socket.error`` (or ValueError for an invalid address)."""
+        try:
+            self._connection = connect(self.address, timeout=self.timeout)
+        except (socket.error, ValueError) as error:
+            self.error = error
+            self.finished = True
+            raise
+
+        self._thread = threading.Thread(target=self._receive, name='remote simulation')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, wait=False):
+        """Disconnect, the generation received last can still be taken."""
+        if self._connection is None:
+            return
+
+        try:
+            self._connection.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            # Already disconnected
+            pass
+
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def _receive(self):
+        try:
+            for frame in frames(self._connection):
+                if frame.kind == protocol.END:
+                    break
+
+                with self._lock:
+                    self._apply(frame)
+        except (socket.error, EOFError, ValueError, zlib.error) as error:
+            self.error = error
+        finally:
+            self._connection.close()
+            with self._lock:
+                self.finished = True
+
+    def _apply(self, frame):
+        if self._fresh:
+            self.dropped += 1
+
+        if frame.kind == protocol.KEYFRAME:
+            if self._board is None or (frame.rows, frame.cols) != (self.rows, self.cols):
+                self._board = frame.cells
+                self._replaced = True
+                self._changed.clear()
+            else:
+                self._changed.symmetric_difference_update(
+                    index for index, (old, new) in enumerate(zip(self._board, frame.cells))
+                    if old != new)
+                self._board = frame.cells
+
+            self.rows, self.cols, self.rule = frame.rows, frame.cols, frame.rule
+        else:
+            board = self._board
+            for index in frame.births:
+                board[index] = 1
+            for index in frame.deaths:
+                board[index] = 0
+
+            # A cell which changed twice is back at its displayed state
+            self._changed.symmetric_difference_update(frame.births)
+            self._changed.symmetric_difference_update(frame.deaths)
+
+        self._generation = frame.generation
+        self._fresh = True
+
+    def latest(self):
+        """Take the newest generation, or None when nothing arrived since the last one.
+
+        Returns ``(generation, cells, births, deaths)`` like
+        :meth:`gol_core.pipeline.GenerationPipeline.latest`.
+        """
+        with self._lock:
+            if not self._fresh:
+                return None
+            self._fresh = False
+
+            generation = self._generation
+            cells = bytearray(self._board)
+            if self._replaced:
+                self._replaced = False
+                self._changed.clear()
+                return generation, cells, None, None
+
+            changed, self._changed = self._changed, set()
+
+        births = tuple(sorted(index for index in changed if cells[index]))
+        deaths = tuple(sorted(index for index in changed if not cells[index]))
+
+        return generation, cells, births, deaths
+
+    @property
+    def exhausted(self):
+        """Whether the server finished (or disconnected) and everything has been taken."""
+        with self._lock:
+            return self.finished and not self._fresh
@@ -0,0 +1,110 @@
+"""Detection of still lifes and oscillating boards.
+
+A :class:`CycleDetector` is fed every generation of a run. It keeps a bounded
+window of recent states indexed by a fingerprint; only on a fingerprint hit
+are the states compared in full. Once a state repeats, the period and the
+generation at which the cycle started (the onset) are known, and any later
+generation can be looked up instead of stepped to.
+"""
+from collections import deque
+
+from gol_core.engines import DEFAULT_ENGINE, get_engine
+
+
+def _as_bytes(cells):
+    return bytes(bytearray(cells))
+
+
+def fingerprint(cells):
+    """Return a compact hash of a board (a sequence of cells or an array)."""
+    return hash(_as_bytes(cells))
+
+
+class CycleDetector(object):
+    """Detect when a run becomes periodic.
+
+    Only cycles with a period up to ``window`` generations are detected. The
+    onset is exact as long as every generation since the start of the run was
+    added, otherwise it is the first repeated generation within the window.
+    """
+
+    def __init__(self, window=64):
+        self.window = window
+        self.period = None
+        self.onset = None
+
+        self._recent = deque()
+        self._generations = {}
+        self._cycle = None
+
+    @property
+    def settled(self):
+        return self.period is not None
+
+    @property
+    def still_life(self):
+        return self.period == 1
+
+    def add(self, generation, cells):
+        """Add the state of a generation, returns whether the run is periodic.
+
+        Generations must be added one by one and in order.
+        """
+        if self.settled:
+            return True
+
+        key = fingerprint(cells)
+        for earlier in self._generations.get(key, ()):
+            if _as_bytes(self._state(earlier)) == _as_bytes(cells):
+                self.onset = earlier
+                self.period = generation - earlier
+                self._cycle = [state for state_generation, state in self._recent
+                               if state_generation >= earlier]
+                self._recent.clear()
+                self._generations.clear()
+                return True
+
+        self._recent.append((generation, cells))
+        self._generations.setdefault(key, []).append(generation)
+
+        if len(self._recent) > self.window:
+            old_generation, old_cells = self._recent.popleft()
+            old_key = fingerprint(old_cells)
+            self._generations[old_key].remove(old_generation)
+            if not self._generations[old_key]:
+                del self._generations[old_key]
+
+        return False
+
+    def _state(self, generation):
+        offset = generation - self._recent[0][0]
+
+        return self._recent[offset][1]
+
+    def state_at(self, generation):
+        """Return the state of any generation from the onset of the cycle on."""
+        if not self.settled:
+            raise ValueError('No cycle has been detected yet')
+        if generation < self.onset:
+            raise ValueError('Generation {} is before the onset of the cycle ({})'.format(
+                generation, self.onset))
+
+        return self._cycle[(generation - self.onset) % self.period]
+
+
+def generation_at(rows, cols, cells, generation, engine=DEFAULT_ENGINE, window=64, rule=None):
+    """Return the state of the given generation of a board.
+
+    The board is stepped until the generation is reached or until it turns out
+    to be periodic, in which case the answer is looked up in the cycle.
+    """
+    calculate_next_generation = get_engine(engine)
+    detector = CycleDetector(window=window)
+
+    cells = tuple(cells)
+    for current in range(generation):
+        if detector.add(current, cells):
+            return detector.state_at(generation)
+        cells = calculate_next_generation(rows, cols, cells, rule)
+
+    return cells
@@ -0,0 +1,82 @@
+"""Registry of the available stepping engines.
+
+Engines are imported on first use so optional dependencies (like NumPy) are
+only required when the engine which needs them is selected.
+"""
+import importlib
+
+DEFAULT_ENGINE = 'python'
+
+ENGINES = {
+    'python': 'gol',
+    'numpy': 'gol_core.vectorized',
+    'bitpacked': 'gol_core.bitpacked',
+    'blocks': 'gol_core.blocks',
+    'hashlife': 'gol_core.hashlife',
+    'parallel': 'gol_core.parallel',
+    'sparse': 'gol_core.sparse',
+    'tiled': 'gol_core.tiled',
+}
+
+
+def _module(name):
+    try:
+        module_name = ENGINES[name]
+    except KeyError:
+        raise ValueError('Unknown engine: {} (choose from {})'.format(
+            name, ', '.join(sorted(ENGINES))))
+
+    return importlib.import_module(module_name)
+
+
+def get_engine(name=DEFAULT_ENGINE):
+    """Return the ``calculate_next_generation`` function of the given engine."""
+    return _module(name).calculate_next_generation
+
+
+def get_board_factory(name=DEFAULT_ENGINE):
+    """Return the ``create_board`` function of the given engine, or None.
+
+    Engines with one keep a board between generations, which pays off once
+    it is stepped more than once, see :func:`gol_core.stream.generations`.
+    ``create_board(rows, cols, cells, rule=None)`` returns an object with a
+    ``step(generations=1)`` and a ``cells()`` method, and optionally a
+    ``close()`` method to release it, a ``record_metrics(metrics)`` method
+    to report its own counters and a ``changes()`` method returning the
+    births and deaths of the last step, instead of comparing the cells.
+    """
+    return getattr(_module(name), 'create_board', None)
+
+
+def diff(cells, next_cells):
+    """Return the indices of the births and deaths between two generations."""
+    births = []
+    deaths = []
+    for index, (cell, next_cell) in enumerate(zip(cells, next_cells)):
+        if next_cell and not cell:
+            births.append(index)
+        elif cell and not next_cell:
+            deaths.append(index)
+
+    return tuple(births), tuple(deaths)
+
+
+def get_delta_engine(name=DEFAULT_ENGINE):
+    """Return the ``calculate_next_generation_delta`` function of the given engine.
+
+    It returns ``(cells, births, deaths)``, see
+    :func:`gol.calculate_next_generation_delta`. Engines which do not find the
+    changes while stepping have them calculated afterwards with :func:`diff`.
+    """
+    module = _module(name)
+    try:
+        return module.calculate_next_generation_delta
+    except AttributeError:
+        calculate_next_generation = module.calculate_next_generation
+
+    def calculate_next_generation_delta(rows, cols, cells, rule=None):
+        next_cells = calculate_next_generation(rows, cols, cells, rule)
+
+        return (next_cells,) + diff(cells, next_cells)
+
+    return calculate_next_generation_delta
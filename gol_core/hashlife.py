@@ -0,0 +1,371 @@
+"""HashLife engine based on a memoized quadtree.
+
+The universe is an unbounded plane stored as a quadtree of canonical nodes:
+two nodes with the same contents are always the same object, so regular
+patterns share almost all of their structure. The result of a node (its
+centre half some generations later) is memoized, which makes it possible to
+jump ``2 ** k`` generations in a single call.
+
+Coordinates are ``(x, y)`` with ``x`` the column and ``y`` the row, growing to
+the right and downwards like the flat cell lists of :mod:`gol`.
+
+Torodial boards are stepped by :class:`HashLifeBoard`, which keeps its
+universe (and everything memoized) between steps and jumps over any number
+of generations at once.
+
+Rules with B0 are not supported: they bring the empty plane to life.
+"""
+from gol_core.rules import without_births_from_nothing
+
+
+class Node(object):
+    """A square block of ``2 ** level`` cells per side.
+
+    Nodes are immutable and must only be created through
+    :meth:`HashLife.node` so they stay canonical.
+    """
+
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population')
+
+    def __init__(self, nw, ne, sw, se, level, population):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+
+class HashLife(object):
+    """A HashLife universe.
+
+    ``max_nodes`` caps the number of canonical nodes kept in memory (roughly
+    200 bytes each, memoized results included). When a step leaves more nodes
+    behind, everything that is not reachable from the current pattern is
+    dropped together with the memoized results referring to it. The cap is
+    checked between steps, a single very large step can temporarily exceed it.
+    """
+
+    def __init__(self, max_nodes=1 << 22, rule=None):
+        self.max_nodes = max_nodes
+        self.rule = without_births_from_nothing(rule, 'hashlife')
+        self.generation = 0
+        self.collections = 0
+
+        self.off = Node(None, None, None, None, 0, 0)
+        self.on = Node(None, None, None, None, 0, 1)
+
+        self._nodes = {}
+        self._results = {}
+        self._empty = [self.off]
+
+        self.origin = (0, 0)
+        self.root = self.empty(2)
+
+    # Node construction
+
+    def node(self, nw, ne, sw, se):
+        """Return the canonical node with the given quadrants."""
+        key = (nw, ne, sw, se)
+        try:
+            return self._nodes[key]
+        except KeyError:
+            node = Node(nw, ne, sw, se, nw.level + 1,
+                        nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+            return node
+
+    def empty(self, level):
+        """Return the empty node of the given level."""
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.node(e, e, e, e))
+
+        return self._empty[level]
+
+    def _expand(self, node):
+        """Surround a node with empty space, keeping it in the centre."""
+        e = self.empty(node.level - 1)
+
+        return self.node(self.node(e, e, e, node.nw),
+                         self.node(e, e, node.ne, e),
+                         self.node(e, node.sw, e, e),
+                         self.node(node.se, e, e, e))
+
+    def _centre(self, node):
+        return self.node(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _horizontal_centre(self, w, e):
+        return self.node(w.ne, e.nw, w.se, e.sw)
+
+    def _vertical_centre(self, n, s):
+        return self.node(n.sw, n.se, s.nw, s.ne)
+
+    # Evolution
+
+    def _life_4x4(self, node):
+        """Advance the centre 2x2 cells of a level 2 node by one generation."""
+        cells = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+
+        counts = self.rule.counts
+
+        def new_state(y, x):
+            centre = cells[y][x].population
+            number_alive = sum(cells[cursor_y][cursor_x].population
+                               for cursor_y in range(y - 1, y + 2)
+                               for cursor_x in range(x - 1, x + 2)) - centre
+            return self.on if counts[9 * centre + number_alive] else self.off
+
+        return self.node(new_state(1, 1), new_state(1, 2), new_state(2, 1), new_state(2, 2))
+
+    def successor(self, node, step_log):
+        """Return the centre half of a node ``2 ** step_log`` generations later.
+
+        ``step_log`` may be at most ``node.level - 2``.
+        """
+        if node.population == 0:
+            return node.nw
+
+        key = (node, step_log)
+        try:
+            return self._results[key]
+        except KeyError:
+            pass
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            if step_log == node.level - 2:
+                # Full speed: both halves of the recursion advance time
+                first = lambda n: self.successor(n, step_log - 1)
+                second_log = step_log - 1
+            else:
+                first = self._centre
+                second_log = step_log
+
+            n00 = first(node.nw)
+            n01 = first(self._horizontal_centre(node.nw, node.ne))
+            n02 = first(node.ne)
+            n10 = first(self._vertical_centre(node.nw, node.sw))
+            n11 = first(self._centre(node))
+            n12 = first(self._vertical_centre(node.ne, node.se))
+            n20 = first(node.sw)
+            n21 = first(self._horizontal_centre(node.sw, node.se))
+            n22 = first(node.se)
+
+            result = self.node(
+                self.successor(self.node(n00, n01, n10, n11), second_log),
+                self.successor(self.node(n01, n02, n11, n12), second_log),
+                self.successor(self.node(n10, n11, n20, n21), second_log),
+                self.successor(self.node(n11, n12, n21, n22), second_log),
+            )
+
+        self._results[key] = result
+        return result
+
+    def _is_padded(self, node):
+        """Whether all living cells are within the centre half of the node."""
+        return (node.nw.population == node.nw.se.se.population
+                and node.ne.population == node.ne.sw.sw.population
+                and node.sw.population == node.sw.ne.ne.population
+                and node.se.population == node.se.nw.nw.population)
+
+    def _grow(self):
+        size = 1 << (self.root.level - 2)
+        self.root = self._expand(self.root)
+        self.origin = (self.origin[0] - 2 * size, self.origin[1] - 2 * size)
+
+    def step_pow2(self, step_log):
+        """Advance the universe ``2 ** step_log`` generations."""
+        while self.root.level < step_log + 3 or not self._is_padded(self.root):
+            self._grow()
+        # Make room for the pattern to grow, the result is the centre half
+        self._grow()
+
+        size = 1 << (self.root.level - 2)
+        self.root = self.successor(self.root, step_log)
+        self.origin = (self.origin[0] + size, self.origin[1] + size)
+        self.generation += 1 << step_log
+
+        if len(self._nodes) > self.max_nodes:
+            self.collect()
+
+    def advance(self, generations):
+        """Advance the universe by any number of generations.
+
+        The number is split into powers of two, so reaching generation
+        ``10 ** 9`` takes about 30 memoized jumps.
+        """
+        step_log = 0
+        while generations:
+            if generations & 1:
+                self.step_pow2(step_log)
+            generations >>= 1
+            step_log += 1
+
+    # Memory management
+
+    def collect(self):
+        """Drop all nodes and results which are not part of the current pattern."""
+        reachable = {}
+        stack = [self.root] + self._empty
+        while stack:
+            node = stack.pop()
+            if node.level == 0 or id(node) in reachable:
+                continue
+            reachable[id(node)] = node
+            stack.extend((node.nw, node.ne, node.sw, node.se))
+
+        self._nodes = dict(((n.nw, n.ne, n.sw, n.se), n) for n in reachable.values())
+        self._results = dict((key, result) for key, result in self._results.items()
+                             if id(key[0]) in reachable and id(result) in reachable)
+        self.collections += 1
+
+    @property
+    def node_count(self):
+        return len(self._nodes)
+
+    @property
+    def population(self):
+        return self.root.population
+
+    # Conversion
+
+    def set_cells(self, live_cells, origin=None):
+        """Replace the universe with the given ``(x, y)`` living cells.
+
+        The tree is built from ``origin``, which must be at or above and to the
+        left of all living cells, by default their top left corner. Building
+        from the same origin every time lets regular patterns reuse the
+        memoized results of earlier universes.
+        """
+        live_cells = list(live_cells)
+        # Build from the top left corner so all positions meet in one root
+        if origin is None:
+            min_x = min([x for x, _ in live_cells] or [0])
+            min_y = min([y for _, y in live_cells] or [0])
+        else:
+            min_x, min_y = origin
+
+        nodes = dict(((x - min_x, y - min_y), self.on) for x, y in live_cells)
+        level = 0
+
+        while len(nodes) > 1 or level < 2:
+            e = self.empty(level)
+            parents = {}
+            for (x, y), node in nodes.items():
+                parents.setdefault((x >> 1, y >> 1), [e, e, e, e])[(y & 1) * 2 + (x & 1)] = node
+            nodes = dict((position, self.node(*children))
+                         for position, children in parents.items())
+            level += 1
+
+        if nodes:
+            self.root, = nodes.values()
+        else:
+            self.root = self.empty(level)
+        self.origin = (min_x, min_y)
+
+        self.generation = 0
+
+    def live_cells(self):
+        """Yield the ``(x, y)`` coordinates of all living cells."""
+        stack = [(self.root, self.origin[0], self.origin[1])]
+        while stack:
+            node, x, y = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                yield x, y
+                continue
+
+            half = 1 << (node.level - 1)
+            stack.extend(((node.nw, x, y), (node.ne, x + half, y),
+                          (node.sw, x, y + half), (node.se, x + half, y + half)))
+
+    def get_region(self, x, y, rows, cols):
+        """Return the cells of a region as a flat, row-major tuple."""
+        cells = [False] * (rows * cols)
+
+        # Only descend into the nodes which overlap the region
+        stack = [(self.root, self.origin[0], self.origin[1])]
+        while stack:
+            node, node_x, node_y = stack.pop()
+            size = 1 << node.level
+            if (node.population == 0 or node_x >= x + cols or node_y >= y + rows
+                    or node_x + size <= x or node_y + size <= y):
+                continue
+            if node.level == 0:
+                cells[(node_y - y) * cols + node_x - x] = True
+                continue
+
+            half = size >> 1
+            stack.extend(((node.nw, node_x, node_y), (node.ne, node_x + half, node_y),
+                          (node.sw, node_x, node_y + half),
+                          (node.se, node_x + half, node_y + half)))
+
+        return tuple(cells)
+
+
+class HashLifeBoard(object):
+    """A torodial board stepped by a HashLife universe.
+
+    The board is emulated by surrounding it with copies of itself. Changes
+    travel at most one cell per generation, so the copies keep the board
+    exact for as many generations as it is rows or columns wide. Longer jumps
+    are made in parts of that size, surrounding the board with fresh copies
+    in between. The universe is kept, so the memoized results carry over
+    from one part (and one call) to the next.
+    """
+
+    def __init__(self, rows, cols, cells, rule=None, max_nodes=1 << 22):
+        self.rows = rows
+        self.cols = cols
+        self.generation = 0
+        self.universe = HashLife(max_nodes=max_nodes, rule=rule)
+
+        self._cells = tuple(bool(cell) for cell in cells)
+
+    def step(self, generations=1):
+        """Advance the board by the given number of generations."""
+        rows, cols = self.rows, self.cols
+        while generations > 0:
+            jump = min(generations, rows, cols)
+
+            live = [(index % cols, index // cols)
+                    for index, cell in enumerate(self._cells) if cell]
+            self.universe.set_cells(((x + dx * cols, y + dy * rows)
+                                     for x, y in live
+                                     for dx in (-1, 0, 1)
+                                     for dy in (-1, 0, 1)),
+                                    origin=(-cols, -rows))
+            self.universe.advance(jump)
+            self._cells = self.universe.get_region(0, 0, rows, cols)
+
+            generations -= jump
+            self.generation += jump
+
+    def cells(self):
+        """Return the cells as a flat tuple, like :func:`gol.calculate_next_generation`."""
+        return self._cells
+
+
+def create_board(rows, cols, cells, rule=None):
+    """Return a :class:`HashLifeBoard`, kept between generations by :mod:`gol_core.stream`."""
+    return HashLifeBoard(rows, cols, cells, rule=rule)
+
+
+def calculate_next_generation(rows, cols, cells, rule=None):
+    """Calculate next generation, see :func:`gol.calculate_next_generation`.
+
+    A new universe is built for every call, :func:`gol_core.stream.generations`
+    keeps a :class:`HashLifeBoard` between generations instead.
+    """
+    board = HashLifeBoard(rows, cols, cells, rule=rule)
+    board.step()
+
+    return board.cells()
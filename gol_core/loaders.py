@@ -0,0 +1,436 @@
+"""Pattern loaders for the plaintext, RLE and Life 1.06 formats.
+
+Files are memory mapped and decoded straight into a bit-packed buffer, so a
+pattern takes about one bit per cell while loading. Supported formats:
+
+- plaintext: one line per row, ``X`` (or ``O``) for a living cell and any
+  other character for a dead cell, lines starting with ``!`` are comments.
+  This is the format of the files in the "patterns" folder.
+- RLE: a ``x = <cols>, y = <rows>[, rule = <rule>]`` header followed by run
+  length encoded rows, lines starting with ``#`` are comments.
+- Life 1.06: a ``#Life 1.06`` header followed by one ``x y`` pair per living
+  cell.
+
+NumPy is optional. Without it, the same patterns are loaded by plain Python
+parsers (see ``PYTHON_PARSERS``), which are slower on large files but keep
+the pure Python engines usable.
+"""
+import mmap
+import re
+
+try:
+    import numpy
+except ImportError:  # The plain Python parsers are used
+    numpy = None
+
+_RLE_HEADER = re.compile(br'^\s*x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?',
+                         re.MULTILINE)
+_RLE_TOKEN = re.compile(br'(\d*)([A-Za-z$])')
+_RLE_WHITESPACE = re.compile(br'\s+')
+_RLE_CHUNK = 1 << 20
+
+_ALIVE_CODES = frozenset(bytearray(b'XO'))
+
+if numpy is not None:
+    _ALIVE = numpy.zeros(256, dtype=numpy.uint8)
+    _ALIVE[[ord('X'), ord('O')]] = 1
+
+    _DIGIT = numpy.zeros(256, dtype=bool)
+    _DIGIT[ord('0'):ord('9') + 1] = True
+    _TAG = numpy.zeros(256, dtype=bool)
+    _TAG[ord('A'):ord('Z') + 1] = _TAG[ord('a'):ord('z') + 1] = True
+    _TAG[ord('$')] = True
+    _WHITESPACE = numpy.zeros(256, dtype=bool)
+    _WHITESPACE[list(b' \t\r\n')] = True
+    _VALID = _DIGIT | _TAG
+    _POWERS_OF_TEN = 10 ** numpy.arange(19, dtype=numpy.int64)
+
+
+class Pattern(object):
+    """A loaded pattern stored as bit-packed rows.
+
+    ``packed`` is a ``rows`` x ``ceil(cols / 8)`` array of bytes, the first
+    cell of a row being the most significant bit of its first byte. The plain
+    Python parsers store the same bytes as a list of one bytearray per row.
+    """
+
+    def __init__(self, rows, cols, packed, rule=None):
+        self.rows = rows
+        self.cols = cols
+        self.packed = packed
+        self.rule = rule
+
+    def array(self):
+        """Return the cells as a ``rows`` x ``cols`` array, requires NumPy."""
+        packed = self.packed
+        if isinstance(packed, list):
+            packed = numpy.frombuffer(bytes(b''.join(packed)), dtype=numpy.uint8).reshape(
+                self.rows, (self.cols + 7) // 8)
+
+        return numpy.unpackbits(packed, axis=1, count=self.cols)
+
+    def cells(self):
+        """Return the cells as a flat tuple, like :func:`gol.calculate_next_generation`."""
+        if isinstance(self.packed, list):
+            return tuple(cell for row in self.packed for cell in _unpack_row(row, self.cols))
+
+        return tuple(self.array().astype(bool).ravel().tolist())
+
+    def live_cells(self):
+        """Return the ``(x, y)`` coordinates of the living cells."""
+        if isinstance(self.packed, list):
+            return [(x, y) for y, row in enumerate(self.packed)
+                    for x, cell in enumerate(_unpack_row(row, self.cols)) if cell]
+
+        ys, xs = numpy.nonzero(self.array())
+
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    @property
+    def population(self):
+        if isinstance(self.packed, list):
+            return sum(bin(byte).count('1') for row in self.packed for byte in row)
+
+        return int(numpy.unpackbits(self.packed).sum())
+
+    def centred(self, rows, cols):
+        """Return the pattern in the centre of a larger board."""
+        if rows < self.rows or cols < self.cols:
+            raise ValueError('A {}x{} pattern does not fit on a {}x{} board'.format(
+                self.rows, self.cols, rows, cols))
+
+        top, left = (rows - self.rows) // 2, (cols - self.cols) // 2
+        if isinstance(self.packed, list):
+            packed = [bytearray((cols + 7) // 8) for _ in range(rows)]
+            for x, y in self.live_cells():
+                _set_bit(packed[top + y], left + x)
+
+            return Pattern(rows, cols, packed, rule=self.rule)
+
+        board = numpy.zeros((rows, cols), dtype=numpy.uint8)
+        board[top:top + self.rows, left:left + self.cols] = self.array()
+
+        return Pattern(rows, cols, numpy.packbits(board, axis=1), rule=self.rule)
+
+
+def _empty(rows, cols):
+    return numpy.zeros((rows, (cols + 7) // 8), dtype=numpy.uint8)
+
+
+def _unpack_row(row, cols):
+    return [bool(row[x >> 3] & (128 >> (x & 7))) for x in range(cols)]
+
+
+def _set_bit(row, x):
+    row[x >> 3] |= 128 >> (x & 7)
+
+
+def _lines(data, position=0):
+    """Yield ``(line, next_position)`` from a bytes-like object without copying it whole."""
+    size = len(data)
+    while position < size:
+        end = data.find(b'\n', position)
+        if end == -1:
+            end = size
+        yield data[position:end], end + 1
+        position = end + 1
+
+
+def parse_plaintext(data):
+    """Parse the plaintext format from a bytes-like object."""
+    rows = []
+    cols = None
+    for line, _ in _lines(data):
+        line = line.strip()
+        if not line or line.startswith(b'!'):
+            continue
+        if cols is None:
+            cols = len(line)
+        elif len(line) != cols:
+            raise ValueError('Row {} has {} columns instead of {}'.format(
+                len(rows) + 1, len(line), cols))
+
+        rows.append(numpy.packbits(_ALIVE[numpy.frombuffer(line, dtype=numpy.uint8)]))
+
+    if not rows:
+        return Pattern(0, 0, _empty(0, 0))
+
+    return Pattern(len(rows), cols, numpy.array(rows))
+
+
+def _rle_runs(codes, x, y):
+    """Decode RLE tokens into runs of living cells.
+
+    ``codes`` are the bytes of whole tokens without whitespace, ``x`` and
+    ``y`` the position at which they start. Returns the rows, first columns
+    and lengths of the living runs plus the position after the last token.
+    """
+    digit = _DIGIT[codes]
+    tags = numpy.flatnonzero(~digit)
+    tag_codes = codes[tags]
+
+    # The count of a tag is the number formed by the digits in front of it
+    digits = numpy.flatnonzero(digit)
+    owner = numpy.cumsum(~digit)[digits]
+    values = (codes[digits] - ord('0')) * _POWERS_OF_TEN[tags[owner] - digits - 1]
+    counts = numpy.bincount(owner, weights=values, minlength=len(tags)).astype(numpy.int64)
+    counts[numpy.bincount(owner, minlength=len(tags)) == 0] = 1
+
+    newline = tag_codes == ord('$')
+    steps = numpy.where(newline, counts, 0)
+    runs = numpy.where(newline, 0, counts)
+
+    row_of = y + numpy.cumsum(steps) - steps
+    before = numpy.cumsum(runs) - runs
+    last_newline = numpy.maximum.accumulate(numpy.where(newline, numpy.arange(len(tags)), -1))
+    col_of = numpy.where(last_newline >= 0, before - before[last_newline], x + before)
+
+    if newline.any():
+        x = int(before[-1] + runs[-1] - before[last_newline[-1]])
+    else:
+        x += int(runs.sum())
+    y += int(steps.sum())
+
+    alive = ~newline & (tag_codes != ord('b'))
+
+    return row_of[alive], col_of[alive], runs[alive], x, y, col_of + runs
+
+
+def _rle_header(data):
+    """Return the rows, columns and rule of an RLE pattern and the position of its body."""
+    header = None
+    for line, position in _lines(data):
+        if line.strip() and not line.lstrip().startswith(b'#'):
+            header = _RLE_HEADER.match(line)
+            break
+
+    if header is None:
+        raise ValueError('Missing RLE header line')
+
+    cols, rows = int(header.group(1)), int(header.group(2))
+    rule = header.group(3).decode('ascii') if header.group(3) else None
+
+    return rows, cols, rule, position
+
+
+def parse_rle(data):
+    """Parse the RLE format from a bytes-like object.
+
+    The body is decoded with array operations, one chunk of whole tokens at a
+    time, and the living runs are written straight into the packed buffer.
+    """
+    rows, cols, rule, position = _rle_header(data)
+
+    packed = _empty(rows, cols)
+    x = y = 0
+    size = len(data)
+
+    while position < size:
+        codes = numpy.frombuffer(data[position:position + _RLE_CHUNK], dtype=numpy.uint8)
+
+        end = numpy.flatnonzero(codes == ord('!'))
+        if len(end):
+            codes = codes[:end[0]]
+            position = size
+        elif position + len(codes) < size:
+            # Only decode whole tokens, the rest is part of the next chunk
+            whole = numpy.flatnonzero(_TAG[codes])
+            if not len(whole):
+                raise ValueError('Invalid RLE data at byte {}'.format(position))
+            codes = codes[:whole[-1] + 1]
+            position += len(codes)
+        else:
+            position = size
+
+        codes = codes[~_WHITESPACE[codes]]
+        if not _VALID[codes].all():
+            raise ValueError('Invalid RLE data')
+        if not len(codes):
+            continue
+
+        row_of, col_of, lengths, x, y, row_ends = _rle_runs(codes, x, y)
+        if (row_ends > cols).any():
+            raise ValueError('A row has more than {} columns'.format(cols))
+        if len(row_of) and row_of.max() >= rows:
+            raise ValueError('The pattern has more than {} rows'.format(rows))
+
+        _set_runs(packed, row_of, col_of, lengths)
+
+    return Pattern(rows, cols, packed, rule=rule)
+
+
+def _set_runs(packed, row_of, col_of, lengths):
+    """Set the bits of runs of living cells in a packed buffer."""
+    total = int(lengths.sum())
+    if not total:
+        return
+
+    run = numpy.repeat(numpy.arange(len(lengths)), lengths)
+    xs = col_of[run] + numpy.arange(total) - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+    ys = row_of[run]
+
+    numpy.bitwise_or.at(packed, (ys, xs >> 3), (128 >> (xs & 7)).astype(numpy.uint8))
+
+
+def parse_life106(data):
+    """Parse the Life 1.06 format from a bytes-like object."""
+    lines = bytes(data).splitlines()
+    numbers = b' '.join(line for line in lines if not line.lstrip().startswith(b'#')).split()
+    coordinates = numpy.array(numbers, dtype=numpy.int64).reshape(-1, 2)
+
+    if not len(coordinates):
+        return Pattern(0, 0, _empty(0, 0))
+
+    xs = coordinates[:, 0] - coordinates[:, 0].min()
+    ys = coordinates[:, 1] - coordinates[:, 1].min()
+    rows, cols = int(ys.max()) + 1, int(xs.max()) + 1
+
+    board = numpy.zeros((rows, cols), dtype=numpy.uint8)
+    board[ys, xs] = 1
+
+    return Pattern(rows, cols, numpy.packbits(board, axis=1))
+
+
+def detect_format(data):
+    """Return 'rle', 'life106' or 'plaintext' for the contents of a file."""
+    head = bytes(data[:4096])
+    if head.lstrip().startswith(b'#Life 1.06'):
+        return 'life106'
+
+    for line in head.splitlines():
+        if not line.strip() or line.lstrip().startswith(b'#'):
+            continue
+        return 'rle' if _RLE_HEADER.match(line) else 'plaintext'
+
+    return 'plaintext'
+
+
+def _parse_plaintext_python(data):
+    """Parse the plaintext format without NumPy, see :func:`parse_plaintext`."""
+    rows = []
+    cols = None
+    for line, _ in _lines(data):
+        line = line.strip()
+        if not line or line.startswith(b'!'):
+            continue
+        if cols is None:
+            cols = len(line)
+        elif len(line) != cols:
+            raise ValueError('Row {} has {} columns instead of {}'.format(
+                len(rows) + 1, len(line), cols))
+
+        row = bytearray((cols + 7) // 8)
+        for x, code in enumerate(bytearray(line)):
+            if code in _ALIVE_CODES:
+                _set_bit(row, x)
+        rows.append(row)
+
+    return Pattern(len(rows), cols or 0, rows)
+
+
+def _parse_rle_python(data):
+    """Parse the RLE format without NumPy, see :func:`parse_rle`."""
+    rows, cols, rule, position = _rle_header(data)
+
+    body = bytes(data[position:])
+    end = body.find(b'!')
+    if end != -1:
+        body = body[:end]
+    body = _RLE_WHITESPACE.sub(b'', body)
+
+    packed = [bytearray((cols + 7) // 8) for _ in range(rows)]
+    x = y = decoded = 0
+    for token in _RLE_TOKEN.finditer(body):
+        if token.start() != decoded:
+            break
+        decoded = token.end()
+
+        count = int(token.group(1) or 1)
+        tag = token.group(2)
+        if tag == b'$':
+            x, y = 0, y + count
+            continue
+
+        if x + count > cols:
+            raise ValueError('A row has more than {} columns'.format(cols))
+        if tag != b'b':
+            if y >= rows:
+                raise ValueError('The pattern has more than {} rows'.format(rows))
+            for column in range(x, x + count):
+                _set_bit(packed[y], column)
+        x += count
+
+    if decoded != len(body):
+        raise ValueError('Invalid RLE data')
+
+    return Pattern(rows, cols, packed, rule=rule)
+
+
+def _parse_life106_python(data):
+    """Parse the Life 1.06 format without NumPy, see :func:`parse_life106`."""
+    lines = bytes(data).splitlines()
+    numbers = [int(number) for number in
+               b' '.join(line for line in lines if not line.lstrip().startswith(b'#')).split()]
+    if len(numbers) % 2:
+        raise ValueError('A coordinate is missing its pair')
+    coordinates = list(zip(numbers[::2], numbers[1::2]))
+
+    if not coordinates:
+        return Pattern(0, 0, [])
+
+    min_x = min(x for x, _ in coordinates)
+    min_y = min(y for _, y in coordinates)
+    rows = max(y for _, y in coordinates) - min_y + 1
+    cols = max(x for x, _ in coordinates) - min_x + 1
+
+    packed = [bytearray((cols + 7) // 8) for _ in range(rows)]
+    for x, y in coordinates:
+        _set_bit(packed[y - min_y], x - min_x)
+
+    return Pattern(rows, cols, packed)
+
+
+PYTHON_PARSERS = {
+    'plaintext': _parse_plaintext_python,
+    'rle': _parse_rle_python,
+    'life106': _parse_life106_python,
+}
+
+if numpy is not None:
+    PARSERS = {
+        'plaintext': parse_plaintext,
+        'rle': parse_rle,
+        'life106': parse_life106,
+    }
+else:
+    PARSERS = PYTHON_PARSERS
+
+
+def loads(data, format=None):
+    """Parse a pattern from a bytes-like object, detecting the format if not given."""
+    return PARSERS[format or detect_format(data)](data)
+
+
+def load(filename, format=None):
+    """Load a pattern file, detecting the format if not given."""
+    with open(filename, 'rb') as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can not be memory mapped
+            data = file.read()
+
+        try:
+            return loads(data, format=format)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+def dumps(rows, cols, cells):
+    """Return a board in the plaintext format, ``X`` for living cells."""
+    lines = []
+    for index in range(0, rows * cols, cols):
+        lines.append(b''.join(b'X' if cell else b'.' for cell in cells[index:index + cols]))
+
+    return b'\n'.join(lines) + b'\n' if lines else b''
@@ -0,0 +1,122 @@
+"""Performance measurements of a run."""
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_memory():
+    """Return the peak resident memory of the process in bytes, or None if unknown."""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def throughput_report(generations, cells, seconds):
+    """Return a summary line of the generations and cell updates per second."""
+    seconds = max(seconds, 1e-9)
+    memory = peak_memory()
+
+    return u'{} generations in {:.3f}s: {:.1f} generations/s, {:.3g} cell-updates/s, ' \
+           u'peak memory {}'.format(generations, seconds, generations / seconds,
+                                    generations * cells / seconds,
+                                    '{:.1f} MB'.format(memory / 1e6) if memory else 'unknown')
+
+
+class Metrics(object):
+    """Live counters of a run, updated while it runs and readable at any time.
+
+    - ``step_time``: seconds per generation of the last step
+    - ``draw_time``: seconds the last frame took to draw
+    - ``population`` and ``changed``: living and changed cells of the last
+      generation, None when not known
+    - ``generations_per_second``: achieved over the last ``rate_interval``
+    - ``dropped_frames``: generations which were never drawn
+    - ``tiles_evaluated`` and ``tiles_changed``: tiles of the last generation
+      the tiled engine recalculated and which changed, None for other engines
+
+    Callers check ``enabled`` before measuring anything, so disabled metrics
+    only cost that check.
+    """
+
+    def __init__(self, enabled=True, rate_interval=1.0, clock=time.time):
+        self.enabled = enabled
+        self.rate_interval = rate_interval
+
+        self.generation = 0
+        self.step_time = 0.0
+        self.draw_time = 0.0
+        self.population = None
+        self.changed = None
+        self.generations_per_second = 0.0
+        self.dropped_frames = 0
+        self.tiles_evaluated = None
+        self.tiles_changed = None
+
+        self._clock = clock
+        self._rate_started = None
+        self._rate_generation = 0
+
+    def record_step(self, generation, seconds, generations=1):
+        """Record that ``generations`` were stepped in ``seconds``, up to ``generation``."""
+        self.step_time = seconds / max(generations, 1)
+
+        now = self._clock()
+        if self._rate_started is None or generation < self._rate_generation:
+            self._rate_started, self._rate_generation = now, generation
+        elif now - self._rate_started >= self.rate_interval:
+            self.generations_per_second = ((generation - self._rate_generation)
+                                           / (now - self._rate_started))
+            self._rate_started, self._rate_generation = now, generation
+
+        self.generation = generation
+
+    def record_cells(self, population, changed=None):
+        self.population = population
+        self.changed = changed
+
+    def record_tiles(self, evaluated, changed):
+        self.tiles_evaluated = evaluated
+        self.tiles_changed = changed
+
+    def record_draw(self, seconds):
+        self.draw_time = seconds
+
+    def record_dropped(self, frames=1):
+        self.dropped_frames += frames
+
+    def as_dict(self):
+        return {
+            'generation': self.generation,
+            'step_time': self.step_time,
+            'draw_time': self.draw_time,
+            'population': self.population,
+            'changed': self.changed,
+            'generations_per_second': self.generations_per_second,
+            'dropped_frames': self.dropped_frames,
+            'tiles_evaluated': self.tiles_evaluated,
+            'tiles_changed': self.tiles_changed,
+        }
+
+    def summary(self):
+        """Return the counters as a single line."""
+        parts = [u'{:.1f} gen/s'.format(self.generations_per_second),
+                 u'step {:.2f} ms'.format(self.step_time * 1000),
+                 u'draw {:.2f} ms'.format(self.draw_time * 1000)]
+        if self.population is not None:
+            parts.append(u'population {}'.format(self.population))
+        if self.changed is not None:
+            parts.append(u'changed {}'.format(self.changed))
+        if self.tiles_evaluated is not None:
+            parts.append(u'tiles evaluated {}, changed {}'.format(self.tiles_evaluated,
+                                                                  self.tiles_changed))
+        parts.append(u'dropped {}'.format(self.dropped_frames))
+
+        return u', '.join(parts)
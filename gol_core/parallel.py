@@ -0,0 +1,195 @@
+"""Multi-core stepping over shared memory.
+
+The board lives twice in :mod:`multiprocessing.shared_memory`: one buffer
+holds the current generation and the other receives the next one. Every
+worker process owns a horizontal stripe of the board. It reads the row above
+and below its stripe (its halo) straight from the neighbouring stripes and
+writes its part of the next generation. A barrier after each generation makes
+sure no worker reads a generation which is still being written.
+
+The board waits for its workers with a timeout and checks they are still
+alive in between. When one died, the barrier is broken to release the others
+and a :class:`WorkerError` is raised instead of waiting forever.
+
+Requires Python 3.8 or newer.
+"""
+import multiprocessing
+import threading
+from multiprocessing import shared_memory
+
+import numpy
+
+from gol_core.rules import get_rule
+from gol_core.vectorized import step_padded, to_array
+
+_STOP = -1
+
+# Seconds between two checks whether the workers are still alive
+_POLL_INTERVAL = 1.0
+
+
+class WorkerError(RuntimeError):
+    """A worker process of a :class:`ParallelBoard` died."""
+
+
+def _step_stripe(src, start, stop, rule):
+    """Calculate the next generation of rows ``start`` until ``stop``."""
+    rows = src.shape[0]
+
+    stripe = src[numpy.arange(start - 1, stop + 1) % rows]
+    padded = numpy.concatenate((stripe[:, -1:], stripe, stripe[:, :1]), axis=1)
+
+    return step_padded(padded, rule)
+
+
+def _worker(names, shape, start, stop, rule, started, done, step_barrier, command):
+    memories = [shared_memory.SharedMemory(name=name) for name in names]
+    buffers = [numpy.ndarray(shape, dtype=numpy.uint8, buffer=memory.buf)
+               for memory in memories]
+    src = dst = None
+    current = 0
+
+    try:
+        while True:
+            started.acquire()
+            generations = command.value
+            if generations == _STOP:
+                break
+
+            for _ in range(generations):
+                src, dst = buffers[current], buffers[1 - current]
+                dst[start:stop] = _step_stripe(src, start, stop, rule)
+                current = 1 - current
+
+                step_barrier.wait()
+
+            done.release()
+    except threading.BrokenBarrierError:
+        # Another worker died, see ParallelBoard._wait
+        pass
+    finally:
+        del src, dst, buffers
+        for memory in memories:
+            memory.close()
+
+
+class ParallelBoard(object):
+    """A torodial board which is stepped by a pool of worker processes.
+
+    Use it as a context manager, or call :meth:`close` to stop the workers
+    and release the shared memory.
+    """
+
+    def __init__(self, board, workers=None, rule=None):
+        self.rows, self.cols = board.shape
+        self.generation = 0
+        self.rule = get_rule(rule)
+
+        workers = workers or multiprocessing.cpu_count()
+        self.workers = max(1, min(workers, self.rows))
+
+        size = max(1, board.size)
+        self._memories = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+        self._buffers = [numpy.ndarray(board.shape, dtype=numpy.uint8, buffer=memory.buf)
+                         for memory in self._memories]
+        self._buffers[0][:] = board
+        self._current = 0
+
+        self._command = multiprocessing.Value('q', 0, lock=False)
+        # Released once per worker for every command and once by every worker when done
+        self._started = multiprocessing.Semaphore(0)
+        self._done = multiprocessing.Semaphore(0)
+        # Kept, spawned workers unpickle the barrier after this method returned
+        self._step_barrier = multiprocessing.Barrier(self.workers)
+
+        names = [memory.name for memory in self._memories]
+        bounds = numpy.linspace(0, self.rows, self.workers + 1).astype(int)
+
+        self._processes = [
+            multiprocessing.Process(target=_worker,
+                                    args=(names, board.shape, bounds[i], bounds[i + 1], self.rule,
+                                          self._started, self._done, self._step_barrier,
+                                          self._command))
+            for i in range(self.workers)
+        ]
+        for process in self._processes:
+            process.daemon = True
+            process.start()
+
+    def step(self, generations=1):
+        """Advance the board by the given number of generations."""
+        if generations <= 0:
+            return
+
+        self._command.value = generations
+        for _ in self._processes:
+            self._started.release()
+        for _ in self._processes:
+            self._wait(self._done)
+
+        self._current = (self._current + generations) % 2
+        self.generation += generations
+
+    def _wait(self, semaphore):
+        """Acquire the semaphore, or raise a :class:`WorkerError` when a worker died."""
+        while not semaphore.acquire(timeout=_POLL_INTERVAL):
+            for process in self._processes:
+                if not process.is_alive():
+                    # Releases the workers waiting for the dead one
+                    self._step_barrier.abort()
+                    raise WorkerError('A worker of the parallel engine died with exit code {}'
+                                      .format(process.exitcode))
+
+    def to_array(self):
+        """Return a copy of the current generation."""
+        return self._buffers[self._current].copy()
+
+    def cells(self):
+        """Return the cells as a flat tuple, like :func:`gol.calculate_next_generation`."""
+        return tuple(self._buffers[self._current].astype(bool).ravel().tolist())
+
+    def close(self):
+        if self._processes is None:
+            return
+
+        self._command.value = _STOP
+        for _ in self._processes:
+            self._started.release()
+        for process in self._processes:
+            process.join(_POLL_INTERVAL * 5)
+            if process.is_alive():
+                # Still waiting for a worker which died
+                process.terminate()
+                process.join()
+        self._processes = None
+
+        del self._buffers
+        for memory in self._memories:
+            memory.close()
+            memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def create_board(rows, cols, cells, rule=None):
+    """Return a :class:`ParallelBoard`, kept between generations by :mod:`gol_core.stream`.
+
+    Its workers keep running until the stream ends or is closed.
+    """
+    return ParallelBoard(to_array(rows, cols, cells), rule=rule)
+
+
+def calculate_next_generation(rows, cols, cells, rule=None):
+    """Calculate next generation, see :func:`gol.calculate_next_generation`.
+
+    The workers are started for every call, :func:`gol_core.stream.generations`
+    keeps a :class:`ParallelBoard` between generations instead.
+    """
+    with create_board(rows, cols, cells, rule=rule) as board:
+        board.step()
+
+        return board.cells()
@@ -0,0 +1,169 @@
+"""Producer/consumer pipeline decoupling stepping from displaying.
+
+A background thread steps the board and puts the generations in a bounded
+lookahead queue. A display takes the newest generation whenever it is ready
+to draw a frame; the generations it had no time for are dropped. Stepping
+therefore runs at full speed without ever waiting for the display.
+
+The births and deaths of all generations since the last one taken are
+combined, so a display only has to update the cells which really changed.
+"""
+import threading
+import time
+from collections import deque
+
+from gol_core.engines import DEFAULT_ENGINE
+from gol_core.stream import generations
+
+
+class GenerationPipeline(object):
+    """Step a board in a background thread, see the module documentation.
+
+    :param generation: the generation number of the given cells
+    :param lookahead: the maximum number of generations waiting in the queue,
+        when it is full the oldest one is dropped
+    :param interval: seconds to wait between two generations, 0 for full speed
+    :param detector: an optional :class:`gol_core.cycles.CycleDetector`, the
+        pipeline finishes when it detects a cycle
+    :param metrics: optional :class:`gol_core.metrics.Metrics` to record the
+        step times and dropped generations in
+    :param tracer: optional :class:`gol_core.tracing.Tracer` to record a
+        ``step`` span per generation and a ``take`` span per :meth:`latest` in
+    :param checkpointer: optional :class:`gol_core.checkpoint.Checkpointer`,
+        every generation is offered to it
+    """
+
+    def __init__(self, rows, cols, cells, generation=0, engine=DEFAULT_ENGINE,
+                 lookahead=16, interval=0, detector=None, rule=None, metrics=None,
+                 tracer=None, checkpointer=None):
+        self.rows = rows
+        self.cols = cols
+        self.engine = engine
+        self.rule = rule
+        self.lookahead = lookahead
+        self.interval = interval
+        self.detector = detector
+        self.metrics = metrics
+        self.tracer = tracer
+        self.checkpointer = checkpointer
+
+        self.dropped = 0
+        self.finished = False
+        # Why stepping stopped early, like an engine which does not support the rule
+        self.error = None
+
+        self._cells = cells
+        self._first_generation = generation
+        self._queue = deque()
+        self._changed = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._produce, name='pipeline')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, wait=False):
+        """Stop stepping, generations already in the queue can still be taken.
+
+        The generation being calculated is finished first, with ``wait`` this
+        call blocks until it is.
+        """
+        self._stopped.set()
+
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def _until(self, generation, cells):
+        if self._stopped.is_set():
+            return True
+
+        return (self.detector is not None
+                and self.detector.add(self._first_generation + generation, cells))
+
+    def _produce(self):
+        stream = generations(self.rows, self.cols, self._cells, engine=self.engine,
+                             until=self._until, deltas=True, rule=self.rule,
+                             metrics=self.metrics)
+        metrics = self.metrics
+        tracer = self.tracer
+
+        step_started = time.time()
+        trace_started = tracer.now() if tracer is not None else None
+        try:
+            for generation, cells, births, deaths in stream:
+                if generation == 0:
+                    # The first generation is already on display
+                    continue
+
+                if metrics is not None and metrics.enabled:
+                    metrics.record_step(self._first_generation + generation,
+                                        time.time() - step_started)
+                if tracer is not None and tracer.enabled:
+                    tracer.add('step', trace_started, tracer.now(), 'pipeline')
+
+                with self._lock:
+                    # A cell which changed twice is back at its displayed state
+                    self._changed.symmetric_difference_update(births)
+                    self._changed.symmetric_difference_update(deaths)
+                    self._queue.append((self._first_generation + generation, cells))
+                    if len(self._queue) > self.lookahead:
+                        self._queue.popleft()
+                        self.dropped += 1
+                        if metrics is not None and metrics.enabled:
+                            metrics.record_dropped()
+
+                if self.checkpointer is not None:
+                    self.checkpointer.offer(self._first_generation + generation, cells)
+
+                if self.interval:
+                    self._stopped.wait(self.interval)
+
+                step_started = time.time()
+                if tracer is not None:
+                    trace_started = tracer.now()
+        except ValueError as error:
+            # The engine does not support the rule
+            self.error = error
+            self.finished = True
+            return
+
+        self.finished = not self._stopped.is_set()
+
+    def latest(self):
+        """Take the newest generation from the queue, or None when it is empty.
+
+        Returns ``(generation, cells, births, deaths)``, the births and deaths
+        being relative to the generation taken before.
+        """
+        if self.tracer is not None:
+            with self.tracer.span('take', 'pipeline'):
+                return self._take()
+
+        return self._take()
+
+    def _take(self):
+        with self._lock:
+            if not self._queue:
+                return None
+
+            generation, cells = self._queue.pop()
+            self.dropped += len(self._queue)
+            if self.metrics is not None and self.metrics.enabled:
+                self.metrics.record_dropped(len(self._queue))
+            self._queue.clear()
+
+            changed, self._changed = self._changed, set()
+
+        births = tuple(sorted(index for index in changed if cells[index]))
+        deaths = tuple(sorted(index for index in changed if not cells[index]))
+
+        return generation, cells, births, deaths
+
+    @property
+    def exhausted(self):
+        """Whether the pipeline finished and everything has been taken."""
+        with self._lock:
+            return self.finished and not self._queue
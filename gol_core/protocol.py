@@ -0,0 +1,132 @@
+"""Frames sent by the simulation server (:mod:`gol_core.server`) to its clients.
+
+Every frame starts with a header of its kind (1 byte), the generation (u64)
+and the length of the payload (u32), all numbers little-endian:
+
+- ``K`` keyframe: rows (u32), cols (u32), rule length (u16), the rulestring
+  and the bit-packed cells, zlib compressed.
+- ``D`` delta: the number of births and deaths (u32 each), then their
+  indices, zlib compressed. Indices are sorted and stored as the gaps
+  between them, which compress well.
+- ``E`` end: the simulation finished, no payload.
+
+A client first gets a keyframe and then deltas relative to the previous
+frame it got. When a client falls behind, the generations it had no time for
+are combined into one delta (or keyframe, when that is smaller).
+"""
+import struct
+import zlib
+
+import numpy
+
+KEYFRAME = b'K'
+DELTA = b'D'
+END = b'E'
+
+HEADER = struct.Struct('<cQI')
+_KEYFRAME = struct.Struct('<IIH')
+_DELTA = struct.Struct('<II')
+
+DEFAULT_HOST = '127.0.0.1'
+
+
+class Frame(object):
+    """A decoded frame, which attributes are set depends on the kind."""
+
+    def __init__(self, kind, generation, rows=None, cols=None, rule=None, cells=None,
+                 births=(), deaths=()):
+        self.kind = kind
+        self.generation = generation
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule
+        # A bytearray with one byte (0 or 1) per cell
+        self.cells = cells
+        self.births = births
+        self.deaths = deaths
+
+
+def _frame(kind, generation, payload=b''):
+    return HEADER.pack(kind, generation, len(payload)) + payload
+
+
+def encode_keyframe(generation, rows, cols, cells, rule):
+    rulestring = rule.encode('ascii')
+    packed = numpy.packbits(numpy.asarray(cells, dtype=bool).ravel())
+
+    return _frame(KEYFRAME, generation,
+                  _KEYFRAME.pack(rows, cols, len(rulestring)) + rulestring
+                  + zlib.compress(packed.tobytes(), 1))
+
+
+def _gaps(indices):
+    indices = numpy.sort(numpy.asarray(indices, dtype=numpy.int64))
+
+    return numpy.diff(indices, prepend=0).astype('<u4')
+
+
+def encode_delta(generation, births, deaths):
+    payload = numpy.concatenate((_gaps(births), _gaps(deaths))).tobytes()
+
+    return _frame(DELTA, generation,
+                  _DELTA.pack(len(births), len(deaths)) + zlib.compress(payload, 1))
+
+
+def encode_end(generation):
+    return _frame(END, generation)
+
+
+def keyframe_is_smaller(rows, cols, changed):
+    """Whether a keyframe is smaller than a delta of ``changed`` cells, uncompressed."""
+    return changed * 4 > (rows * cols + 7) // 8
+
+
+def decode(kind, generation, payload):
+    """Decode a frame from its header fields and payload."""
+    if kind == KEYFRAME:
+        rows, cols, rule_length = _KEYFRAME.unpack_from(payload, 0)
+        position = _KEYFRAME.size
+        rule = payload[position:position + rule_length].decode('ascii')
+
+        packed = numpy.frombuffer(zlib.decompress(payload[position + rule_length:]),
+                                  dtype=numpy.uint8)
+        cells = bytearray(numpy.unpackbits(packed, count=rows * cols).tobytes())
+
+        return Frame(kind, generation, rows=rows, cols=cols, rule=rule, cells=cells)
+
+    if kind == DELTA:
+        birth_count, death_count = _DELTA.unpack_from(payload, 0)
+        gaps = numpy.frombuffer(zlib.decompress(payload[_DELTA.size:]), dtype='<u4')
+        if len(gaps) != birth_count + death_count:
+            raise ValueError('Damaged delta frame for generation {}'.format(generation))
+
+        births = numpy.cumsum(gaps[:birth_count], dtype=numpy.int64)
+        deaths = numpy.cumsum(gaps[birth_count:], dtype=numpy.int64)
+
+        return Frame(kind, generation, births=tuple(births.tolist()),
+                     deaths=tuple(deaths.tolist()))
+
+    if kind == END:
+        return Frame(kind, generation)
+
+    raise ValueError('Unknown frame kind: {!r}'.format(kind))
+
+
+def parse_address(address):
+    """Return ``('unix', path)`` or ``('tcp', (host, port))`` for an address.
+
+    Addresses are ``unix:<path>``, a path containing a ``/``, ``<host>:<port>``
+    or a port on the local host.
+    """
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    if '/' in address:
+        return 'unix', address
+
+    host, _, port = address.rpartition(':')
+    try:
+        port = int(port)
+    except ValueError:
+        raise ValueError('Invalid address: {!r} (expected a path or host:port)'.format(address))
+
+    return 'tcp', (host or DEFAULT_HOST, port)
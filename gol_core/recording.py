@@ -0,0 +1,191 @@
+"""Compact binary recordings of a run.
+
+File layout (all numbers little-endian)::
+
+    header   b'GOLR', version (u8), rows (u32), cols (u32), keyframe interval (u32)
+    frames   one per generation: kind (b'K' or b'D'), length (u32), payload
+    index    offset of every frame (u64 each)
+    trailer  frame count (u64), index offset (u64), b'GOLI'
+
+A keyframe holds the bit-packed cells of a generation. Every other frame
+holds the XOR with the previous generation as a list of runs of changed
+bytes: run count (u32), then per run its offset (u32), length (u32) and
+bytes. Stable regions cost nothing. To read a generation the reader starts
+at the nearest keyframe before it, so at most ``keyframe_interval - 1``
+deltas are applied.
+"""
+import mmap
+import struct
+
+import numpy
+
+MAGIC = b'GOLR'
+INDEX_MAGIC = b'GOLI'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBIII')
+_FRAME = struct.Struct('<cI')
+_RUN = struct.Struct('<II')
+_TRAILER = struct.Struct('<QQ4s')
+
+KEYFRAME = b'K'
+DELTA = b'D'
+
+# Unchanged bytes between two changes which are still stored in one run
+# rather than starting a new run (a run costs 8 bytes of overhead)
+_MAX_GAP = 8
+
+
+def _pack(cells):
+    return numpy.packbits(numpy.asarray(cells, dtype=bool).ravel())
+
+
+def _encode_delta(xor):
+    changed = numpy.flatnonzero(xor)
+    if not len(changed):
+        return struct.pack('<I', 0)
+
+    breaks = numpy.flatnonzero(numpy.diff(changed) > _MAX_GAP)
+    starts = numpy.concatenate(([changed[0]], changed[breaks + 1]))
+    stops = numpy.concatenate((changed[breaks], [changed[-1]])) + 1
+
+    parts = [struct.pack('<I', len(starts))]
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        parts.append(_RUN.pack(start, stop - start))
+        parts.append(xor[start:stop].tobytes())
+
+    return b''.join(parts)
+
+
+def _apply_delta(packed, payload):
+    (count,) = struct.unpack_from('<I', payload, 0)
+    position = 4
+    for _ in range(count):
+        start, length = _RUN.unpack_from(payload, position)
+        position += _RUN.size
+        packed[start:start + length] ^= numpy.frombuffer(payload, dtype=numpy.uint8,
+                                                         count=length, offset=position)
+        position += length
+
+
+class Recorder(object):
+    """Write the generations of a run to a recording file.
+
+    Call :meth:`add` for every generation, in order, and :meth:`close` (or
+    use the recorder as a context manager) to write the index.
+    """
+
+    def __init__(self, filename, rows, cols, keyframe_interval=64):
+        self.rows = rows
+        self.cols = cols
+        self.keyframe_interval = keyframe_interval
+
+        self._file = open(filename, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, VERSION, rows, cols, keyframe_interval))
+
+        self._offsets = []
+        self._previous = None
+
+    def add(self, cells):
+        """Record the next generation (a flat sequence of cells or an array)."""
+        packed = _pack(cells)
+
+        if len(self._offsets) % self.keyframe_interval == 0:
+            kind, payload = KEYFRAME, packed.tobytes()
+        else:
+            kind, payload = DELTA, _encode_delta(packed ^ self._previous)
+
+        self._offsets.append(self._file.tell())
+        self._file.write(_FRAME.pack(kind, len(payload)))
+        self._file.write(payload)
+
+        self._previous = packed
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        index_offset = self._file.tell()
+        self._file.write(numpy.array(self._offsets, dtype='<u8').tobytes())
+        self._file.write(_TRAILER.pack(len(self._offsets), index_offset, INDEX_MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Recording(object):
+    """Random access to the generations of a recording file.
+
+    The file is memory mapped, only the frames needed for a requested
+    generation are read.
+    """
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size + _TRAILER.size:
+            raise ValueError('Not a recording: the file is too short')
+
+        magic, version, self.rows, self.cols, self.keyframe_interval = \
+            _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError('Not a recording')
+        if version != VERSION:
+            raise ValueError('Unsupported recording version {} (expected {})'.format(
+                version, VERSION))
+
+        count, index_offset, index_magic = _TRAILER.unpack_from(
+            self._mmap, len(self._mmap) - _TRAILER.size)
+        if index_magic != INDEX_MAGIC:
+            raise ValueError('The recording has no index, was it closed?')
+
+        self._offsets = numpy.frombuffer(self._mmap, dtype='<u8', count=count,
+                                         offset=index_offset)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _frame(self, generation):
+        offset = int(self._offsets[generation])
+        kind, length = _FRAME.unpack_from(self._mmap, offset)
+        start = offset + _FRAME.size
+
+        return kind, self._mmap[start:start + length]
+
+    def array(self, generation):
+        """Return a generation as a ``rows`` x ``cols`` array."""
+        if not 0 <= generation < len(self):
+            raise IndexError('Generation {} is not recorded'.format(generation))
+
+        keyframe = generation - generation % self.keyframe_interval
+
+        kind, payload = self._frame(keyframe)
+        assert kind == KEYFRAME
+        packed = numpy.frombuffer(payload, dtype=numpy.uint8).copy()
+
+        for delta in range(keyframe + 1, generation + 1):
+            kind, payload = self._frame(delta)
+            _apply_delta(packed, payload)
+
+        cells = numpy.unpackbits(packed, count=self.rows * self.cols)
+
+        return cells.reshape(self.rows, self.cols)
+
+    def __getitem__(self, generation):
+        """Return a generation as a flat tuple of cells."""
+        return tuple(self.array(generation).astype(bool).ravel().tolist())
+
+    def close(self):
+        self._offsets = None
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,129 @@
+"""Life-like rules, parsed from rulestrings and compiled into lookup tables.
+
+A rulestring lists the numbers of living neighbours for which a dead cell is
+born and a living cell survives: ``B3/S23`` is Conway's Game of Life,
+``B36/S23`` HighLife. The ``S/B`` notation of older pattern files (``23/3``)
+is understood as well.
+
+Every engine looks the next state of a cell up in a table instead of testing
+the numbers, so all rules run at the same speed. Both tables are
+``bytearray`` objects:
+
+- ``table`` has 512 entries, one for every 3x3 neighbourhood. The index
+  holds the cells row by row, the top left cell being the most significant
+  of the nine bits and the centre cell bit 4.
+- ``counts`` has 18 entries, ``counts[9 * centre + neighbours]``, for engines
+  which count the neighbours anyway.
+
+``birth_mask`` and ``survival_mask`` hold the two halves of ``counts`` as the
+bits of an integer, which array engines shift by the neighbour counts.
+"""
+import re
+
+_RULESTRINGS = (
+    (re.compile(r'^B([0-8]*)/?S([0-8]*)$', re.IGNORECASE), 'BS'),
+    (re.compile(r'^S([0-8]*)/?B([0-8]*)$', re.IGNORECASE), 'SB'),
+    (re.compile(r'^([0-8]*)/([0-8]*)$'), 'SB'),
+)
+
+CENTRE = 1 << 4
+
+
+def _bit_count(number):
+    return bin(number).count('1')
+
+
+class Rule(object):
+    """A Life-like rule, see the module documentation."""
+
+    def __init__(self, births, survivals):
+        self.births = frozenset(births)
+        self.survivals = frozenset(survivals)
+
+        self.counts = bytearray(
+            [int(neighbours in self.births) for neighbours in range(9)]
+            + [int(neighbours in self.survivals) for neighbours in range(9)])
+
+        self.table = bytearray(512)
+        for neighbourhood in range(512):
+            centre = 1 if neighbourhood & CENTRE else 0
+            neighbours = _bit_count(neighbourhood & ~CENTRE)
+            self.table[neighbourhood] = self.counts[9 * centre + neighbours]
+
+        self.birth_mask = sum(1 << neighbours for neighbours in self.births)
+        self.survival_mask = sum(1 << neighbours for neighbours in self.survivals)
+
+    @property
+    def rulestring(self):
+        return 'B{}/S{}'.format(''.join(str(n) for n in sorted(self.births)),
+                                ''.join(str(n) for n in sorted(self.survivals)))
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and self.table == other.table
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(bytes(self.table))
+
+    def __repr__(self):
+        return 'Rule({!r})'.format(self.rulestring)
+
+    def __str__(self):
+        return self.rulestring
+
+
+def parse(rulestring):
+    """Parse a rulestring like ``B36/S23`` (or ``S23/B36``, ``23/36``)."""
+    text = rulestring.strip()
+    for expression, order in _RULESTRINGS:
+        match = expression.match(text)
+        if match:
+            first, second = (int(n) for n in match.group(1)), (int(n) for n in match.group(2))
+            return Rule(first, second) if order == 'BS' else Rule(second, first)
+
+    raise ValueError('Invalid rulestring: {!r} (expected something like B3/S23)'.format(
+        rulestring))
+
+
+CONWAY = parse('B3/S23')
+
+RULES = {
+    'life': CONWAY,
+    'highlife': parse('B36/S23'),
+    'daynight': parse('B3678/S34678'),
+    'seeds': parse('B2/S'),
+    'life-without-death': parse('B3/S012345678'),
+    'maze': parse('B3/S12345'),
+    'replicator': parse('B1357/S1357'),
+    '2x2': parse('B36/S125'),
+}
+
+
+def without_births_from_nothing(rule, engine):
+    """Return the rule, raise ValueError when it has B0.
+
+    Engines which skip empty space can not run rules that bring it to life.
+    """
+    rule = get_rule(rule)
+    if 0 in rule.births:
+        raise ValueError('The {} engine does not support rules with B0: {}'.format(engine, rule))
+
+    return rule
+
+
+def get_rule(rule=None):
+    """Return a :class:`Rule` for a rule, a name from ``RULES`` or a rulestring.
+
+    None stands for Conway's Game of Life.
+    """
+    if rule is None:
+        return CONWAY
+    if isinstance(rule, Rule):
+        return rule
+
+    try:
+        return RULES[rule.lower()]
+    except KeyError:
+        return parse(rule)
@@ -0,0 +1,254 @@
+"""Simulation server broadcasting the generations of one board to local clients.
+
+The server steps the board once, whatever the number of clients, and sends
+every client the frames of :mod:`gol_core.protocol` over a Unix socket or a
+TCP socket on the local host. Stepping runs in a worker thread, the event
+loop only passes the changes on.
+
+Every client has its own sender. When a client reads slower than the board
+is stepped, its sender waits for the socket while the changes of the
+generations it missed are combined, and it sends one frame for all of them
+as soon as the client catches up. Slow clients therefore get fewer frames
+but never hold up the simulation or the other clients.
+
+Requires Python 3 (asyncio), clients do not, see :mod:`gol_core.client`.
+"""
+import asyncio
+import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from gol_core import protocol
+from gol_core.engines import DEFAULT_ENGINE
+from gol_core.rules import get_rule
+from gol_core.stream import generations
+
+
+class _Subscriber(object):
+    """A connected client and the changes it has not been sent yet."""
+
+    def __init__(self, writer):
+        self.writer = writer
+
+        # Generations published while the previous frame was still waiting
+        self.coalesced = 0
+        self.sent = 0
+
+        self.ready = asyncio.Event()
+        self._generation = None
+        self._cells = None
+        self._changed = set()
+        self._keyframe = True
+        self._pending = False
+
+    def publish(self, generation, cells, births, deaths):
+        if self._pending:
+            self.coalesced += 1
+
+        self._generation, self._cells = generation, cells
+        if not self._keyframe:
+            self._changed.symmetric_difference_update(births)
+            self._changed.symmetric_difference_update(deaths)
+        self._pending = True
+        self.ready.set()
+
+    def take(self, rows, cols, rule):
+        """Return the frame to send, or None when there is nothing new."""
+        if not self._pending:
+            return None
+        self._pending = False
+
+        generation, cells, changed = self._generation, self._cells, self._changed
+        self._changed = set()
+
+        if self._keyframe or protocol.keyframe_is_smaller(rows, cols, len(changed)):
+            self._keyframe = False
+            return protocol.encode_keyframe(generation, rows, cols, cells, rule)
+
+        births = [index for index in changed if cells[index]]
+        deaths = [index for index in changed if not cells[index]]
+
+        return protocol.encode_delta(generation, births, deaths)
+
+
+class SimulationServer(object):
+    """Step a board and send its generations to all clients.
+
+    :param generation: the generation number of the given cells
+    :param interval: seconds to wait between two generations, 0 for full speed
+    :param limit: the last generation to step to, None to run forever
+    :param detector: an optional :class:`gol_core.cycles.CycleDetector`, the
+        simulation finishes when it detects a cycle
+    :param checkpointer: optional :class:`gol_core.checkpoint.Checkpointer`,
+        every generation is offered to it
+
+    Clients which connect after the simulation finished get the last
+    generation. The server runs until :meth:`close` is called or the task
+    running :meth:`serve` is cancelled.
+    """
+
+    def __init__(self, rows, cols, cells, generation=0, engine=DEFAULT_ENGINE, rule=None,
+                 interval=0, limit=None, detector=None, checkpointer=None):
+        self.rows = rows
+        self.cols = cols
+        self.engine = engine
+        self.rule = get_rule(rule)
+        self.interval = interval
+        self.limit = limit
+        self.detector = detector
+        self.checkpointer = checkpointer
+
+        self.generation = generation
+        self.cells = tuple(cells)
+        self.finished = False
+
+        # The address listened on, known once listening is set
+        self.address = None
+        self.listening = threading.Event()
+
+        self._first_generation = generation
+        self._subscribers = set()
+        self._stopped = False
+        self._loop = None
+        self._task = None
+        self._error = None
+
+    @property
+    def subscribers(self):
+        return len(self._subscribers)
+
+    def _until(self, generation, cells):
+        if self._stopped:
+            return True
+
+        return (self.detector is not None
+                and self.detector.add(self._first_generation + generation, cells))
+
+    async def _simulate(self):
+        stream = generations(self.rows, self.cols, self.cells, engine=self.engine,
+                             until=self._until, limit=self.limit, deltas=True, rule=self.rule)
+
+        try:
+            # One thread, the stream is never stepped from two threads at once
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                while True:
+                    state = await self._loop.run_in_executor(executor, next, stream, None)
+                    if state is None:
+                        break
+
+                    generation, cells, births, deaths = state
+                    self.generation, self.cells = self._first_generation + generation, cells
+
+                    for subscriber in self._subscribers:
+                        subscriber.publish(self.generation, cells, births, deaths)
+                    if self.checkpointer is not None:
+                        self.checkpointer.offer(self.generation, cells)
+
+                    if self.interval:
+                        await asyncio.sleep(self.interval)
+        finally:
+            # After the executor finished the step it was busy with
+            stream.close()
+
+        self.finished = True
+        for subscriber in self._subscribers:
+            subscriber.ready.set()
+
+    async def _serve_client(self, reader, writer):
+        subscriber = _Subscriber(writer)
+        subscriber.publish(self.generation, self.cells, (), ())
+        self._subscribers.add(subscriber)
+
+        rulestring = self.rule.rulestring
+        try:
+            while True:
+                subscriber.ready.clear()
+
+                frame = subscriber.take(self.rows, self.cols, rulestring)
+                if frame is not None:
+                    writer.write(frame)
+                    # Only waits when this client's socket is full
+                    await writer.drain()
+                    subscriber.sent += 1
+                elif self.finished:
+                    writer.write(protocol.encode_end(self.generation))
+                    await writer.drain()
+                    break
+                else:
+                    await subscriber.ready.wait()
+        except (ConnectionError, OSError):
+            # The client went away
+            pass
+        except asyncio.CancelledError:
+            # The server is closing
+            pass
+        finally:
+            self._subscribers.discard(subscriber)
+            writer.close()
+
+    async def _start_server(self, address):
+        kind, target = protocol.parse_address(address)
+
+        if kind == 'unix':
+            _remove_stale_socket(target)
+            server = await asyncio.start_unix_server(self._serve_client, path=target)
+            self.address = target
+        else:
+            host, port = target
+            server = await asyncio.start_server(self._serve_client, host=host, port=port)
+            self.address = '{}:{}'.format(*server.sockets[0].getsockname()[:2])
+
+        return server
+
+    async def serve(self, address):
+        """Listen on an address (see :func:`gol_core.protocol.parse_address`) and simulate."""
+        self._loop = asyncio.get_event_loop()
+        self._task = asyncio.current_task()
+
+        server = await self._start_server(address)
+        simulation = asyncio.ensure_future(self._simulate())
+        simulation.add_done_callback(self._simulation_done)
+        self.listening.set()
+
+        try:
+            async with server:
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            if self._error is None:
+                raise
+        finally:
+            self._stopped = True
+            simulation.cancel()
+            if protocol.parse_address(address)[0] == 'unix':
+                _remove_stale_socket(self.address)
+
+        # Stepping failed, like an engine which does not support the rule
+        raise self._error
+
+    def _simulation_done(self, simulation):
+        if not simulation.cancelled() and simulation.exception() is not None:
+            self._error = simulation.exception()
+            self._task.cancel()
+
+    def run(self, address):
+        """Serve until :meth:`close` is called."""
+        try:
+            asyncio.run(self.serve(address))
+        except asyncio.CancelledError:
+            pass
+
+    def close(self):
+        """Stop serving, may be called from any thread."""
+        if self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+
+def _remove_stale_socket(path):
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        return
+
+    if stat.S_ISSOCK(mode):
+        os.unlink(path)
@@ -0,0 +1,105 @@
+"""Sparse stepping engine which only stores the living cells.
+
+The board is a set of ``(x, y)`` coordinates of living cells. Neighbours are
+only counted around those cells, so the cost of a generation depends on the
+population and not on the size of the board. Pass ``rows`` and ``cols`` for
+the torodial board of :mod:`gol`, or leave them out for an unbounded plane.
+:func:`gol_core.stream.generations` keeps a :class:`SparseBoard` between
+generations, so the flat tuple of cells is only built for the generations
+it yields.
+
+Rules with B0 are not supported: they bring the empty space to life.
+"""
+from collections import Counter
+from itertools import compress, count
+
+from gol_core.rules import without_births_from_nothing
+
+OFFSETS = tuple((dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy)
+
+
+def count_neighbours(live, rows=None, cols=None):
+    """Count the living neighbours of every cell next to a living cell."""
+    if rows is None:
+        return Counter((x + dx, y + dy) for x, y in live for dx, dy in OFFSETS)
+
+    return Counter(((x + dx) % cols, (y + dy) % rows) for x, y in live for dx, dy in OFFSETS)
+
+
+def step(live, rows=None, cols=None, rule=None):
+    """Calculate the set of living cells of the next generation."""
+    counts = without_births_from_nothing(rule, 'sparse').counts
+    number_alive = count_neighbours(live, rows, cols)
+
+    # Living cells without any living neighbours are not counted at all
+    return set(cell for cell in set(number_alive).union(live)
+               if counts[9 * (cell in live) + number_alive[cell]])
+
+
+def from_cells(cols, cells):
+    """Convert a flat sequence of cells into a set of living cells."""
+    return set((index % cols, index // cols) for index in compress(count(), cells))
+
+
+def to_cells(rows, cols, live):
+    """Convert a set of living cells into a flat tuple of cells."""
+    cells = [False] * (rows * cols)
+    for x, y in live:
+        cells[y * cols + x] = True
+
+    return tuple(cells)
+
+
+class SparseBoard(object):
+    """A torodial board kept as the set of its living cells."""
+
+    def __init__(self, rows, cols, cells, rule=None):
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule
+        self.live = from_cells(cols, cells)
+
+        self._previous = self.live
+
+    def step(self, generations=1):
+        """Advance the board by the given number of generations."""
+        self._previous = self.live
+        for _ in range(generations):
+            self.live = step(self.live, self.rows, self.cols, self.rule)
+
+    def changes(self):
+        """Return the indices of the births and deaths of the last :meth:`step`."""
+        cols = self.cols
+        births = sorted(y * cols + x for x, y in self.live - self._previous)
+        deaths = sorted(y * cols + x for x, y in self._previous - self.live)
+
+        return tuple(births), tuple(deaths)
+
+    def cells(self):
+        """Return the cells as a flat tuple, like :func:`gol.calculate_next_generation`."""
+        return to_cells(self.rows, self.cols, self.live)
+
+
+def create_board(rows, cols, cells, rule=None):
+    """Return a :class:`SparseBoard`, kept between generations by :mod:`gol_core.stream`."""
+    return SparseBoard(rows, cols, cells, rule=rule)
+
+
+def calculate_next_generation(rows, cols, cells, rule=None):
+    """Calculate next generation, see :func:`gol.calculate_next_generation`."""
+    return to_cells(rows, cols, step(from_cells(cols, cells), rows, cols, rule))
+
+
+def calculate_next_generation_delta(rows, cols, cells, rule=None):
+    """Calculate next generation and changes, see :func:`gol.calculate_next_generation_delta`.
+
+    The changes are the differences between two sets of living cells, so they
+    cost time in proportion to the population only.
+    """
+    live = from_cells(cols, cells)
+    next_live = step(live, rows, cols, rule)
+
+    births = sorted(y * cols + x for x, y in next_live - live)
+    deaths = sorted(y * cols + x for x, y in live - next_live)
+
+    return to_cells(rows, cols, next_live), tuple(births), tuple(deaths)
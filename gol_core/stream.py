@@ -0,0 +1,188 @@
+"""Lazy streams of generations.
+
+:func:`generations` yields the generations of a board one by one, so callers
+no longer need to write their own stepping loop. Generations which are
+skipped by the stride are never converted into the user visible form, and
+the NumPy engine steps in place between two preallocated buffers. Engines
+which keep a board between generations (see
+:func:`gol_core.engines.get_board_factory`) step the whole stride at once.
+"""
+from gol_core.engines import DEFAULT_ENGINE, diff, get_board_factory, get_delta_engine, get_engine
+from gol_core.rules import get_rule
+
+
+class _EngineStepper(object):
+    """Step with the ``calculate_next_generation`` function of any engine."""
+
+    def __init__(self, rows, cols, cells, engine, rule=None, deltas=False):
+        self.rows = rows
+        self.cols = cols
+        self.rule = get_rule(rule)
+        self._cells = tuple(cells)
+        self._births = self._deaths = ()
+
+        if deltas:
+            self._calculate_next_generation = get_delta_engine(engine)
+        else:
+            self._calculate_next_generation = get_engine(engine)
+        self._deltas = deltas
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            if self._deltas:
+                self._cells, self._births, self._deaths = self._calculate_next_generation(
+                    self.rows, self.cols, self._cells, self.rule)
+            else:
+                self._cells = self._calculate_next_generation(self.rows, self.cols,
+                                                              self._cells, self.rule)
+
+    def changes(self):
+        return self._births, self._deaths
+
+    def cells(self):
+        return self._cells
+
+    def array(self):
+        raise ValueError('Arrays are only available with the numpy engine')
+
+    def record_metrics(self, metrics):
+        pass
+
+    def close(self):
+        pass
+
+
+class _BoardStepper(object):
+    """Step the board of an engine which keeps one between generations."""
+
+    def __init__(self, board, deltas=False):
+        self._board = board
+        self._deltas = deltas
+        self._cells = board.cells()
+        self._previous = None
+
+    def step(self, generations=1):
+        self._board.step(generations)
+
+        self._previous, self._cells = self._cells, None
+        if not self._deltas or hasattr(self._board, 'changes'):
+            self._previous = None
+
+    def changes(self):
+        changes = getattr(self._board, 'changes', None)
+        if changes is not None:
+            return changes()
+
+        return diff(self._previous, self.cells())
+
+    def cells(self):
+        if self._cells is None:
+            self._cells = self._board.cells()
+
+        return self._cells
+
+    def array(self):
+        raise ValueError('Arrays are only available with the numpy engine')
+
+    def record_metrics(self, metrics):
+        record_metrics = getattr(self._board, 'record_metrics', None)
+        if record_metrics is not None:
+            record_metrics(metrics)
+
+    def close(self):
+        close = getattr(self._board, 'close', None)
+        if close is not None:
+            close()
+
+
+class _BufferStepper(object):
+    """Step in place with the NumPy engine."""
+
+    def __init__(self, rows, cols, cells, rule=None):
+        from gol_core.vectorized import DoubleBuffer, to_array
+
+        self._board = DoubleBuffer(to_array(rows, cols, cells), rule=rule)
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            self._board.step()
+
+    def changes(self):
+        births, deaths = self._board.changes()
+
+        return tuple(births.tolist()), tuple(deaths.tolist())
+
+    def cells(self):
+        return tuple(self._board.current.astype(bool).ravel().tolist())
+
+    def array(self):
+        array = self._board.current.view()
+        array.flags.writeable = False
+
+        return array
+
+    def record_metrics(self, metrics):
+        pass
+
+    def close(self):
+        pass
+
+
+def generations(rows, cols, cells, engine=DEFAULT_ENGINE, stride=1, until=None,
+                limit=None, arrays=False, deltas=False, rule=None, metrics=None):
+    """Yield ``(generation, cells)`` for a board, starting with generation 0.
+
+    :param stride: only yield every n-th generation
+    :param until: a predicate ``until(generation, cells)``, the stream ends
+        after the first yielded generation for which it is true
+    :param limit: the last generation to yield (or pass)
+    :param arrays: with the numpy engine, yield read-only views of the
+        internal buffer instead of tuples. A view is only valid until the
+        next generation is requested.
+    :param deltas: yield ``(generation, cells, births, deaths)`` instead, with
+        the indices of the cells which came to life and died in the last step
+        (both empty for generation 0). Requires a stride of 1.
+    :param rule: the rule, see :func:`gol_core.rules.get_rule`
+    :param metrics: optional :class:`gol_core.metrics.Metrics`, engines which
+        keep a board record their own counters in it after every step, like
+        the tiles the tiled engine evaluated
+
+    The board an engine keeps is released when the stream ends or is closed.
+    """
+    if stride < 1:
+        raise ValueError('The stride must be at least 1')
+    if deltas and stride != 1:
+        raise ValueError('Deltas are only available with a stride of 1')
+
+    create_board = get_board_factory(engine)
+    if engine == 'numpy':
+        stepper = _BufferStepper(rows, cols, cells, rule=rule)
+    elif create_board is not None:
+        stepper = _BoardStepper(create_board(rows, cols, cells, rule=rule), deltas=deltas)
+    else:
+        stepper = _EngineStepper(rows, cols, cells, engine, rule=rule, deltas=deltas)
+
+    current = stepper.array if arrays else stepper.cells
+    generation = 0
+    births = deaths = ()
+
+    try:
+        while limit is None or generation <= limit:
+            state = current()
+            if deltas:
+                yield generation, state, births, deaths
+            else:
+                yield generation, state
+
+            if until is not None and until(generation, state):
+                return
+
+            stepper.step(stride)
+            generation += stride
+            if metrics is not None and metrics.enabled:
+                stepper.record_metrics(metrics)
+
+            if deltas:
+                births, deaths = stepper.changes()
+    finally:
+        stepper.close()
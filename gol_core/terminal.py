@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Differential ANSI terminal renderer.
+
+The first frame draws the whole board. After that only the cells which
+changed since the previous frame are written, using cursor addressing escape
+codes, and every frame goes out as a single write. With a target frame rate
+frames are skipped when the generations come in faster than that.
+"""
+import sys
+import time
+
+ESC = u'\x1b['
+CLEAR = ESC + u'2J' + ESC + u'H'
+HIDE_CURSOR = ESC + u'?25l'
+SHOW_CURSOR = ESC + u'?25h'
+CLEAR_LINE = ESC + u'K'
+
+# One column per cell, the changes are written at the column of their cell
+GLYPHS = (u' ', u'█')
+# Upper cell and lower cell combined in one character
+HALF_BLOCKS = {
+    (False, False): u' ',
+    (True, False): u'▀',
+    (False, True): u'▄',
+    (True, True): u'█',
+}
+
+# Unchanged characters between two changes which are rewritten instead of
+# moving the cursor again
+_MAX_GAP = 4
+
+
+def _move(line, column):
+    """Escape code to move the cursor, ``line`` and ``column`` start at 1."""
+    return u'{}{};{}H'.format(ESC, line, column)
+
+
+class TerminalRenderer(object):
+    """Render the generations of a board to a terminal.
+
+    :param fps: target frame rate, or None to draw every frame
+    :param half_blocks: draw two rows of cells per line of text
+    """
+
+    def __init__(self, rows, cols, stream=None, fps=None, half_blocks=False, clock=time.time):
+        self.rows = rows
+        self.cols = cols
+        self.stream = stream or sys.stdout
+        self.half_blocks = half_blocks
+
+        self.frames = 0
+        self.skipped = 0
+
+        self._interval = 1.0 / fps if fps else 0
+        self._clock = clock
+        self._last_frame = None
+        self._lines = None
+
+        self._height = (rows + 1) // 2 if half_blocks else rows
+
+    def _board_lines(self, cells):
+        cols = self.cols
+        rows = [cells[index:index + cols] for index in range(0, self.rows * cols, cols)]
+
+        if not self.half_blocks:
+            return [u''.join(GLYPHS[cell] for cell in row) for row in rows]
+
+        if len(rows) % 2:
+            rows.append((False,) * cols)
+
+        return [u''.join(HALF_BLOCKS[pair] for pair in zip(top, bottom))
+                for top, bottom in zip(rows[::2], rows[1::2])]
+
+    def _full_frame(self, lines):
+        border = u' ' + u'-' * self.cols
+        parts = [HIDE_CURSOR, CLEAR, border, u'\n']
+        for line in lines:
+            parts.extend((u'|', line, u'|\n'))
+        parts.append(border)
+
+        return parts
+
+    def _changes(self, lines):
+        parts = []
+        for number, (old, new) in enumerate(zip(self._lines, lines)):
+            if old == new:
+                continue
+
+            start = None
+            unchanged = 0
+            for column, (old_char, new_char) in enumerate(zip(old, new)):
+                if old_char != new_char:
+                    if start is None:
+                        start = column
+                    unchanged = 0
+                elif start is not None:
+                    unchanged += 1
+                    if unchanged > _MAX_GAP:
+                        end = column - unchanged + 1
+                        parts.extend((_move(number + 2, start + 2), new[start:end]))
+                        start = None
+
+            if start is not None:
+                end = len(new) - unchanged
+                parts.extend((_move(number + 2, start + 2), new[start:end]))
+
+        return parts
+
+    def render(self, generation, cells, status=None):
+        """Draw a generation, returns False when the frame was skipped."""
+        now = self._clock()
+        if self._last_frame is not None and now - self._last_frame < self._interval:
+            self.skipped += 1
+            return False
+        self._last_frame = now
+
+        lines = self._board_lines(cells)
+        parts = self._full_frame(lines) if self._lines is None else self._changes(lines)
+        self._lines = lines
+
+        if status is None:
+            status = u'Rows: {}, Columns: {}, Generation: {}'.format(self.rows, self.cols,
+                                                                    generation)
+        parts.extend((_move(self._height + 3, 1), status, CLEAR_LINE))
+
+        self.stream.write(u''.join(parts))
+        self.stream.flush()
+        self.frames += 1
+
+        return True
+
+    def close(self):
+        """Put the cursor below the board and show it again."""
+        self.stream.write(_move(self._height + 4, 1) + SHOW_CURSOR)
+        self.stream.flush()
@@ -0,0 +1,29 @@
+import sys
+
+from .bitpacked import BitPackedEngineTestCase
+from .blocks import BlockEngineTestCase
+from .checkpoint import CheckpointTestCase
+from .cycles import CycleDetectorTestCase
+from .ensemble import EnsembleTestCase
+from .hashlife import HashLifeEngineTestCase
+from .loaders import LoadersTestCase
+from .metrics import MetricsTestCase
+from .pipeline import GenerationPipelineTestCase
+from .protocol import ProtocolTestCase
+from .recording import RecordingTestCase
+from .rules import RulesTestCase
+from .sparse import SparseEngineTestCase
+from .stream import GenerationStreamTestCase
+from .terminal import TerminalRendererTestCase
+from .tiled import TiledEngineTestCase
+from .tracing import TracerTestCase
+from .vectorized import VectorizedEngineTestCase
+from .viewport import DensityPyramidTestCase, ViewportTestCase
+
+if sys.version_info >= (3, 8):
+    # The parallel engine shares the board with multiprocessing.shared_memory
+    from .parallel import ParallelEngineTestCase
+
+if sys.version_info >= (3, 7):
+    # The server runs on asyncio
+    from .server import SimulationServerTestCase
@@ -0,0 +1,85 @@
+import random
+from unittest import TestCase
+
+import numpy
+
+from gol import calculate_next_generation
+from gol_core import bitpacked
+from gol_core.stream import generations
+
+from .utils import load_pattern
+
+
+class BitPackedEngineTestCase(TestCase):
+
+    def assertSameGenerations(self, rows, cols, cells, generations):
+        expected = actual = tuple(cells)
+        for _ in range(generations):
+            expected = calculate_next_generation(rows, cols, expected)
+            actual = bitpacked.calculate_next_generation(rows, cols, actual)
+
+            self.assertEqual(actual, expected)
+
+    def test_patterns(self):
+        """
+        Case: The patterns are stepped with the per-cell and bit-packed engine
+        Expected: Both engines produce exactly the same generations
+        """
+        for name in ('glider.txt', 'pulsar.txt', 'living-forever-2.txt'):
+            rows, cols, cells = load_pattern(name)
+
+            self.assertSameGenerations(rows, cols, cells, 8)
+
+    def test_word_edges(self):
+        """
+        Case: Random boards of which the rows end inside, on and past a word
+        Expected: The torodial wrap is the same as in the per-cell engine
+        """
+        rnd = random.Random(7)
+        for rows, cols in ((5, 3), (4, 64), (6, 65), (3, 130), (1, 1)):
+            cells = [rnd.random() < 0.4 for _ in range(rows * cols)]
+
+            self.assertSameGenerations(rows, cols, cells, 6)
+
+    def test_padding_stays_clear(self):
+        """
+        Case: A row with live cells on both edges is stepped
+        Expected: The padding bits of the last word stay zero
+        """
+        cols = 70
+        cells = [True] * 3 * cols
+        board = bitpacked.step(bitpacked.pack(3, cols, cells), cols)
+
+        self.assertFalse((board[:, -1] >> numpy.uint64(cols - 64)).any())
+
+    def test_pack_in_chunks(self):
+        """
+        Case: A random board is packed a row, a few rows and all rows at a time
+        Expected: The packed words are the same
+        """
+        rnd = random.Random(3)
+        rows, cols = 9, 70
+        cells = [rnd.random() < 0.4 for _ in range(rows * cols)]
+
+        expected = bitpacked.pack(rows, cols, cells)
+        for chunk_cells in (1, 150, rows * cols):
+            numpy.testing.assert_array_equal(bitpacked.pack(rows, cols, cells, chunk_cells),
+                                             expected)
+
+    def test_stream_keeps_board(self):
+        """
+        Case: A glider is streamed with the bit-packed engine, 8 generations at a time
+        Expected: - The board is kept as packed words between the generations
+                  - The generations match the per-cell engine
+        """
+        rows, cols, cells = load_pattern('glider.txt')
+        board = bitpacked.create_board(rows, cols, cells)
+        self.assertEqual(board.board.dtype, numpy.uint64)
+        self.assertEqual(board.board.shape, (rows, bitpacked.words_per_row(cols)))
+
+        expected = tuple(cells)
+        for generation, actual in generations(rows, cols, cells, engine='bitpacked', stride=8,
+                                              limit=32):
+            self.assertEqual(actual, expected)
+            for _ in range(8):
+                expected = calculate_next_generation(rows, cols, expected)
@@ -0,0 +1,103 @@
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+from gol import calculate_next_generation
+from gol_core import blocks
+from gol_core.loaders import loads
+
+from .utils import PATTERNS_DIR, load_pattern
+
+GOL_PY = os.path.join(os.path.dirname(__file__), '..', '..', 'gol.py')
+
+
+class BlockEngineTestCase(TestCase):
+
+    def assertSameGenerations(self, rows, cols, cells, generations, rule=None):
+        expected = tuple(cells)
+        board = blocks.BlockBoard(rows, cols, cells, rule)
+        for _ in range(generations):
+            expected = calculate_next_generation(rows, cols, expected, rule)
+            board.step()
+
+            self.assertEqual(board.cells(), expected)
+
+    def test_patterns(self):
+        """
+        Case: The patterns are stepped with the per-cell and block engine
+        Expected: Both engines produce exactly the same generations
+        """
+        for name in ('glider.txt', 'pulsar.txt', 'living-forever-2.txt'):
+            self.assertSameGenerations(*load_pattern(name), generations=8)
+
+    def test_torodial_wrap(self):
+        """
+        Case: Random boards, down to a single block, are stepped with several rules
+        Expected: The wrap at the edges is the same as in the per-cell engine
+        """
+        rnd = random.Random(20)
+        for rows, cols in ((2, 2), (2, 6), (8, 4), (12, 30), (1, 1), (3, 4), (6, 7), (9, 5)):
+            cells = [rnd.random() < 0.4 for _ in range(rows * cols)]
+            for rule in (None, 'highlife', 'B0/S8'):
+                self.assertSameGenerations(rows, cols, cells, 4, rule)
+
+    def test_odd_boards(self):
+        """
+        Case: The glider gun, with an odd number of rows, is stepped with the block engine
+        Expected: - The board is stepped as two copies on top of each other
+                  - The generations match the per-cell engine
+        """
+        rows, cols, cells = load_pattern('gosper-glider-gun.txt')
+        self.assertEqual(rows % 2, 1)
+
+        board = blocks.BlockBoard(rows, cols, cells)
+        self.assertEqual(len(board._pairs), 2 * rows)
+
+        self.assertSameGenerations(rows, cols, cells, 30)
+
+    def test_table(self):
+        """
+        Case: The table is looked up for a full 4x4 block and a blinker
+        Expected: The full block dies out, the blinker turns
+        """
+        table = blocks.block_table()
+
+        self.assertEqual(table[0xffff], 0)
+        # Vertical blinker in the top three rows of the second column, it
+        # turns horizontal in the second row, the top half of the centre
+        self.assertEqual(table[0x4440], 0b1100)
+
+    def test_without_numpy(self):
+        """
+        Case: gol.py runs the pulsar, with even sides, with the block engine while NumPy can not
+              be imported
+        Expected: The run starts and ends with the same generation as the per-cell engine
+        """
+        rows, cols, cells = load_pattern('pulsar.txt')
+        self.assertEqual((rows % 2, cols % 2), (0, 0))
+        expected = tuple(cells)
+        for _ in range(8):
+            expected = calculate_next_generation(rows, cols, expected)
+
+        directory = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(directory, 'numpy.py'), 'w') as file:
+                file.write('raise ImportError("No module named numpy")\n')
+
+            env = dict(os.environ)
+            env['PYTHONPATH'] = os.pathsep.join(
+                path for path in (directory, env.get('PYTHONPATH')) if path)
+            with open(os.devnull, 'w') as devnull:
+                output = subprocess.check_output(
+                    [sys.executable, GOL_PY, '--engine', 'blocks', '--headless',
+                     '--generations', '8', '--output', '-',
+                     os.path.join(PATTERNS_DIR, 'pulsar.txt')],
+                    env=env, stderr=devnull)
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual(tuple(loads(output).cells()), expected)
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from gol_core import checkpoint
+from gol_core.checkpoint import Checkpointer
+from gol_core.pipeline import GenerationPipeline
+from gol_core.rules import RULES
+
+from .utils import FakeClock, load_pattern
+
+
+class CheckpointTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'run.ckpt')
+        self.rows, self.cols, self.cells = load_pattern('gosper-glider-gun.txt')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_and_load(self):
+        """
+        Case: A checkpoint is saved over an older one
+        Expected: The newer one is loaded, with its board, generation, rule and engine
+        """
+        checkpoint.save(self.filename, 2, 2, 1, [True, False, False, True])
+        checkpoint.save(self.filename, self.rows, self.cols, 12345, self.cells,
+                        rule='highlife', engine='blocks')
+
+        loaded = checkpoint.load(self.filename)
+
+        self.assertEqual((loaded.rows, loaded.cols), (self.rows, self.cols))
+        self.assertEqual(loaded.generation, 12345)
+        self.assertEqual(loaded.rule, RULES['highlife'].rulestring)
+        self.assertEqual(loaded.engine, 'blocks')
+        self.assertEqual(loaded.cells(), tuple(self.cells))
+        self.assertEqual(os.listdir(self.directory), ['run.ckpt'])
+
+    def test_damaged(self):
+        """
+        Case: A truncated checkpoint and another file are loaded
+        Expected: A ValueError
+        """
+        data = checkpoint.dumps(self.rows, self.cols, 1, self.cells)
+
+        for damaged in (data[:-5], data[:10], b'GOLR' + data[4:]):
+            with self.assertRaises(ValueError):
+                checkpoint.loads(damaged)
+
+    def test_header(self):
+        """
+        Case: A file with another magic and a checkpoint of a newer version are loaded
+        Expected: A ValueError telling which of the two it is
+        """
+        data = checkpoint.dumps(self.rows, self.cols, 1, self.cells)
+
+        with self.assertRaises(ValueError) as context:
+            checkpoint.loads(b'GOLR' + data[4:])
+        self.assertEqual(str(context.exception), 'Not a checkpoint')
+
+        with self.assertRaises(ValueError) as context:
+            checkpoint.loads(data[:4] + b'\x07' + data[5:])
+        self.assertEqual(str(context.exception), 'Unsupported checkpoint version 7 (expected 1)')
+
+    def test_interval(self):
+        """
+        Case: Every generation is offered to a checkpointer
+        Expected: One is written per interval, and one when forced
+        """
+        clock = FakeClock()
+        checkpointer = Checkpointer(self.filename, self.rows, self.cols, interval=10, clock=clock)
+
+        taken = []
+        for generation in range(25):
+            if checkpointer.offer(generation, self.cells):
+                taken.append(generation)
+            clock.now += 1
+
+        self.assertEqual(taken, [10, 20])
+        self.assertTrue(checkpointer.offer(25, self.cells, force=True))
+        checkpointer.close()
+
+        self.assertEqual(checkpointer.generation, 25)
+        self.assertEqual(checkpoint.load(self.filename).generation, 25)
+
+    def test_mutable_cells_are_copied(self):
+        """
+        Case: The cells offered are changed right after
+        Expected: The checkpoint holds the cells as they were offered
+        """
+        checkpointer = Checkpointer(self.filename, 2, 2)
+        cells = bytearray([1, 0, 0, 1])
+
+        checkpointer.offer(3, cells, force=True)
+        cells[:] = bytearray(4)
+        checkpointer.close()
+
+        self.assertEqual(checkpoint.load(self.filename).cells(), (True, False, False, True))
+
+    def test_resume_pipeline(self):
+        """
+        Case: A pipeline with a checkpointer is stopped and a new one continues from the checkpoint
+        Expected: The generations match the generations of a run without a break
+        """
+        reference = GenerationPipeline(self.rows, self.cols, self.cells, lookahead=1000)
+        reference.start()
+
+        checkpointer = Checkpointer(self.filename, self.rows, self.cols, interval=0)
+        pipeline = GenerationPipeline(self.rows, self.cols, self.cells, lookahead=1000,
+                                      checkpointer=checkpointer)
+        pipeline.start()
+        while checkpointer.written < 3:
+            time.sleep(.001)
+        pipeline.stop(wait=True)
+        checkpointer.close()
+
+        resumed = checkpoint.load(self.filename)
+        pipeline = GenerationPipeline(self.rows, self.cols, resumed.cells(),
+                                      generation=resumed.generation, lookahead=1000)
+        pipeline.start()
+        while len(pipeline._queue) < 5 or len(reference._queue) < resumed.generation + 5:
+            time.sleep(.001)
+        pipeline.stop(wait=True)
+        reference.stop(wait=True)
+
+        expected = dict(reference._queue)
+        for generation, cells in list(pipeline._queue)[:5]:
+            self.assertEqual(cells, expected[generation])
@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from gol import calculate_next_generation
+from gol_core.cycles import CycleDetector, generation_at
+
+from .utils import load_pattern
+
+
+class CycleDetectorTestCase(TestCase):
+
+    def run_detector(self, rows, cols, cells, detector, generations):
+        cells = tuple(cells)
+        states = []
+        for generation in range(generations):
+            states.append(cells)
+            if detector.add(generation, cells):
+                break
+            cells = calculate_next_generation(rows, cols, cells)
+
+        return states
+
+    def test_still_life(self):
+        """
+        Case: A block is added for a few generations
+        Expected: It is detected as a still life from generation 0
+        """
+        cells = [False] * 16
+        for index in (5, 6, 9, 10):
+            cells[index] = True
+
+        detector = CycleDetector()
+        self.run_detector(4, 4, cells, detector, 5)
+
+        self.assertTrue(detector.still_life)
+        self.assertEqual(detector.onset, 0)
+        self.assertEqual(detector.state_at(10 ** 9), tuple(cells))
+
+    def test_oscillator(self):
+        """
+        Case: The pulsar pattern is run until it repeats
+        Expected: - The period and onset are reported
+                  - Later generations are looked up from the cycle
+        """
+        rows, cols, cells = load_pattern('pulsar.txt')
+
+        detector = CycleDetector()
+        states = self.run_detector(rows, cols, cells, detector, 20)
+
+        self.assertEqual(detector.period, 3)
+        self.assertEqual(detector.onset, 2)
+        self.assertEqual(detector.state_at(3000002), states[2])
+        self.assertEqual(detector.state_at(3000003), states[3])
+
+        with self.assertRaises(ValueError):
+            detector.state_at(1)
+
+    def test_window(self):
+        """
+        Case: The period is longer than the window
+        Expected: The cycle is not detected
+        """
+        rows, cols, cells = load_pattern('pulsar.txt')
+
+        detector = CycleDetector(window=2)
+        self.run_detector(rows, cols, cells, detector, 20)
+
+        self.assertFalse(detector.settled)
+
+    def test_generation_at(self):
+        """
+        Case: A far generation of an oscillator is requested
+        Expected: It equals the matching generation within the cycle
+        """
+        rows, cols, cells = load_pattern('pulsar.txt')
+
+        expected = tuple(cells)
+        for _ in range(2):
+            expected = calculate_next_generation(rows, cols, expected)
+
+        self.assertEqual(generation_at(rows, cols, cells, 10 ** 12 + 1), expected)
@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+import numpy
+
+from gol_core import vectorized
+from gol_core.ensemble import Ensemble
+
+
+class EnsembleTestCase(TestCase):
+
+    def test_same_as_single_boards(self):
+        """
+        Case: A stack of random boards is stepped as an ensemble
+        Expected: Every board equals the board stepped on its own
+        """
+        ensemble = Ensemble.random(20, 12, 9, density=0.35, seed=1)
+        singles = [board.copy() for board in ensemble.boards]
+
+        ensemble.step(10)
+        for index, board in enumerate(singles):
+            for _ in range(10):
+                board = vectorized.step(board)
+
+            self.assertTrue(numpy.array_equal(ensemble.boards[index], board))
+            self.assertEqual(ensemble.population[index], board.sum())
+
+    def test_statistics(self):
+        """
+        Case: An ensemble of an empty board, a block, a blinker and a glider
+        Expected: Extinction and stabilization are reported per board
+        """
+        boards = numpy.zeros((4, 8, 8), dtype=numpy.uint8)
+        boards[1, 2:4, 2:4] = 1
+        boards[2, 3, 2:5] = 1
+        for y, x in ((0, 1), (1, 2), (2, 0), (2, 1), (2, 2)):
+            boards[3, y, x] = 1
+
+        ensemble = Ensemble(boards)
+        ensemble.step(5)
+
+        self.assertEqual(ensemble.extinct.tolist(), [True, False, False, False])
+        self.assertEqual(ensemble.population.tolist(), [0, 4, 3, 5])
+        self.assertEqual(ensemble.settled.tolist(), [True, True, True, False])
+        self.assertEqual(ensemble.period.tolist(), [1, 1, 2, 0])
+        self.assertEqual(ensemble.settled_at.tolist(), [0, 0, 0, -1])
@@ -0,0 +1,123 @@
+import random
+from unittest import TestCase
+
+from gol import calculate_next_generation
+from gol_core import hashlife
+from gol_core.stream import generations
+
+from .utils import load_pattern
+
+
+def live_cells(rows, cols, cells):
+    return [(index % cols, index // cols) for index, cell in enumerate(cells) if cell]
+
+
+class HashLifeEngineTestCase(TestCase):
+
+    def test_torodial_adapter(self):
+        """
+        Case: Random boards are stepped with the per-cell and HashLife engine
+        Expected: Both engines produce exactly the same generations
+        """
+        rnd = random.Random(3)
+        for rows, cols in ((5, 3), (7, 9), (1, 1)):
+            expected = actual = tuple(rnd.random() < 0.4 for _ in range(rows * cols))
+            for _ in range(5):
+                expected = calculate_next_generation(rows, cols, expected)
+                actual = hashlife.calculate_next_generation(rows, cols, actual)
+
+                self.assertEqual(actual, expected)
+
+    def test_board_jumps(self):
+        """
+        Case: A torodial board is advanced in jumps longer than it is wide
+        Expected: It matches the per-cell engine after every jump
+        """
+        rows, cols, cells = load_pattern('gosper-glider-gun.txt')
+
+        board = hashlife.HashLifeBoard(rows, cols, cells)
+        expected = tuple(cells)
+        for jump in (1, 7, 100):
+            board.step(jump)
+            for _ in range(jump):
+                expected = calculate_next_generation(rows, cols, expected)
+
+            self.assertEqual(board.cells(), expected)
+        self.assertEqual(board.generation, 108)
+
+    def test_stream_stride(self):
+        """
+        Case: A stream of the HashLife engine skips generations with a stride
+        Expected: The generations yielded match the per-cell engine
+        """
+        rows, cols, cells = load_pattern('glider.txt')
+
+        expected = [tuple(cells)]
+        for _ in range(40):
+            expected.append(calculate_next_generation(rows, cols, expected[-1]))
+
+        stream = generations(rows, cols, cells, engine='hashlife', stride=20, limit=40)
+        self.assertEqual(list(stream), [(0, expected[0]), (20, expected[20]),
+                                        (40, expected[40])])
+
+    def test_glider_moves(self):
+        """
+        Case: A glider on the unbounded plane is advanced 4 * 1000 generations
+        Expected: It is the same glider, moved 1000 cells diagonally
+        """
+        glider = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+        universe = hashlife.HashLife()
+        universe.set_cells(glider)
+        universe.advance(4000)
+
+        self.assertEqual(universe.generation, 4000)
+        self.assertEqual(sorted(universe.live_cells()),
+                         sorted((x + 1000, y + 1000) for x, y in glider))
+
+    def test_jump_equals_single_steps(self):
+        """
+        Case: The glider gun is advanced in one call and generation by generation
+        Expected: Both universes contain the same cells
+        """
+        cells = live_cells(*load_pattern('gosper-glider-gun.txt'))
+
+        jumped = hashlife.HashLife()
+        jumped.set_cells(cells)
+        jumped.advance(77)
+
+        stepped = hashlife.HashLife()
+        stepped.set_cells(cells)
+        for _ in range(77):
+            stepped.advance(1)
+
+        self.assertEqual(sorted(jumped.live_cells()), sorted(stepped.live_cells()))
+
+    def test_far_jump(self):
+        """
+        Case: The glider gun is advanced a billion generations
+        Expected: It has shot a glider every 30 generations
+        """
+        universe = hashlife.HashLife()
+        universe.set_cells(live_cells(*load_pattern('gosper-glider-gun.txt')))
+        universe.advance(10 ** 9)
+
+        self.assertEqual(universe.population, 166666713)
+
+    def test_memory_cap(self):
+        """
+        Case: A universe with a small node cap runs for a while
+        Expected: Unreachable nodes are collected without changing the outcome
+        """
+        cells = live_cells(*load_pattern('gosper-glider-gun.txt'))
+
+        capped = hashlife.HashLife(max_nodes=2000)
+        capped.set_cells(cells)
+        uncapped = hashlife.HashLife()
+        uncapped.set_cells(cells)
+        for _ in range(60):
+            capped.advance(1)
+        uncapped.advance(60)
+
+        self.assertGreater(capped.collections, 0)
+        self.assertEqual(sorted(capped.live_cells()), sorted(uncapped.live_cells()))
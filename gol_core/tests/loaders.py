@@ -0,0 +1,142 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from gol_core import loaders
+
+from .utils import PATTERNS_DIR, load_pattern
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+class LoadersTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        filename = os.path.join(self.directory, name)
+        with open(filename, 'wb') as file:
+            file.write(content)
+
+        return filename
+
+    def test_plaintext(self):
+        """
+        Case: The files in the "patterns" folder are loaded
+        Expected: The cells are the same as read line by line
+        """
+        for name in sorted(os.listdir(PATTERNS_DIR)):
+            rows, cols, cells = load_pattern(name)
+            pattern = loaders.load(os.path.join(PATTERNS_DIR, name))
+
+            self.assertEqual((pattern.rows, pattern.cols), (rows, cols))
+            self.assertEqual(pattern.cells(), tuple(cells))
+
+    def test_rle(self):
+        """
+        Case: A glider in RLE format with comments, a rule and wrapped lines
+        Expected: The glider and the rule are loaded
+        """
+        pattern = loaders.load(self.write('glider.rle', b'#N Glider\n#C A comment\n'
+                                                        b'x = 4, y = 4, rule = B3/S23\n'
+                                                        b'bo$2bo\n$3o$!\n'))
+
+        self.assertEqual((pattern.rows, pattern.cols), (4, 4))
+        self.assertEqual(pattern.rule, 'B3/S23')
+        self.assertEqual(sorted(pattern.live_cells()), sorted(GLIDER))
+
+    def test_rle_chunks(self):
+        """
+        Case: An RLE pattern with multi-digit counts is decoded in tiny chunks
+        Expected: Tokens split over chunks are decoded correctly
+        """
+        data = b'x = 40, y = 25\n12o3b25o$23$b38ob!'
+        chunk_size = loaders._RLE_CHUNK
+        loaders._RLE_CHUNK = 3
+        try:
+            pattern = loaders.loads(data)
+        finally:
+            loaders._RLE_CHUNK = chunk_size
+
+        self.assertEqual(pattern.cells(), loaders.loads(data).cells())
+        self.assertEqual(pattern.population, 12 + 25 + 38)
+        self.assertEqual(pattern.array()[24].tolist(), [0] + [1] * 38 + [0])
+
+    def test_rle_too_wide(self):
+        """
+        Case: A row of an RLE pattern is longer than the header says
+        Expected: A ValueError is raised
+        """
+        with self.assertRaises(ValueError):
+            loaders.loads(b'x = 2, y = 1\n3o!')
+
+    def test_life106(self):
+        """
+        Case: A glider in the Life 1.06 format with negative coordinates
+        Expected: The glider is loaded in its bounding box
+        """
+        pattern = loaders.load(self.write('glider.lif', b'#Life 1.06\n1 -1\n2 0\n0 1\n1 1\n2 1\n'))
+
+        self.assertEqual((pattern.rows, pattern.cols), (3, 3))
+        self.assertEqual(sorted(pattern.live_cells()), sorted(GLIDER))
+
+    def test_centred(self):
+        """
+        Case: A loaded pattern is placed on a larger board
+        Expected: It is moved to the centre, a board which is too small is refused
+        """
+        pattern = loaders.loads(b'x = 3, y = 3\nbo$2bo$3o!').centred(7, 9)
+
+        self.assertEqual(sorted(pattern.live_cells()), sorted((x + 3, y + 2) for x, y in GLIDER))
+
+        with self.assertRaises(ValueError):
+            pattern.centred(2, 2)
+
+    def test_python_parsers(self):
+        """
+        Case: Patterns in all formats are parsed with and without NumPy
+        Expected: - Both parsers load the same cells, sizes and rules
+                  - Patterns loaded without NumPy are centred and counted the same
+                  - Invalid RLE data is refused by both
+        """
+        patterns = [(format, data) for format, data in (
+            ('rle', b'#N Glider\nx = 4, y = 4, rule = B3/S23\nbo$2bo\n$3o$!\n'),
+            ('rle', b'x = 40, y = 25\n12o3b25o$23$b38ob!'),
+            ('life106', b'#Life 1.06\n1 -1\n2 0\n0 1\n1 1\n2 1\n'),
+            ('life106', b'#Life 1.06\n'),
+        )]
+        for name in sorted(os.listdir(PATTERNS_DIR)):
+            with open(os.path.join(PATTERNS_DIR, name), 'rb') as file:
+                patterns.append(('plaintext', file.read()))
+
+        for format, data in patterns:
+            expected = loaders.PARSERS[format](data)
+            actual = loaders.PYTHON_PARSERS[format](data)
+
+            self.assertEqual((actual.rows, actual.cols, actual.rule),
+                             (expected.rows, expected.cols, expected.rule))
+            self.assertEqual(actual.cells(), expected.cells())
+            self.assertEqual(actual.population, expected.population)
+            self.assertEqual(actual.centred(actual.rows + 4, actual.cols + 3).cells(),
+                             expected.centred(expected.rows + 4, expected.cols + 3).cells())
+
+        for data in (b'x = 2, y = 1\n3o!', b'x = 2, y = 1\n2o$o!', b'x = 3, y = 1\no#o!'):
+            with self.assertRaises(ValueError):
+                loaders.parse_rle(data)
+            with self.assertRaises(ValueError):
+                loaders.PYTHON_PARSERS['rle'](data)
+
+    def test_dumps(self):
+        """
+        Case: A loaded plaintext pattern is dumped again
+        Expected: The same cells are loaded from the dump
+        """
+        rows, cols, cells = load_pattern('glider.txt')
+        data = loaders.dumps(rows, cols, cells)
+
+        self.assertEqual(loaders.loads(data).cells(), tuple(cells))
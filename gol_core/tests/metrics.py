@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+from gol_core.metrics import Metrics
+
+from .utils import FakeClock
+
+
+class MetricsTestCase(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.metrics = Metrics(rate_interval=1.0, clock=self.clock)
+
+    def test_generations_per_second(self):
+        """
+        Case: 40 generations are stepped in two seconds
+        Expected: The rate is updated once per interval, the step time per step
+        """
+        for generation in range(41):
+            self.metrics.record_step(generation, .05)
+            self.clock.now += .05
+
+            if generation == 10:
+                self.assertEqual(self.metrics.generations_per_second, 0)
+
+        self.assertAlmostEqual(self.metrics.generations_per_second, 20)
+        self.assertAlmostEqual(self.metrics.step_time, .05)
+        self.assertEqual(self.metrics.generation, 40)
+
+    def test_restart(self):
+        """
+        Case: The generation goes back, like after loading a board
+        Expected: The rate is measured from the new generation on
+        """
+        for generation in (0, 100, 200):
+            self.metrics.record_step(generation, .01)
+            self.clock.now += 1
+
+        self.metrics.record_step(0, .01)
+        self.clock.now += 1
+        self.metrics.record_step(5, .01)
+
+        self.assertAlmostEqual(self.metrics.generations_per_second, 5)
+
+    def test_summary(self):
+        """
+        Case: All counters are recorded
+        Expected: They are all in the summary and the dictionary
+        """
+        self.metrics.record_step(1, .002)
+        self.metrics.record_cells(12, 4)
+        self.metrics.record_draw(.0005)
+        self.metrics.record_dropped(3)
+        self.metrics.record_tiles(9, 2)
+
+        self.assertEqual(self.metrics.summary(),
+                         u'0.0 gen/s, step 2.00 ms, draw 0.50 ms, population 12, '
+                         u'changed 4, tiles evaluated 9, changed 2, dropped 3')
+        self.assertEqual(self.metrics.as_dict()['dropped_frames'], 3)
+        self.assertEqual(self.metrics.as_dict()['population'], 12)
+
+    def test_unknown_cells(self):
+        """
+        Case: No cells are recorded
+        Expected: The summary leaves population and changed cells out
+        """
+        self.assertEqual(self.metrics.summary(),
+                         u'0.0 gen/s, step 0.00 ms, draw 0.00 ms, dropped 0')
@@ -0,0 +1,86 @@
+import multiprocessing
+import random
+from unittest import TestCase
+
+import numpy
+
+from gol import calculate_next_generation
+from gol_core import parallel, vectorized
+from gol_core.stream import generations
+
+from .utils import load_pattern
+
+
+class ParallelEngineTestCase(TestCase):
+
+    def test_same_as_per_cell(self):
+        """
+        Case: A random board is stepped with the per-cell and parallel engine
+        Expected: Both engines produce exactly the same generation
+        """
+        rnd = random.Random(13)
+        cells = tuple(rnd.random() < 0.3 for _ in range(9 * 11))
+
+        self.assertEqual(parallel.calculate_next_generation(9, 11, cells),
+                         calculate_next_generation(9, 11, cells))
+
+    def test_stripes(self):
+        """
+        Case: A random board is split over more workers than there are stripes
+              of a few rows, and stepped for several generations
+        Expected: The result equals the serial vectorized engine
+        """
+        board = (numpy.random.RandomState(17).rand(10, 24) < 0.3).astype(numpy.uint8)
+
+        expected = board
+        for _ in range(7):
+            expected = vectorized.step(expected)
+
+        with parallel.ParallelBoard(board, workers=4) as parallel_board:
+            parallel_board.step(3)
+            parallel_board.step(4)
+
+            self.assertEqual(parallel_board.generation, 7)
+            self.assertTrue(numpy.array_equal(parallel_board.to_array(), expected))
+
+    def test_stream_keeps_workers(self):
+        """
+        Case: A board is streamed with the parallel engine, and the stream is closed early
+        Expected: - The generations match the per-cell engine
+                  - One set of workers runs while streaming, none after closing
+        """
+        rows, cols, cells = load_pattern('gosper-glider-gun.txt')
+        stream = generations(rows, cols, cells, engine='parallel')
+
+        expected = tuple(cells)
+        workers = set()
+        for generation, actual in stream:
+            self.assertEqual(actual, expected)
+            expected = calculate_next_generation(rows, cols, expected)
+            workers.update(multiprocessing.active_children())
+            if generation == 5:
+                break
+
+        self.assertLessEqual(len(workers), multiprocessing.cpu_count())
+        stream.close()
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_dead_worker(self):
+        """
+        Case: One of the workers is killed, then the board is stepped and closed
+        Expected: - A WorkerError instead of waiting forever
+                  - Closing stops the other workers
+        """
+        board = (numpy.random.RandomState(3).rand(12, 16) < 0.3).astype(numpy.uint8)
+
+        parallel_board = parallel.ParallelBoard(board, workers=3)
+        parallel_board.step()
+        process = parallel_board._processes[1]
+        process.terminate()
+        process.join()
+
+        with self.assertRaises(parallel.WorkerError):
+            parallel_board.step(5)
+
+        parallel_board.close()
+        self.assertEqual(multiprocessing.active_children(), [])
@@ -0,0 +1,94 @@
+import time
+from unittest import TestCase
+
+from gol import calculate_next_generation
+from gol_core.cycles import CycleDetector
+from gol_core.engines import diff
+from gol_core.pipeline import GenerationPipeline
+
+from .utils import load_pattern
+
+
+def _wait_for(predicate, timeout=10):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError('Timed out')
+        time.sleep(.001)
+
+
+class GenerationPipelineTestCase(TestCase):
+
+    def setUp(self):
+        self.rows, self.cols, self.cells = load_pattern('glider.txt')
+
+    def test_latest_drops_intermediate_generations(self):
+        """
+        Case: The consumer takes a generation after the producer got ahead
+        Expected: The newest generation is taken and the others are counted as dropped
+        """
+        pipeline = GenerationPipeline(self.rows, self.cols, self.cells, generation=10,
+                                      engine='numpy', lookahead=1000)
+        pipeline.start()
+        _wait_for(lambda: len(pipeline._queue) >= 5)
+        pipeline.stop(wait=True)
+
+        queued = len(pipeline._queue)
+        generation, cells, births, deaths = pipeline.latest()
+
+        self.assertEqual(generation, 10 + queued)
+        self.assertEqual(pipeline.dropped, queued - 1)
+        self.assertIsNone(pipeline.latest())
+
+        expected = tuple(self.cells)
+        for _ in range(queued):
+            expected = calculate_next_generation(self.rows, self.cols, expected)
+        self.assertEqual(cells, expected)
+
+        # The changes are relative to the starting board
+        self.assertEqual((births, deaths), diff(self.cells, cells))
+
+    def test_lookahead_is_bounded(self):
+        """
+        Case: Nothing is taken from the pipeline for a while
+        Expected: The queue never holds more than the lookahead
+        """
+        pipeline = GenerationPipeline(self.rows, self.cols, self.cells, engine='numpy',
+                                      lookahead=4)
+        pipeline.start()
+        _wait_for(lambda: pipeline.dropped >= 10)
+        pipeline.stop(wait=True)
+
+        self.assertEqual(len(pipeline._queue), 4)
+        self.assertFalse(pipeline.finished)
+
+    def test_finishes_when_settled(self):
+        """
+        Case: A blinker is run with a cycle detector
+        Expected: The pipeline finishes by itself and is exhausted once emptied
+        """
+        cells = [False] * 25
+        for index in (11, 12, 13):
+            cells[index] = True
+
+        pipeline = GenerationPipeline(5, 5, cells, detector=CycleDetector())
+        pipeline.start()
+        _wait_for(lambda: pipeline.finished)
+
+        self.assertFalse(pipeline.exhausted)
+        generation, _, _, _ = pipeline.latest()
+        self.assertEqual(generation, 2)
+        self.assertTrue(pipeline.exhausted)
+
+    def test_unsupported_rule(self):
+        """
+        Case: The sparse engine is asked to step a rule with B0
+        Expected: The pipeline finishes with the error instead of dying silently
+        """
+        pipeline = GenerationPipeline(self.rows, self.cols, self.cells, engine='sparse',
+                                      rule='B0/S8')
+        pipeline.start()
+        _wait_for(lambda: pipeline.finished)
+
+        self.assertIsInstance(pipeline.error, ValueError)
+        self.assertTrue(pipeline.exhausted)
@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+from gol_core import protocol
+
+from .utils import load_pattern
+
+
+class ProtocolTestCase(TestCase):
+
+    def setUp(self):
+        self.rows, self.cols, self.cells = load_pattern('gosper-glider-gun.txt')
+
+    def decode(self, data):
+        kind, generation, length = protocol.HEADER.unpack_from(data, 0)
+        self.assertEqual(len(data), protocol.HEADER.size + length)
+
+        return protocol.decode(kind, generation, data[protocol.HEADER.size:])
+
+    def test_keyframe(self):
+        """
+        Case: A board is encoded as a keyframe and decoded
+        Expected: The same board, generation and rule come out
+        """
+        frame = self.decode(protocol.encode_keyframe(
+            12345, self.rows, self.cols, self.cells, 'B36/S23'))
+
+        self.assertEqual(frame.kind, protocol.KEYFRAME)
+        self.assertEqual((frame.generation, frame.rows, frame.cols, frame.rule),
+                         (12345, self.rows, self.cols, 'B36/S23'))
+        self.assertEqual(frame.cells, bytearray(int(cell) for cell in self.cells))
+
+    def test_delta(self):
+        """
+        Case: Unsorted births and deaths are encoded as a delta and decoded
+        Expected: The same indices come out, sorted
+        """
+        frame = self.decode(protocol.encode_delta(7, [40, 3, 1000000], [5]))
+
+        self.assertEqual((frame.kind, frame.generation), (protocol.DELTA, 7))
+        self.assertEqual((frame.births, frame.deaths), ((3, 40, 1000000), (5,)))
+
+        frame = self.decode(protocol.encode_delta(8, [], []))
+        self.assertEqual((frame.births, frame.deaths), ((), ()))
+
+    def test_damaged_frames(self):
+        """
+        Case: A frame of an unknown kind and a delta with too few indices are decoded
+        Expected: ValueError is raised
+        """
+        with self.assertRaises(ValueError):
+            protocol.decode(b'X', 1, b'')
+
+        data = protocol.encode_delta(1, [1, 2], [3])
+        payload = protocol._DELTA.pack(5, 0) + data[protocol.HEADER.size + protocol._DELTA.size:]
+        with self.assertRaises(ValueError):
+            protocol.decode(protocol.DELTA, 1, payload)
+
+    def test_parse_address(self):
+        """
+        Case: Unix socket paths, host:port and bare ports are parsed
+        Expected: The kind and target, ports on the local host by default
+        """
+        self.assertEqual(protocol.parse_address('unix:gol.sock'), ('unix', 'gol.sock'))
+        self.assertEqual(protocol.parse_address('/tmp/gol.sock'), ('unix', '/tmp/gol.sock'))
+        self.assertEqual(protocol.parse_address('localhost:8000'), ('tcp', ('localhost', 8000)))
+        self.assertEqual(protocol.parse_address('8000'), ('tcp', ('127.0.0.1', 8000)))
+        self.assertEqual(protocol.parse_address(':0'), ('tcp', ('127.0.0.1', 0)))
+
+        with self.assertRaises(ValueError):
+            protocol.parse_address('localhost')
@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from gol_core.recording import Recorder, Recording
+from gol_core.stream import generations
+
+from .utils import load_pattern
+
+
+class RecordingTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'run.golr')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_random_access(self):
+        """
+        Case: A run of the glider gun is recorded with a keyframe every 8 generations
+        Expected: Every generation can be read back in any order
+        """
+        rows, cols, cells = load_pattern('gosper-glider-gun.txt')
+        states = [state for _, state in generations(rows, cols, cells, engine='numpy', limit=40)]
+
+        with Recorder(self.filename, rows, cols, keyframe_interval=8) as recorder:
+            for state in states:
+                recorder.add(state)
+
+        with Recording(self.filename) as recording:
+            self.assertEqual(len(recording), len(states))
+            self.assertEqual((recording.rows, recording.cols), (rows, cols))
+
+            for generation in (40, 0, 17, 8, 7, 23):
+                self.assertEqual(recording[generation], states[generation])
+
+            with self.assertRaises(IndexError):
+                recording.array(41)
+
+    def test_compact(self):
+        """
+        Case: A still board is recorded for many generations
+        Expected: The deltas take a few bytes per generation
+        """
+        cells = [False] * (64 * 64)
+        cells[0] = True
+
+        with Recorder(self.filename, 64, 64, keyframe_interval=1000) as recorder:
+            for _ in range(1000):
+                recorder.add(cells)
+
+        self.assertLess(os.path.getsize(self.filename), 1000 * 32 + 64 * 64 // 8)
+
+        with Recording(self.filename) as recording:
+            self.assertEqual(recording[999], tuple(cells))
+
+    def test_not_closed(self):
+        """
+        Case: A recording without an index is opened
+        Expected: A ValueError is raised
+        """
+        recorder = Recorder(self.filename, 2, 2)
+        recorder.add([True, False, False, True])
+        recorder._file.flush()
+
+        with self.assertRaises(ValueError):
+            Recording(self.filename)
+
+        recorder.close()
+
+    def test_header(self):
+        """
+        Case: Files with another magic and another version are opened
+        Expected: A ValueError names what is wrong, with the version read from the file
+        """
+        with Recorder(self.filename, 2, 2) as recorder:
+            recorder.add([True, False, False, True])
+        with open(self.filename, 'rb') as file:
+            data = bytearray(file.read())
+
+        data[4] = 7
+        with open(self.filename, 'wb') as file:
+            file.write(data)
+        with self.assertRaises(ValueError) as context:
+            Recording(self.filename)
+        self.assertIn('version 7', str(context.exception))
+
+        data[:4] = b'GOLC'
+        with open(self.filename, 'wb') as file:
+            file.write(data)
+        with self.assertRaises(ValueError) as context:
+            Recording(self.filename)
+        self.assertEqual(str(context.exception), 'Not a recording')
@@ -0,0 +1,89 @@
+import random
+from unittest import TestCase
+
+from gol import calculate_next_generation
+from gol_core.engines import ENGINES, get_engine
+from gol_core.hashlife import HashLife
+from gol_core.rules import CONWAY, get_rule, parse
+from gol_core.stream import generations
+
+
+class RulesTestCase(TestCase):
+
+    def test_parse(self):
+        """
+        Case: Rulestrings are given in the B/S, S/B and numbers-only notations
+        Expected: They describe the same rules, Conway's Game of Life by default
+        """
+        self.assertEqual(parse('B3/S23'), CONWAY)
+        self.assertEqual(parse('b3s23'), CONWAY)
+        self.assertEqual(parse('S23/B3'), CONWAY)
+        self.assertEqual(parse('23/3'), CONWAY)
+        self.assertEqual(get_rule(None), CONWAY)
+        self.assertEqual(get_rule('HighLife').rulestring, 'B36/S23')
+        self.assertEqual(parse('B2/S').survivals, frozenset())
+
+        for rulestring in ('B9/S23', 'B3/S23/X', 'life'):
+            with self.assertRaises(ValueError):
+                parse(rulestring)
+
+    def test_table(self):
+        """
+        Case: The lookup table of Conway's Game of Life is inspected
+        Expected: The entries match the birth and survival counts
+        """
+        # Dead centre with three neighbours in the top row
+        self.assertEqual(CONWAY.table[0b111000000], 1)
+        # Living centre with two neighbours
+        self.assertEqual(CONWAY.table[0b000111000], 1)
+        # Living centre with four neighbours
+        self.assertEqual(CONWAY.table[0b101010101], 0)
+        self.assertEqual(sum(CONWAY.table), 140)
+
+    def test_engines_agree(self):
+        """
+        Case: Random boards are stepped with other rules by all engines
+        Expected: All engines produce exactly the same generations as the per-cell engine
+        """
+        rnd = random.Random(19)
+        rows, cols = 9, 70
+        cells = tuple(rnd.random() < 0.4 for _ in range(rows * cols))
+
+        for name in ('highlife', 'daynight', 'seeds', 'life-without-death', 'B0/S8'):
+            rule = get_rule(name)
+            expected = [cells]
+            for _ in range(4):
+                expected.append(calculate_next_generation(rows, cols, expected[-1], rule))
+
+            for engine in sorted(ENGINES):
+                if 0 in rule.births and engine in ('sparse', 'hashlife'):
+                    continue
+
+                actual = cells
+                for generation in range(1, 5):
+                    actual = get_engine(engine)(rows, cols, actual, rule)
+                    self.assertEqual(actual, expected[generation], (name, engine, generation))
+
+            stream = generations(rows, cols, cells, engine='numpy', limit=4, rule=rule)
+            self.assertEqual([state for _, state in stream], expected)
+
+    def test_seeds(self):
+        """
+        Case: A board is stepped with Seeds (B2/S)
+        Expected: No cell survives
+        """
+        cells = [True, True, False, False] * 4
+        next_cells = calculate_next_generation(4, 4, cells, 'seeds')
+
+        self.assertFalse(any(a and b for a, b in zip(cells, next_cells)))
+
+    def test_births_from_nothing(self):
+        """
+        Case: A rule with B0 is used with an engine that skips empty space
+        Expected: A ValueError is raised
+        """
+        with self.assertRaises(ValueError):
+            get_engine('sparse')(3, 3, [False] * 9, 'B0/S8')
+
+        with self.assertRaises(ValueError):
+            HashLife(rule='B0/S8')
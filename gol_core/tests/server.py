@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+from gol_core import protocol
+from gol_core.client import RemoteSimulation
+from gol_core.server import SimulationServer, _Subscriber
+from gol_core.stream import generations
+
+from .utils import load_pattern
+
+
+class SimulationServerTestCase(TestCase):
+
+    def setUp(self):
+        self.rows, self.cols, self.cells = load_pattern('gosper-glider-gun.txt')
+        self.expected = {
+            generation: bytearray(int(cell) for cell in cells)
+            for generation, cells in generations(self.rows, self.cols, self.cells, limit=60)}
+
+    def serve(self, address, **kwargs):
+        server = SimulationServer(self.rows, self.cols, self.cells, **kwargs)
+        thread = threading.Thread(target=server.run, args=(address,))
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.close)
+        self.assertTrue(server.listening.wait(10))
+
+        return server
+
+    def follow(self, simulation):
+        """Apply every generation taken from a client to a board, like a display does."""
+        board = None
+        shown = []
+        deadline = time.time() + 30
+        while not simulation.exhausted and time.time() < deadline:
+            latest = simulation.latest()
+            if latest is None:
+                time.sleep(.001)
+                continue
+
+            generation, cells, births, deaths = latest
+            if births is None:
+                board = bytearray(cells)
+            else:
+                for index in births:
+                    board[index] = 1
+                for index in deaths:
+                    board[index] = 0
+
+            self.assertEqual(board, cells)
+            shown.append((generation, bytearray(board)))
+
+        return shown
+
+    def test_clients(self):
+        """
+        Case: Two clients follow a server on a TCP port and a Unix socket
+        Expected: Every generation they show is the expected board, ending with the last one
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        for address in (':0', os.path.join(directory, 'gol.sock')):
+            server = self.serve(address, limit=60, interval=.001)
+
+            simulations = [RemoteSimulation(server.address) for _ in range(2)]
+            for simulation in simulations:
+                simulation.start()
+
+            for simulation in simulations:
+                shown = self.follow(simulation)
+
+                self.assertIsNone(simulation.error)
+                self.assertEqual(shown[-1][0], 60)
+                for generation, board in shown:
+                    self.assertEqual(board, self.expected[generation])
+                self.assertEqual((simulation.rows, simulation.cols, simulation.rule),
+                                 (self.rows, self.cols, 'B3/S23'))
+
+    def test_late_client(self):
+        """
+        Case: A client connects after the simulation finished
+        Expected: It gets the last generation and finishes
+        """
+        server = self.serve(':0', limit=60)
+        deadline = time.time() + 30
+        while not server.finished and time.time() < deadline:
+            time.sleep(.001)
+
+        simulation = RemoteSimulation(server.address)
+        simulation.start()
+
+        self.assertEqual(self.follow(simulation), [(60, self.expected[60])])
+
+    def test_coalescing(self):
+        """
+        Case: A subscriber is published several generations before its frame is taken
+        Expected: One delta holding the cells that changed in total
+        """
+        subscriber = _Subscriber(writer=None)
+        subscriber.publish(0, self.cells, (), ())
+        frame = protocol.decode(protocol.KEYFRAME, 0, subscriber.take(
+            self.rows, self.cols, 'B3/S23')[protocol.HEADER.size:])
+        self.assertEqual(frame.cells, self.expected[0])
+
+        stream = generations(self.rows, self.cols, self.cells, limit=5, deltas=True)
+        next(stream)
+        for generation, cells, births, deaths in stream:
+            subscriber.publish(generation, cells, births, deaths)
+        self.assertEqual(subscriber.coalesced, 4)
+
+        data = subscriber.take(self.rows, self.cols, 'B3/S23')
+        kind, generation, _ = protocol.HEADER.unpack_from(data, 0)
+        frame = protocol.decode(kind, generation, data[protocol.HEADER.size:])
+
+        changed = [index for index, (old, new) in enumerate(zip(self.expected[0],
+                                                                self.expected[5]))
+                   if old != new]
+        self.assertEqual((frame.kind, frame.generation), (protocol.DELTA, 5))
+        self.assertEqual(sorted(frame.births + frame.deaths), changed)
+        self.assertTrue(all(self.expected[5][index] for index in frame.births))
+        self.assertIsNone(subscriber.take(self.rows, self.cols, 'B3/S23'))
+
+    def test_connection_refused(self):
+        """
+        Case: A client connects to an address nobody listens on
+        Expected: The error is raised and the simulation is exhausted
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        simulation = RemoteSimulation(os.path.join(directory, 'missing.sock'))
+        with self.assertRaises(OSError):
+            simulation.start()
+
+        self.assertTrue(simulation.exhausted)
+        self.assertIsNone(simulation.latest())
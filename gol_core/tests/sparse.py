@@ -0,0 +1,102 @@
+import random
+import time
+from unittest import TestCase
+
+from gol import calculate_next_generation
+from gol_core import sparse
+from gol_core.stream import generations
+
+from .utils import load_pattern
+
+
+class SparseEngineTestCase(TestCase):
+
+    def test_torodial(self):
+        """
+        Case: Patterns and random boards are stepped with the per-cell and sparse engine
+        Expected: Both engines produce exactly the same generations
+        """
+        rnd = random.Random(5)
+        boards = [load_pattern(name) for name in ('glider.txt', 'pulsar.txt')]
+        boards.append((7, 13, [rnd.random() < 0.3 for _ in range(7 * 13)]))
+
+        for rows, cols, cells in boards:
+            expected = actual = tuple(cells)
+            for _ in range(8):
+                expected = calculate_next_generation(rows, cols, expected)
+                actual = sparse.calculate_next_generation(rows, cols, actual)
+
+                self.assertEqual(actual, expected)
+
+    def test_unbounded(self):
+        """
+        Case: A glider far away from the origin is stepped on the unbounded plane
+        Expected: After 4 generations it has moved one cell diagonally
+        """
+        glider = set((x + 10 ** 6, y - 10 ** 6) for x, y in
+                     [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)])
+
+        live = glider
+        for _ in range(4):
+            live = sparse.step(live)
+
+        self.assertEqual(live, set((x + 1, y + 1) for x, y in glider))
+
+    def test_wraps_around(self):
+        """
+        Case: A blinker lies across the edge of a torodial board
+        Expected: It oscillates across the edge
+        """
+        live = set([(9, 5), (0, 5), (1, 5)])
+
+        live = sparse.step(live, rows=10, cols=10)
+        self.assertEqual(live, set([(0, 4), (0, 5), (0, 6)]))
+
+        live = sparse.step(live, rows=10, cols=10)
+        self.assertEqual(live, set([(9, 5), (0, 5), (1, 5)]))
+
+    def test_stream_deltas(self):
+        """
+        Case: A glider is streamed with the sparse engine and deltas
+        Expected: The generations and changes match the per-cell engine
+        """
+        rows, cols, cells = load_pattern('glider.txt')
+
+        expected = tuple(cells)
+        for generation, actual, births, deaths in generations(rows, cols, cells, engine='sparse',
+                                                              limit=8, deltas=True):
+            self.assertEqual(actual, expected)
+            next_cells = calculate_next_generation(rows, cols, expected)
+            if generation:
+                self.assertEqual(births, tuple(index for index, cell in enumerate(actual)
+                                               if cell and not previous[index]))
+                self.assertEqual(deaths, tuple(index for index, cell in enumerate(actual)
+                                               if previous[index] and not cell))
+            previous, expected = actual, next_cells
+
+    def test_stream_follows_population(self):
+        """
+        Case: A glider on a nearly empty 1000x1000 board is streamed 1000 generations at once
+        Expected: - It has moved 250 cells diagonally
+                  - The extra generations cost far less than converting the board each time
+        """
+        size = 1000
+        glider = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+        cells = [False] * (size * size)
+        for x, y in glider:
+            cells[y * size + x] = True
+
+        def run(stride):
+            started = time.time()
+            for _, actual in generations(size, size, cells, engine='sparse', stride=stride,
+                                         limit=stride):
+                pass
+            return actual, time.time() - started
+
+        _, single = run(1)
+        actual, thousand = run(1000)
+
+        self.assertEqual(sparse.from_cells(size, actual),
+                         set((x + 250, y + 250) for x, y in glider))
+        # Converting the whole board for every generation took over a minute
+        self.assertLess(thousand - single, 1.0)
@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+from gol import calculate_next_generation
+from gol_core.engines import diff
+from gol_core.stream import generations
+
+from .utils import load_pattern
+
+
+class GenerationStreamTestCase(TestCase):
+
+    def setUp(self):
+        self.rows, self.cols, self.cells = load_pattern('glider.txt')
+
+        self.expected = [tuple(self.cells)]
+        for _ in range(12):
+            self.expected.append(calculate_next_generation(self.rows, self.cols,
+                                                           self.expected[-1]))
+
+    def test_stride_and_limit(self):
+        """
+        Case: Every third generation until generation 12 is requested
+        Expected: Those generations are yielded, with both engines
+        """
+        for engine in ('python', 'numpy'):
+            stream = generations(self.rows, self.cols, self.cells, engine=engine,
+                                 stride=3, limit=12)
+
+            self.assertEqual(list(stream),
+                             [(generation, self.expected[generation])
+                              for generation in (0, 3, 6, 9, 12)])
+
+    def test_until(self):
+        """
+        Case: The stream is stopped by a predicate
+        Expected: The generation which satisfied the predicate is the last one
+        """
+        stream = generations(self.rows, self.cols, self.cells,
+                             until=lambda generation, cells: generation == 4)
+
+        self.assertEqual([generation for generation, _ in stream], [0, 1, 2, 3, 4])
+
+    def test_arrays(self):
+        """
+        Case: Arrays are requested from the numpy engine
+        Expected: Read-only views of the generations are yielded
+        """
+        stream = generations(self.rows, self.cols, self.cells, engine='numpy',
+                             arrays=True, limit=5)
+
+        for generation, array in stream:
+            self.assertFalse(array.flags.writeable)
+            self.assertEqual(tuple(array.astype(bool).ravel().tolist()),
+                             self.expected[generation])
+
+        with self.assertRaises(ValueError):
+            next(generations(self.rows, self.cols, self.cells, arrays=True))
+
+    def test_deltas(self):
+        """
+        Case: Deltas are requested from engines with and without a native implementation
+        Expected: The births and deaths match the differences between the generations
+        """
+        for engine in ('python', 'numpy', 'sparse', 'bitpacked', 'hashlife'):
+            stream = generations(self.rows, self.cols, self.cells, engine=engine,
+                                 deltas=True, limit=12)
+
+            previous = None
+            for generation, cells, births, deaths in stream:
+                self.assertEqual(cells, self.expected[generation])
+                if previous is None:
+                    self.assertEqual((births, deaths), ((), ()))
+                else:
+                    self.assertEqual((births, deaths), diff(previous, cells))
+                previous = cells
+
+        with self.assertRaises(ValueError):
+            next(generations(self.rows, self.cols, self.cells, stride=2, deltas=True))
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import io
+import unicodedata
+from unittest import TestCase
+
+from gol_core.terminal import GLYPHS, HALF_BLOCKS, TerminalRenderer
+
+
+class TerminalRendererTestCase(TestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.time = 0.0
+
+    def clock(self):
+        return self.time
+
+    def renderer(self, **kwargs):
+        return TerminalRenderer(3, 12, stream=self.stream, clock=self.clock, **kwargs)
+
+    def test_first_frame(self):
+        """
+        Case: The first generation is rendered
+        Expected: The screen is cleared and the whole board is drawn
+        """
+        cells = [False] * 36
+        cells[13] = True
+
+        self.renderer().render(1, cells)
+        output = self.stream.getvalue()
+
+        self.assertIn(u'\x1b[2J', output)
+        self.assertIn(u'| █          |', output)
+        self.assertIn(u'Generation: 1', output)
+
+    def test_narrow_glyphs(self):
+        """
+        Case: The glyphs of the cells are looked up in the Unicode database
+        Expected: None of them is a wide character, every cell takes one column
+        """
+        for glyph in GLYPHS + tuple(HALF_BLOCKS.values()):
+            self.assertNotIn(unicodedata.east_asian_width(glyph), ('W', 'F'))
+
+    def test_only_changes(self):
+        """
+        Case: A second generation in which two cells on one row changed
+        Expected: Only those cells are written, in one cursor addressed run
+        """
+        renderer = self.renderer()
+        cells = [False] * 36
+        renderer.render(1, cells)
+        self.stream.seek(0)
+        self.stream.truncate()
+
+        cells[26] = cells[28] = True
+        renderer.render(2, cells)
+
+        self.assertEqual(self.stream.getvalue(),
+                         u'\x1b[4;4H█ █\x1b[6;1HRows: 3, Columns: 12, Generation: 2\x1b[K')
+
+    def test_frame_skipping(self):
+        """
+        Case: Generations come in faster than the target frame rate
+        Expected: Frames are skipped until the next frame is due
+        """
+        renderer = self.renderer(fps=10)
+        cells = [False] * 36
+
+        self.assertTrue(renderer.render(1, cells))
+        self.time = 0.05
+        self.assertFalse(renderer.render(2, cells))
+        self.time = 0.11
+        self.assertTrue(renderer.render(3, cells))
+
+        self.assertEqual((renderer.frames, renderer.skipped), (2, 1))
+
+    def test_half_blocks(self):
+        """
+        Case: A board is drawn with half blocks
+        Expected: Two rows of cells share one line
+        """
+        cells = [False] * 36
+        cells[0] = cells[12] = cells[13] = cells[25] = True
+
+        self.renderer(half_blocks=True).render(1, cells)
+
+        self.assertIn(u'|█▄          |\n| ▀          |', self.stream.getvalue())
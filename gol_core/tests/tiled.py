@@ -0,0 +1,75 @@
+import random
+from unittest import TestCase
+
+import numpy
+
+from gol import calculate_next_generation
+from gol_core import tiled, vectorized
+from gol_core.metrics import Metrics
+from gol_core.stream import generations
+
+from .utils import load_pattern
+
+
+class TiledEngineTestCase(TestCase):
+
+    def test_same_as_per_cell(self):
+        """
+        Case: Random boards with partial edge tiles are stepped
+        Expected: The tiled engine produces the same generations as the per-cell engine
+        """
+        rnd = random.Random(11)
+        for rows, cols in ((7, 13), (20, 20), (2, 5)):
+            expected = actual = tuple(rnd.random() < 0.3 for _ in range(rows * cols))
+            for _ in range(6):
+                expected = calculate_next_generation(rows, cols, expected)
+                actual = tiled.calculate_next_generation(rows, cols, actual)
+
+                self.assertEqual(actual, expected)
+
+    def test_incremental(self):
+        """
+        Case: A glider travels over a board of small tiles for many generations
+        Expected: - The board matches the vectorized engine
+                  - Only the tiles around the glider are evaluated
+                  - Stable tiles are carried over by reference
+        """
+        rows, cols, cells = load_pattern('glider.txt')
+        board = numpy.zeros((128, 128), dtype=numpy.uint8)
+        board[:rows, :cols] = vectorized.to_array(rows, cols, cells)
+
+        tiled_board = tiled.TiledBoard(board, tile_size=8)
+        expected = board
+        for _ in range(100):
+            before = tiled_board.tiles
+            tiled_board.step()
+            expected = vectorized.step(expected)
+
+        self.assertTrue(numpy.array_equal(tiled_board.to_array(), expected))
+        self.assertLessEqual(tiled_board.evaluated, 16)
+        self.assertGreater(tiled_board.evaluated, 0)
+        self.assertIs(tiled_board.tiles[7][0], before[7][0])
+
+    def test_stream_keeps_board(self):
+        """
+        Case: A glider on a large board is streamed with the tiled engine and metrics
+        Expected: - The generations match the per-cell engine
+                  - Only the tiles around the glider are evaluated after the first step
+        """
+        rows, cols, cells = load_pattern('glider.txt')
+        board = numpy.zeros((256, 256), dtype=numpy.uint8)
+        board[:rows, :cols] = vectorized.to_array(rows, cols, cells)
+        cells = tuple(board.astype(bool).ravel().tolist())
+
+        metrics = Metrics()
+        stream = generations(256, 256, cells, engine='tiled', limit=3, metrics=metrics)
+
+        expected = cells
+        evaluated = []
+        for generation, actual in stream:
+            self.assertEqual(actual, expected)
+            expected = calculate_next_generation(256, 256, expected)
+            evaluated.append(metrics.tiles_evaluated)
+
+        self.assertEqual(evaluated[:2], [None, 16])
+        self.assertEqual(evaluated[2:], [9, 9])
@@ -0,0 +1,98 @@
+import io
+import json
+import threading
+import time
+from unittest import TestCase
+
+from gol_core.pipeline import GenerationPipeline
+from gol_core.tracing import Tracer
+
+from .utils import FakeClock, load_pattern
+
+
+class TracerTestCase(TestCase):
+
+    def test_span(self):
+        """
+        Case: A block is traced as a span
+        Expected: A complete event in microseconds on the current thread
+        """
+        tracer = Tracer(clock=FakeClock(tick=.001))
+        with tracer.span('step'):
+            pass
+
+        events = tracer.events()
+        span = events[-1]
+
+        self.assertEqual(span['name'], 'step')
+        self.assertEqual(span['ph'], 'X')
+        self.assertAlmostEqual(span['ts'], 1000)
+        self.assertAlmostEqual(span['dur'], 1000)
+        self.assertEqual(span['tid'], threading.current_thread().ident)
+        self.assertIn({'name': 'thread_name', 'ph': 'M', 'pid': span['pid'],
+                       'tid': span['tid'], 'args': {'name': threading.current_thread().name}},
+                      events)
+
+    def test_ring_buffer(self):
+        """
+        Case: More spans are added than the capacity
+        Expected: Only the most recent spans are kept
+        """
+        tracer = Tracer(capacity=3)
+        for number in range(10):
+            tracer.add(str(number), number, number + 1)
+
+        self.assertEqual(len(tracer), 3)
+        self.assertEqual([event['name'] for event in tracer.events() if event['ph'] == 'X'],
+                         ['7', '8', '9'])
+
+    def test_disabled(self):
+        """
+        Case: Spans are traced while the tracer is disabled
+        Expected: Nothing is recorded
+        """
+        tracer = Tracer(enabled=False)
+        with tracer.span('step'):
+            pass
+
+        self.assertEqual(len(tracer), 0)
+
+    def test_dump(self):
+        """
+        Case: The spans are dumped
+        Expected: A JSON object with the trace events
+        """
+        tracer = Tracer()
+        tracer.add('draw', 1.0, 1.5, 'gtk')
+
+        stream = io.StringIO() if str is not bytes else io.BytesIO()
+        tracer.dump(stream)
+        trace = json.loads(stream.getvalue())
+
+        self.assertEqual(trace['traceEvents'], json.loads(json.dumps(tracer.events())))
+
+    def test_pipeline(self):
+        """
+        Case: A pipeline steps with a tracer
+        Expected: A step span per generation from the pipeline thread, a take span per latest()
+        """
+        rows, cols, cells = load_pattern('glider.txt')
+        tracer = Tracer()
+
+        pipeline = GenerationPipeline(rows, cols, cells, lookahead=1000, tracer=tracer)
+        pipeline.start()
+        while len(pipeline._queue) < 5:
+            time.sleep(.001)
+        pipeline.stop(wait=True)
+
+        queued = len(pipeline._queue)
+        pipeline.latest()
+
+        spans = [event for event in tracer.events() if event['ph'] == 'X']
+        steps = [span for span in spans if span['name'] == 'step']
+        threads = dict((event['tid'], event['args']['name']) for event in tracer.events()
+                       if event['ph'] == 'M')
+
+        self.assertEqual(len(steps), queued)
+        self.assertEqual(set(threads[span['tid']] for span in steps), {'pipeline'})
+        self.assertEqual([span['name'] for span in spans].count('take'), 1)
@@ -0,0 +1,23 @@
+import os
+
+PATTERNS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'patterns')
+
+
+def load_pattern(name):
+    """Load one of the files in the "patterns" folder as (rows, cols, cells)."""
+    with open(os.path.join(PATTERNS_DIR, name)) as file:
+        lines = [line.strip() for line in file if line.strip()]
+
+    return len(lines), len(lines[0]), [x == 'X' for line in lines for x in line]
+
+
+class FakeClock(object):
+    """A clock for the time-based tests, moved on by hand or by `tick` on every reading."""
+
+    def __init__(self, tick=0.0):
+        self.now = 0.0
+        self.tick = tick
+
+    def __call__(self):
+        self.now += self.tick
+        return self.now
@@ -0,0 +1,67 @@
+import random
+from unittest import TestCase
+
+import numpy
+
+from gol import calculate_next_generation
+from gol_core import vectorized
+from gol_core.vectorized import calculate_next_generation as vectorized_next_generation
+
+from .utils import load_pattern
+
+
+class VectorizedEngineTestCase(TestCase):
+
+    def assertSameGenerations(self, rows, cols, cells, generations):
+        expected = actual = tuple(cells)
+        for _ in range(generations):
+            expected = calculate_next_generation(rows, cols, expected)
+            actual = vectorized_next_generation(rows, cols, actual)
+
+            self.assertEqual(actual, expected)
+
+    def test_patterns(self):
+        """
+        Case: The patterns are stepped with the per-cell and vectorized engine
+        Expected: Both engines produce exactly the same generations
+        """
+        for name in ('glider.txt', 'pulsar.txt', 'living-forever-1.txt'):
+            rows, cols, cells = load_pattern(name)
+
+            self.assertSameGenerations(rows, cols, cells, 8)
+
+    def test_random_non_square(self):
+        """
+        Case: A random non-square board wraps around all of its edges
+        Expected: Both engines produce exactly the same generations
+        """
+        rnd = random.Random(42)
+        cells = [rnd.random() < 0.3 for _ in range(7 * 13)]
+
+        self.assertSameGenerations(7, 13, cells, 10)
+
+    def test_result_type(self):
+        """
+        Case: A board is stepped with the vectorized engine
+        Expected: A tuple of booleans is returned like the per-cell engine
+        """
+        result = vectorized_next_generation(3, 3, [False, True, False] * 3)
+
+        self.assertIsInstance(result, tuple)
+        self.assertTrue(all(isinstance(cell, bool) for cell in result))
+
+    def test_double_buffer(self):
+        """
+        Case: Boards are stepped in place with a double buffer
+        Expected: The generations equal the allocating step function
+        """
+        rnd = numpy.random.RandomState(23)
+        for shape in ((1, 5), (2, 2), (13, 7)):
+            board = (rnd.random_sample(shape) < 0.4).astype(numpy.uint8)
+            double_buffer = vectorized.DoubleBuffer(board)
+
+            for _ in range(6):
+                double_buffer.step()
+                board = vectorized.step(board)
+
+                self.assertTrue(numpy.array_equal(double_buffer.current, board))
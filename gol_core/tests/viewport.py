@@ -0,0 +1,137 @@
+import random
+from unittest import TestCase
+
+import numpy
+
+from gol_core.viewport import DensityPyramid, Viewport
+
+
+class ViewportTestCase(TestCase):
+
+    def test_visible(self):
+        """
+        Case: A large board is shown at 10 pixels per cell
+        Expected: Only the cells in the display are visible
+        """
+        viewport = Viewport(rows=1000, cols=2000, width=200, height=100, scale=10)
+        viewport.pan(-55, -25)
+
+        self.assertEqual((viewport.x, viewport.y), (5.5, 2.5))
+        self.assertEqual(viewport.visible(), (5, 2, 26, 13))
+        self.assertEqual(viewport.cell_at(0, 0), (5, 2))
+        self.assertEqual(viewport.to_pixels(6, 3), (5, 5))
+
+    def test_pan_is_clamped(self):
+        """
+        Case: The board is panned beyond its edges
+        Expected: The display stays on the board
+        """
+        viewport = Viewport(rows=100, cols=100, width=200, height=100, scale=10)
+
+        viewport.pan(100, 100)
+        self.assertEqual((viewport.x, viewport.y), (0, 0))
+
+        viewport.pan(-10000, -10000)
+        self.assertEqual((viewport.x, viewport.y), (80, 90))
+
+    def test_zoom_keeps_cell_under_pointer(self):
+        """
+        Case: The display is zoomed in and out around a pixel
+        Expected: The same cell stays under that pixel
+        """
+        viewport = Viewport(rows=1000, cols=1000, width=400, height=400, scale=8)
+        viewport.pan(-2000, -2000)
+        cell = viewport.cell_at(123, 321)
+
+        viewport.zoom(2, 123, 321)
+        self.assertEqual(viewport.scale, 16)
+        self.assertEqual(viewport.cell_at(123, 321), cell)
+
+        viewport.zoom(.125, 123, 321)
+        self.assertEqual(viewport.scale, 2)
+        self.assertEqual(viewport.cell_at(123, 321), cell)
+
+    def test_zoom_out_to_fit(self):
+        """
+        Case: A board is zoomed out far
+        Expected: It stops when the board fits and is centred, with the level of detail matching
+        """
+        viewport = Viewport(rows=100000, cols=50000, width=500, height=500)
+        viewport.zoom(1e-9, 0, 0)
+
+        self.assertEqual(viewport.scale, .005)
+        self.assertEqual(viewport.visible(), (0, 0, 50000, 100000))
+        self.assertEqual(viewport.x, -25000)
+        # Blocks of 128x128 cells are at most one pixel
+        self.assertEqual(viewport.level, 7)
+
+    def test_small_board_is_centred(self):
+        """
+        Case: A board is smaller than the display
+        Expected: It is centred
+        """
+        viewport = Viewport(rows=10, cols=20, width=300, height=300, scale=10)
+
+        self.assertEqual((viewport.x, viewport.y), (-5, -10))
+        self.assertEqual(viewport.visible(), (0, 0, 20, 10))
+
+
+class DensityPyramidTestCase(TestCase):
+
+    def setUp(self):
+        random.seed(3)
+        self.rows, self.cols = 37, 70
+        self.cells = bytearray(random.random() < .3 for _ in range(self.rows * self.cols))
+
+    def _expected(self, cells, level):
+        board = numpy.frombuffer(bytes(cells), dtype=numpy.uint8).reshape(self.rows, self.cols)
+        size = 1 << level
+        rows, cols = -(-self.rows // size), -(-self.cols // size)
+
+        return numpy.array([[board[row * size:(row + 1) * size, col * size:(col + 1) * size].sum()
+                             for col in range(cols)] for row in range(rows)])
+
+    def test_levels(self):
+        """
+        Case: A pyramid is built from an odd sized board
+        Expected: Every level holds the living cells per block, up to a single block
+        """
+        pyramid = DensityPyramid(self.rows, self.cols, self.cells)
+
+        self.assertEqual(pyramid.levels, 7)
+        for level in range(1, pyramid.levels + 1):
+            numpy.testing.assert_array_equal(pyramid.counts(level),
+                                             self._expected(self.cells, level))
+        self.assertEqual(pyramid.counts(pyramid.levels)[0, 0], sum(self.cells))
+
+    def test_update(self):
+        """
+        Case: Cells come to life and die
+        Expected: Updating the pyramid gives the same counts as building it again
+        """
+        pyramid = DensityPyramid(self.rows, self.cols, self.cells)
+
+        changed = random.sample(range(len(self.cells)), 500)
+        for index in changed:
+            self.cells[index] ^= 1
+        pyramid.update(births=[index for index in changed if self.cells[index]],
+                       deaths=[index for index in changed if not self.cells[index]])
+
+        for level in range(1, pyramid.levels + 1):
+            numpy.testing.assert_array_equal(pyramid.counts(level),
+                                             self._expected(self.cells, level))
+
+    def test_density(self):
+        """
+        Case: The density of a region is requested
+        Expected: The fractions of the blocks covering it, with the position of the first block
+        """
+        pyramid = DensityPyramid(4, 8, bytearray([1, 1, 0, 0, 1, 1, 1, 1,
+                                                  1, 0, 0, 0, 1, 1, 1, 1,
+                                                  0, 0, 0, 0, 0, 0, 0, 0,
+                                                  0, 0, 0, 1, 0, 0, 0, 0]))
+
+        density, left, top = pyramid.density(1, 3, 1, 7, 4)
+
+        self.assertEqual((left, top), (1, 0))
+        numpy.testing.assert_array_equal(density, [[0, 1, 1], [.25, 0, 0]])
@@ -0,0 +1,114 @@
+"""Incremental stepping which only recalculates the active tiles of a board.
+
+The board is split into square tiles. A tile can only change when the tile
+itself or one of its eight neighbours (which provide its halo) changed in the
+previous generation. All other tiles are carried over by reference, so the
+cost of a generation depends on the size of the active frontier.
+"""
+import numpy
+
+from gol_core.rules import get_rule
+from gol_core.vectorized import step_padded, to_array
+
+
+class TiledBoard(object):
+    """A torodial board stored as a grid of tiles.
+
+    ``evaluated`` and ``changed`` report the number of tiles which were
+    recalculated and which actually changed in the last generation.
+    """
+
+    def __init__(self, board, tile_size=64, rule=None):
+        self.rows, self.cols = board.shape
+        self.tile_size = tile_size
+        self.rule = get_rule(rule)
+        self.tile_rows = -(-self.rows // tile_size)
+        self.tile_cols = -(-self.cols // tile_size)
+
+        self.tiles = [[board[r * tile_size:(r + 1) * tile_size,
+                             c * tile_size:(c + 1) * tile_size].copy()
+                       for c in range(self.tile_cols)]
+                      for r in range(self.tile_rows)]
+
+        self.active = set((r, c) for r in range(self.tile_rows) for c in range(self.tile_cols))
+        self.generation = 0
+        self.evaluated = 0
+        self.changed = 0
+
+    def _padded(self, r, c):
+        """Return a tile surrounded by a halo from its neighbouring tiles."""
+        tiles = self.tiles
+        top, bottom = (r - 1) % self.tile_rows, (r + 1) % self.tile_rows
+        left, right = (c - 1) % self.tile_cols, (c + 1) % self.tile_cols
+
+        tile = tiles[r][c]
+        padded = numpy.empty((tile.shape[0] + 2, tile.shape[1] + 2), dtype=numpy.uint8)
+
+        padded[1:-1, 1:-1] = tile
+        padded[0, 1:-1] = tiles[top][c][-1]
+        padded[-1, 1:-1] = tiles[bottom][c][0]
+        padded[1:-1, 0] = tiles[r][left][:, -1]
+        padded[1:-1, -1] = tiles[r][right][:, 0]
+
+        padded[0, 0] = tiles[top][left][-1, -1]
+        padded[0, -1] = tiles[top][right][-1, 0]
+        padded[-1, 0] = tiles[bottom][left][0, -1]
+        padded[-1, -1] = tiles[bottom][right][0, 0]
+
+        return padded
+
+    def step(self, generations=1):
+        """Advance the board by the given number of generations."""
+        for _ in range(generations):
+            self._step()
+
+    def _step(self):
+        tiles = [row[:] for row in self.tiles]
+        changed = []
+
+        for r, c in self.active:
+            tile = step_padded(self._padded(r, c), self.rule)
+            if not numpy.array_equal(tile, self.tiles[r][c]):
+                tiles[r][c] = tile
+                changed.append((r, c))
+
+        self.tiles = tiles
+        self.evaluated = len(self.active)
+        self.changed = len(changed)
+        self.active = set(((r + dr) % self.tile_rows, (c + dc) % self.tile_cols)
+                          for r, c in changed
+                          for dr in (-1, 0, 1)
+                          for dc in (-1, 0, 1))
+        self.generation += 1
+
+    def to_array(self):
+        """Return the whole board as a single array."""
+        if not self.tiles:
+            return numpy.zeros((self.rows, self.cols), dtype=numpy.uint8)
+
+        return numpy.block(self.tiles)
+
+    def cells(self):
+        """Return the cells as a flat tuple, like :func:`gol.calculate_next_generation`."""
+        return tuple(self.to_array().astype(bool).ravel().tolist())
+
+    def record_metrics(self, metrics):
+        """Record the tiles of the last generation in a :class:`gol_core.metrics.Metrics`."""
+        metrics.record_tiles(self.evaluated, self.changed)
+
+
+def create_board(rows, cols, cells, rule=None):
+    """Return a :class:`TiledBoard`, kept between generations by :mod:`gol_core.stream`."""
+    return TiledBoard(to_array(rows, cols, cells), rule=rule)
+
+
+def calculate_next_generation(rows, cols, cells, rule=None):
+    """Calculate next generation, see :func:`gol.calculate_next_generation`.
+
+    A new set of tiles is created for every call, :func:`gol_core.stream.generations`
+    keeps a :class:`TiledBoard` between generations to skip the stable tiles.
+    """
+    board = create_board(rows, cols, cells, rule=rule)
+    board.step()
+
+    return board.cells()
@@ -0,0 +1,118 @@
+"""Timeline of what the threads of a run spend their time on.
+
+A :class:`Tracer` records spans (a name, the thread and when it started and
+ended) in a ring buffer, so a long session only keeps its most recent spans
+and memory stays bounded. Recording a span costs two clock readings and an
+append, which is cheap enough to leave tracing on.
+
+:meth:`Tracer.save` writes the spans in the Chrome trace-event format, which
+trace viewers like ``chrome://tracing`` and Perfetto open as a timeline with
+one track per thread.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class _Span(object):
+
+    __slots__ = ('_tracer', '_name', '_category', '_started')
+
+    def __init__(self, tracer, name, category):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+
+    def __enter__(self):
+        self._started = self._tracer._clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._tracer.add(self._name, self._started, self._tracer._clock(), self._category)
+
+
+class _NoSpan(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer(object):
+    """Record spans of time per thread, see the module documentation.
+
+    :param enabled: whether spans are recorded, callers of :meth:`add` check
+        it themselves
+    :param capacity: the number of spans kept, older ones are discarded
+    :param clock: returns the time in seconds
+    """
+
+    def __init__(self, enabled=True, capacity=1 << 16, clock=time.time):
+        self.enabled = enabled
+        self.capacity = capacity
+
+        self._clock = clock
+        # Appending to a deque is atomic, no lock is needed between threads
+        self._spans = deque(maxlen=capacity)
+        self._threads = {}
+
+    def now(self):
+        return self._clock()
+
+    def span(self, name, category='gol'):
+        """Return a context manager recording the time spent in its block."""
+        if not self.enabled:
+            return _NO_SPAN
+
+        return _Span(self, name, category)
+
+    def add(self, name, started, ended, category='gol'):
+        """Record a span of the current thread, times as given by the clock."""
+        thread = threading.current_thread()
+        ident = thread.ident
+        if ident not in self._threads:
+            self._threads[ident] = thread.name
+
+        self._spans.append((name, category, ident, started, ended))
+
+    def __len__(self):
+        return len(self._spans)
+
+    def clear(self):
+        self._spans.clear()
+
+    def events(self):
+        """Return the spans as a list of trace events."""
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': ident,
+                   'args': {'name': name}}
+                  for ident, name in sorted(self._threads.items())]
+
+        for name, category, ident, started, ended in list(self._spans):
+            events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'pid': pid,
+                'tid': ident,
+                # Microseconds
+                'ts': started * 1e6,
+                'dur': (ended - started) * 1e6,
+            })
+
+        return events
+
+    def dump(self, stream):
+        json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, stream)
+
+    def save(self, filename):
+        """Write the spans to a trace-event JSON file."""
+        with open(filename, 'w') as stream:
+            self.dump(stream)
@@ -0,0 +1,157 @@
+"""Vectorized stepping engine based on NumPy.
+
+The board is held as a contiguous two dimensional ``uint8`` array. Neighbours
+are counted with whole-array shifts which wrap around the edges, so the grid
+is torodial just like in :func:`gol.get_new_state`.
+
+The next state of a cell is looked up in the rule (see :mod:`gol_core.rules`)
+without any comparisons: the birth or survival mask is selected by the state
+of the cell and shifted right by its number of living neighbours, the lowest
+bit being the new state. Every rule costs the same.
+"""
+import numpy
+
+from gol_core.rules import get_rule
+
+
+def to_array(rows, cols, cells):
+    """Convert a flat sequence of cells into a ``rows`` x ``cols`` array."""
+    return numpy.array(cells, dtype=numpy.uint8).reshape(rows, cols)
+
+
+def count_neighbours(board):
+    """Count the living neighbours of every cell of the board.
+
+    The three cells of each column are summed first, after which the
+    horizontal shifts only need to be applied once to that partial sum. The
+    last two axes are the rows and columns, so a stack of boards is counted
+    in one go.
+    """
+    vertical = board + numpy.roll(board, 1, axis=-2) + numpy.roll(board, -1, axis=-2)
+
+    return (vertical
+            + numpy.roll(vertical, 1, axis=-1)
+            + numpy.roll(vertical, -1, axis=-1)
+            - board)
+
+
+def apply_rule(number_alive, centre, rule=None):
+    """Return the next state of cells from their living neighbours and state."""
+    rule = get_rule(rule)
+    masks = numpy.multiply(centre, numpy.uint16(rule.survival_mask ^ rule.birth_mask),
+                           dtype=numpy.uint16)
+    masks ^= numpy.uint16(rule.birth_mask)
+    masks >>= number_alive
+
+    return numpy.bitwise_and(masks, 1, out=numpy.empty(masks.shape, dtype=numpy.uint8),
+                             casting='unsafe')
+
+
+def step(board, rule=None):
+    """Calculate the next generation of a ``uint8`` board array (or stack of boards)."""
+    return apply_rule(count_neighbours(board), board, rule)
+
+
+def step_padded(padded, rule=None):
+    """Calculate the next generation of the inner part of a padded board.
+
+    The board is surrounded by a one cell wide halo of neighbouring cells, the
+    returned array is two rows and two columns smaller.
+    """
+    vertical = padded[:-2] + padded[1:-1] + padded[2:]
+    centre = padded[1:-1, 1:-1]
+    number_alive = vertical[:, :-2] + vertical[:, 1:-1] + vertical[:, 2:] - centre
+
+    return apply_rule(number_alive, centre, rule)
+
+
+def _wrapped_sum3(src, out):
+    """Sum every element with its neighbours along the first axis, wrapping around."""
+    numpy.add(src[:-2], src[1:-1], out=out[1:-1])
+    numpy.add(out[1:-1], src[2:], out=out[1:-1])
+
+    numpy.add(src[-1], src[0], out=out[0])
+    numpy.add(out[0], src[1], out=out[0])
+    numpy.add(src[-2], src[-1], out=out[-1])
+    numpy.add(out[-1], src[0], out=out[-1])
+
+
+def changes(board, next_board):
+    """Return the flat indices of the births and deaths between two boards."""
+    births = numpy.flatnonzero(next_board > board)
+    deaths = numpy.flatnonzero(next_board < board)
+
+    return births, deaths
+
+
+class DoubleBuffer(object):
+    """Step a board in place, alternating between two preallocated buffers.
+
+    Apart from the two boards only the scratch space for the neighbour count
+    is allocated, once, so stepping does not allocate any memory. ``current``
+    is only valid until the next call of :meth:`step`.
+    """
+
+    def __init__(self, board, rule=None):
+        board = numpy.ascontiguousarray(board, dtype=numpy.uint8)
+
+        self.rule = get_rule(rule)
+        self._births = numpy.uint16(self.rule.birth_mask)
+        self._difference = numpy.uint16(self.rule.survival_mask ^ self.rule.birth_mask)
+
+        self._buffers = [board.copy(), numpy.empty_like(board)]
+        self._index = 0
+
+        self._vertical = numpy.empty_like(board)
+        self._number_alive = numpy.empty(board.shape, dtype=numpy.uint16)
+        self._masks = numpy.empty(board.shape, dtype=numpy.uint16)
+
+    @property
+    def current(self):
+        return self._buffers[self._index]
+
+    def step(self):
+        board = self._buffers[self._index]
+        result = self._buffers[1 - self._index]
+
+        if min(board.shape) < 2:
+            result[...] = step(board, self.rule)
+        else:
+            number_alive = self._number_alive
+            masks = self._masks
+
+            _wrapped_sum3(board, self._vertical)
+            _wrapped_sum3(self._vertical.T, number_alive.T)
+            numpy.subtract(number_alive, board, out=number_alive)
+
+            # See apply_rule
+            numpy.multiply(board, self._difference, out=masks)
+            numpy.bitwise_xor(masks, self._births, out=masks)
+            numpy.right_shift(masks, number_alive, out=masks)
+            numpy.bitwise_and(masks, 1, out=result, casting='unsafe')
+
+        self._index = 1 - self._index
+
+    def changes(self):
+        """Return the births and deaths of the last step, see :func:`changes`.
+
+        The previous generation is still in the other buffer.
+        """
+        return changes(self._buffers[1 - self._index], self._buffers[self._index])
+
+
+def calculate_next_generation(rows, cols, cells, rule=None):
+    """Calculate next generation, see :func:`gol.calculate_next_generation`."""
+    board = step(to_array(rows, cols, cells), rule)
+
+    return tuple(board.astype(bool).ravel().tolist())
+
+
+def calculate_next_generation_delta(rows, cols, cells, rule=None):
+    """Calculate next generation and changes, see :func:`gol.calculate_next_generation_delta`."""
+    board = to_array(rows, cols, cells)
+    next_board = step(board, rule)
+    births, deaths = changes(board, next_board)
+
+    return (tuple(next_board.astype(bool).ravel().tolist()),
+            tuple(births.tolist()), tuple(deaths.tolist()))
@@ -0,0 +1,178 @@
+"""A zoomable view on a board and density mipmaps to draw it zoomed out.
+
+A :class:`Viewport` maps between the pixels of a display and the cells of a
+board, for a scale (pixels per cell) and an offset. A display only reads and
+draws the cells in :meth:`Viewport.visible`, however large the board is.
+
+Below one pixel per cell a display draws from a :class:`DensityPyramid`
+instead. Level ``k`` of the pyramid counts the living cells of every
+``2**k`` x ``2**k`` block of the board, and :attr:`Viewport.level` picks the
+level at which a block is at most one pixel. The number of blocks to draw
+therefore only depends on the size of the display. Changed cells update the
+counts of every level, so the pyramid is never recalculated while running.
+"""
+import math
+
+import numpy
+
+
+class Viewport(object):
+    """The part of a board shown in a ``width`` x ``height`` pixel display.
+
+    ``x`` and ``y`` are the cell coordinates (fractional) of the top left
+    pixel. Boards smaller than the display are centred.
+    """
+
+    def __init__(self, rows, cols, width, height, scale=10.0, max_scale=64.0):
+        self.rows = rows
+        self.cols = cols
+        self.width = width
+        self.height = height
+        self.max_scale = max_scale
+
+        self.x = self.y = 0.0
+        self.scale = self._clamp_scale(scale)
+        self._clamp_offset()
+
+    @property
+    def min_scale(self):
+        """The scale at which the whole board fits, or one pixel per cell for small boards."""
+        fit = min(float(self.width) / max(self.cols, 1), float(self.height) / max(self.rows, 1))
+
+        return min(fit, 1.0)
+
+    def _clamp_scale(self, scale):
+        return max(self.min_scale, min(scale, self.max_scale))
+
+    def _clamp_offset(self):
+        visible_cols = self.width / self.scale
+        visible_rows = self.height / self.scale
+
+        if visible_cols >= self.cols:
+            self.x = (self.cols - visible_cols) / 2
+        else:
+            self.x = max(0.0, min(self.x, self.cols - visible_cols))
+
+        if visible_rows >= self.rows:
+            self.y = (self.rows - visible_rows) / 2
+        else:
+            self.y = max(0.0, min(self.y, self.rows - visible_rows))
+
+    def resize(self, width, height):
+        """Change the size of the display, keeping the top left cell in place."""
+        self.width, self.height = width, height
+        self.scale = self._clamp_scale(self.scale)
+        self._clamp_offset()
+
+    def pan(self, dx, dy):
+        """Move the board ``dx`` and ``dy`` pixels."""
+        self.x -= dx / self.scale
+        self.y -= dy / self.scale
+        self._clamp_offset()
+
+    def zoom(self, factor, pixel_x, pixel_y):
+        """Multiply the scale, keeping the cell under the given pixel in place."""
+        x, y = self.x + pixel_x / self.scale, self.y + pixel_y / self.scale
+
+        self.scale = self._clamp_scale(self.scale * factor)
+        self.x, self.y = x - pixel_x / self.scale, y - pixel_y / self.scale
+        self._clamp_offset()
+
+    def cell_at(self, pixel_x, pixel_y):
+        """Return the ``(pos_x, pos_y)`` of the cell at a pixel, it may be off the board."""
+        return (int(math.floor(self.x + pixel_x / self.scale)),
+                int(math.floor(self.y + pixel_y / self.scale)))
+
+    def to_pixels(self, pos_x, pos_y):
+        """Return the pixel of the top left corner of a cell."""
+        return (pos_x - self.x) * self.scale, (pos_y - self.y) * self.scale
+
+    def visible(self):
+        """Return the ``(left, top, right, bottom)`` cells in view, right and bottom exclusive."""
+        return (max(0, int(math.floor(self.x))),
+                max(0, int(math.floor(self.y))),
+                min(self.cols, int(math.ceil(self.x + self.width / self.scale))),
+                min(self.rows, int(math.ceil(self.y + self.height / self.scale))))
+
+    @property
+    def level(self):
+        """The pyramid level to draw from, 0 for the cells themselves."""
+        if self.scale >= 1:
+            return 0
+
+        return int(math.floor(math.log(1 / self.scale, 2)))
+
+
+def _level_dtype(level):
+    # The largest count of a level is 4 ** level
+    if level <= 3:
+        return numpy.uint8
+    if level <= 7:
+        return numpy.uint16
+
+    return numpy.uint32
+
+
+def _as_array(cells):
+    if isinstance(cells, (bytes, bytearray)):
+        return numpy.frombuffer(cells, dtype=numpy.uint8)
+
+    return numpy.asarray(cells, dtype=numpy.uint8)
+
+
+class DensityPyramid(object):
+    """Counts of living cells per block, see the module documentation.
+
+    Levels start at 1 (2x2 blocks) and go up until a single block covers the
+    whole board.
+    """
+
+    def __init__(self, rows, cols, cells):
+        self.rows = rows
+        self.cols = cols
+
+        counts = _as_array(cells).reshape(rows, cols)
+        self._levels = [None]
+        while counts.shape[0] > 1 or counts.shape[1] > 1:
+            level = len(self._levels)
+            height, width = counts.shape
+            padded = numpy.zeros((height + height % 2, width + width % 2),
+                                 dtype=_level_dtype(level))
+            padded[:height, :width] = counts
+
+            counts = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).sum(
+                axis=(1, 3), dtype=_level_dtype(level))
+            self._levels.append(counts)
+
+    @property
+    def levels(self):
+        """The highest level."""
+        return len(self._levels) - 1
+
+    def counts(self, level):
+        return self._levels[level]
+
+    def update(self, births=(), deaths=()):
+        """Count the cells which came to life and died, given as indices."""
+        for indices, update in ((births, numpy.add.at), (deaths, numpy.subtract.at)):
+            if not len(indices):
+                continue
+
+            rows, cols = numpy.divmod(numpy.asarray(indices, dtype=numpy.int64), self.cols)
+            for level in range(1, len(self._levels)):
+                counts = self._levels[level]
+                update(counts, (rows >> level, cols >> level), counts.dtype.type(1))
+
+    def density(self, level, left, top, right, bottom):
+        """Return the living fraction of the blocks covering cells, right and bottom exclusive.
+
+        Returns the fractions as an array together with the column and row of
+        its first block.
+        """
+        mask = (1 << level) - 1
+        block_left, block_top = left >> level, top >> level
+        block_right, block_bottom = (right + mask) >> level, (bottom + mask) >> level
+
+        counts = self._levels[level][block_top:block_bottom, block_left:block_right]
+
+        return counts / float(4 ** level), block_left, block_top
@@ -4,6 +4,7 @@ import logging
 
 from gi.repository import Gtk
 
+from gol_core.engines import DEFAULT_ENGINE, ENGINES
 from gol_gtk.main import GameOfLiveGtk
 
 logger = logging.getLogger()
@@ -15,8 +16,34 @@ if __name__ == '__main__':
     logger.addHandler(logging.StreamHandler(stream=sys.stdout))
     logger.setLevel(logging.DEBUG)
 
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Conway\'s Game of Life')
+    parser.add_argument('--engine', choices=sorted(ENGINES),
+                        help='stepping engine to use (default: {}, or the engine of a resumed '
+                             'checkpoint)'.format(DEFAULT_ENGINE))
+    parser.add_argument('--trace', metavar='FILE',
+                        help='write a timeline of stepping and drawing to a trace-event JSON '
+                             'file on exit')
+    parser.add_argument('--checkpoint', metavar='FILE',
+                        help='periodically write a checkpoint while running, and on pause')
+    parser.add_argument('--checkpoint-interval', type=float, default=60, metavar='SECONDS',
+                        help='seconds between two checkpoints (default: %(default)s)')
+    parser.add_argument('--resume', action='store_true',
+                        help='start from the checkpoint file if it exists')
+    parser.add_argument('--connect', metavar='ADDRESS',
+                        help='show the generations of a server (see gol.py --serve) instead of '
+                             'stepping the board')
+    args = parser.parse_args()
+
+    if args.resume and not args.checkpoint:
+        parser.error('--resume needs --checkpoint')
+
     logger.info('Start Game Of Life GTK version.')
 
-    game = GameOfLiveGtk(title='Conway\'s Game of Life')
+    game = GameOfLiveGtk(title='Conway\'s Game of Life', trace_filename=args.trace,
+                         checkpoint_filename=args.checkpoint,
+                         checkpoint_interval=args.checkpoint_interval, resume=args.resume,
+                         address=args.connect, engine=args.engine)
 
     Gtk.main()
\ No newline at end of file
@@ -1,11 +1,19 @@
 import logging
-import threading
+import os
+import socket
 import time
 
-from gi.repository import Gtk, Gio
+from gi.repository import Gtk, Gio, GLib
 
+from gol_core.checkpoint import Checkpointer
+from gol_core.client import RemoteSimulation
+from gol_core.cycles import CycleDetector
+from gol_core.metrics import Metrics
+from gol_core.pipeline import GenerationPipeline
+from gol_core.rules import RULES, get_rule
+from gol_core.tracing import Tracer
 from gol_gtk.model import GameOfLifeModel
-from gol_gtk.services import quit_, load_file, next_generation
+from gol_gtk.services import quit_, load_checkpoint, load_file
 from gol_gtk.widgets.grid import GameOfLiveGrid
 
 logger = logging.getLogger(__name__)
@@ -16,24 +24,69 @@ class GameOfLiveGtk(Gtk.Window):
     _model = None
     _sleep = 1
     _run = False
-    _game_thread = None
+    _auto_stop = False
+    _lookahead = 16
+    _pipeline = None
+    _published = None
+    # Whether the board or rule changed since the pipeline started
+    _stale = False
+    _tick_id = None
+
+    _metrics = None
+    # Seconds between two updates of the metrics label
+    _metrics_interval = .25
+    _metrics_shown = 0
+    _population = 0
+
+    _tracer = None
+    _trace_filename = None
+
+    _checkpoint_filename = None
+    _checkpoint_interval = 60
+    _checkpointer = None
+
+    # Address of the simulation server to show, None to step the board here
+    _address = None
 
     _start_stop_button_image_play = Gtk.Image.new_from_stock(Gtk.STOCK_MEDIA_PLAY, Gtk.IconSize.BUTTON)
     _start_stop_button_image_pause = Gtk.Image.new_from_stock(Gtk.STOCK_MEDIA_PAUSE, Gtk.IconSize.BUTTON)
 
     _widget_grid = None
     _widget_header_bar = None
+    _widget_play_pause_button = None
+    _widget_metrics_label = None
 
-    def __init__(self, title, *args, **kwargs):
+    def __init__(self, title, trace_filename=None, checkpoint_filename=None,
+                 checkpoint_interval=60, resume=False, address=None, engine=None,
+                 *args, **kwargs):
         Gtk.Window.__init__(self, title=title)
 
         # super(GameOfLiveGtk, self).__init__(*args, **kwargs)
 
         self.set_border_width(6)
-        self.set_resizable(False)
-        self.connect('destroy', lambda _: quit_())
+        self.connect('destroy', self.on_destroy)
 
+        self._trace_filename = trace_filename
+        self._tracer = Tracer(enabled=trace_filename is not None)
+        self._metrics = Metrics(enabled=False)
         self._model = GameOfLifeModel(cols=50, rows=50, grid_data=[False for _ in range(50 * 50)])
+        self._model.connect('cells-changed', self.on_cells_edited)
+        self._model.connect('notify::rule', self.on_rule_changed)
+        self._model.connect('notify::engine', self.on_engine_changed)
+
+        self._address = address
+        self._checkpoint_filename = checkpoint_filename
+        self._checkpoint_interval = checkpoint_interval
+        if resume and os.path.exists(checkpoint_filename):
+            try:
+                load_checkpoint(checkpoint_filename, self._model)
+            except ValueError as error:
+                logger.error('Could not resume from {}: {}'.format(checkpoint_filename, error))
+            else:
+                logger.info('Resumed from {} at generation {}'.format(checkpoint_filename,
+                                                                      self._model.generation))
+        if engine is not None:
+            self._model.set_property('engine', engine)
 
         self.init_window()
 
@@ -60,7 +113,10 @@ class GameOfLiveGtk(Gtk.Window):
 
         grid.attach(gol_grid, 0, 0, 4, 1)
 
-        grid.attach(self.init_generation_label(), 0, 1, 1, 1)
+        status = Gtk.Box(spacing=6)
+        status.pack_start(self.init_generation_label(), False, False, 0)
+        status.pack_start(self.init_metrics_label(), False, False, 0)
+        grid.attach(status, 0, 1, 1, 1)
         grid.attach(Gtk.Separator(orientation=Gtk.Orientation.VERTICAL), 1, 1, 1, 1)
         grid.attach(Gtk.Label.new('Speed: '), 2, 1, 1, 1)
         grid.attach(self.init_speed_slider(), 3, 1, 1, 1)
@@ -70,6 +126,13 @@ class GameOfLiveGtk(Gtk.Window):
         grid.attach(Gtk.Label.new('Columns: '), 2, 2, 1, 1)
         grid.attach(self.init_cols_input(), 3, 2, 1, 1)
 
+        grid.attach(self.init_auto_stop_toggle(), 0, 3, 4, 1)
+
+        grid.attach(Gtk.Label.new('Rule: '), 0, 4, 1, 1)
+        grid.attach(self.init_rule_input(), 1, 4, 3, 1)
+
+        grid.attach(self.init_metrics_toggle(), 0, 5, 4, 1)
+
         self.add(grid)
 
     def init_rows_input(self):
@@ -97,6 +160,8 @@ class GameOfLiveGtk(Gtk.Window):
         button.set_image(image)
         button.connect('clicked', self.on_play_pause_clicked)
 
+        self._widget_play_pause_button = button
+
         return button
 
     def init_file_open_button(self):
@@ -116,18 +181,58 @@ class GameOfLiveGtk(Gtk.Window):
         return button
 
     def init_gol_grid(self):
-        gol_grid = GameOfLiveGrid(data_provider=self._model)
+        gol_grid = GameOfLiveGrid(data_provider=self._model, metrics=self._metrics,
+                                  tracer=self._tracer)
+
+        self._widget_grid = gol_grid
 
         return gol_grid
 
     def init_speed_slider(self):
-        adjustment = Gtk.Adjustment(1, 0.1, 5, 0.1)
+        # Seconds between two generations, 0 calculates at full speed
+        adjustment = Gtk.Adjustment(1, 0, 5, 0.1)
 
         slider = Gtk.Scale.new(Gtk.Orientation.HORIZONTAL, adjustment)
         slider.connect('value-changed', self.on_speed_slider_value_changed)
 
         return slider
 
+    def init_auto_stop_toggle(self):
+        toggle = Gtk.CheckButton.new_with_label('Stop when the board settles')
+        toggle.set_active(self._auto_stop)
+        toggle.connect('toggled', self.on_auto_stop_toggled)
+
+        return toggle
+
+    def init_metrics_toggle(self):
+        toggle = Gtk.CheckButton.new_with_label('Show metrics')
+        toggle.set_active(self._metrics.enabled)
+        toggle.connect('toggled', self.on_metrics_toggled)
+
+        return toggle
+
+    def init_metrics_label(self):
+        label = Gtk.Label()
+        # Only shown while the metrics are enabled
+        label.set_no_show_all(True)
+
+        self._widget_metrics_label = label
+
+        return label
+
+    def init_rule_input(self):
+        combo = Gtk.ComboBoxText.new_with_entry()
+        for name in sorted(RULES):
+            combo.append(RULES[name].rulestring, '{} ({})'.format(RULES[name].rulestring, name))
+
+        entry = combo.get_child()
+        entry.set_text(self._model.rule)
+
+        combo.connect('changed', self.on_rule_input_changed)
+        self._model.connect('notify::rule', self.on_rule_update, entry)
+
+        return combo
+
     def init_generation_label(self):
         text = 'Generation: {}'
 
@@ -141,6 +246,129 @@ class GameOfLiveGtk(Gtk.Window):
     def on_speed_slider_value_changed(self, scale_widget):
         self._sleep = scale_widget.get_value()
 
+        if self._pipeline is not None:
+            self._pipeline.interval = self._sleep
+
+    def on_rule_input_changed(self, combo_widget):
+        # A rule from the list or a typed rulestring
+        text = combo_widget.get_active_id() or combo_widget.get_child().get_text()
+
+        try:
+            rulestring = get_rule(text).rulestring
+        except ValueError:
+            return
+
+        if rulestring != self._model.rule:
+            self._model.set_property('rule', rulestring)
+
+    def on_rule_update(self, model, rule, entry_widget):
+        # List items read like "B36/S23 (highlife)"
+        try:
+            shown = get_rule(entry_widget.get_text().split(' ')[0]).rulestring
+        except ValueError:
+            shown = None
+
+        if shown != model.rule:
+            entry_widget.set_text(model.rule)
+
+    def on_rule_changed(self, model, rule):
+        self._stale = True
+
+    def on_engine_changed(self, model, engine):
+        self._stale = True
+
+    def on_auto_stop_toggled(self, toggle_widget):
+        self._auto_stop = toggle_widget.get_active()
+
+    def on_settled(self, detector):
+        logger.info('Settled at generation {} with period {}'.format(detector.onset,
+                                                                    detector.period))
+        self._widget_play_pause_button.set_image(self._start_stop_button_image_play)
+
+    def on_metrics_toggled(self, toggle_widget):
+        self._metrics.enabled = toggle_widget.get_active()
+
+        if self._metrics.enabled:
+            self._population = sum(self._model.grid_data)
+            self._metrics.record_cells(self._population)
+            self._widget_metrics_label.set_text(self._metrics.summary())
+            self._widget_metrics_label.show()
+        else:
+            self._widget_metrics_label.hide()
+
+    def on_cells_edited(self, model, indices, rectangle):
+        self._stale = True
+
+    def on_frame(self, widget, frame_clock):
+        """Show the newest calculated generation, once per frame.
+
+        Runs in the main loop, so the model is only ever updated from there.
+        Generations calculated since the previous frame are skipped.
+        """
+        if self._address is None and (self._stale or self._model.grid_data is not self._published):
+            # The board was edited or loaded or the rule changed, continue from there
+            self.start_pipeline()
+            return GLib.SOURCE_CONTINUE
+
+        pipeline = self._pipeline
+        latest = pipeline.latest()
+        if latest is not None:
+            generation, cells, births, deaths = latest
+            if births is None:
+                # The board of the server, shown as a whole
+                self.show_remote_board(generation, cells)
+                births = deaths = ()
+            else:
+                # Includes the handlers of the model's signals, painting the cells
+                with self._tracer.span('model update', 'gtk'):
+                    self._model.apply_delta(births, deaths,
+                                            generations=generation - self._model.generation)
+
+            metrics = self._metrics
+            if metrics.enabled:
+                self._population += len(births) - len(deaths)
+                metrics.record_cells(self._population, len(births) + len(deaths))
+
+                now = time.time()
+                if now - self._metrics_shown >= self._metrics_interval:
+                    self._metrics_shown = now
+                    self._widget_metrics_label.set_text(metrics.summary())
+
+            logger.debug('Show generation: {} ({} dropped so far)'.format(
+                generation, pipeline.dropped))
+        elif pipeline.exhausted:
+            self.stop()
+            if pipeline.error is not None:
+                logger.error('Stopped at generation {}: {}'.format(self._model.generation,
+                                                                   pipeline.error))
+            elif pipeline.detector is not None:
+                self.on_settled(pipeline.detector)
+            else:
+                # The server finished or went away
+                self._widget_play_pause_button.set_image(self._start_stop_button_image_play)
+
+        return GLib.SOURCE_CONTINUE
+
+    def show_remote_board(self, generation, cells):
+        pipeline = self._pipeline
+
+        self._model.reset(cols=pipeline.cols, rows=pipeline.rows, grid_data=cells)
+        self._model.set_property('generation', generation)
+        self._model.set_property('rule', pipeline.rule)
+        self._published = self._model.grid_data
+
+        if self._metrics.enabled:
+            self._population = sum(self._published)
+
+    def on_destroy(self, widget):
+        self.stop_checkpoints()
+
+        if self._tracer.enabled:
+            self._tracer.save(self._trace_filename)
+            logger.info('Trace written to {}'.format(self._trace_filename))
+
+        quit_()
+
     def on_rows_update(self, model, rows, input_widget):
         input_widget.set_text(str(model.rows))
 
@@ -159,10 +387,12 @@ class GameOfLiveGtk(Gtk.Window):
         )
 
         # Add filters
-        filter_text = Gtk.FileFilter()
-        filter_text.set_name("Text files")
-        filter_text.add_mime_type("text/plain")
-        dialog.add_filter(filter_text)
+        filter_patterns = Gtk.FileFilter()
+        filter_patterns.set_name("Patterns (plaintext, RLE, Life 1.06)")
+        filter_patterns.add_mime_type("text/plain")
+        for pattern in ("*.rle", "*.lif", "*.life", "*.cells"):
+            filter_patterns.add_pattern(pattern)
+        dialog.add_filter(filter_patterns)
 
         response = dialog.run()
         if response == Gtk.ResponseType.OK:
@@ -188,22 +418,81 @@ class GameOfLiveGtk(Gtk.Window):
             self.start()
             widget.set_image(self._start_stop_button_image_pause)
 
-    def start(self):
-
-        def calculate_generations_loop():
-            while self._run:
-                next_generation(model=self._model)
-
-                logger.debug('Calculate generation: {}'.format(self._model.generation))
+    def start_pipeline(self):
+        """(Re)start calculating ahead from the current state of the model."""
+        if self._pipeline is not None:
+            self._pipeline.stop()
+
+        if self._address is not None:
+            # Edits are not sent, the server's board replaces the model
+            self._pipeline = RemoteSimulation(self._address)
+            try:
+                self._pipeline.start()
+            except (socket.error, ValueError) as error:
+                logger.error('Could not connect to {}: {}'.format(self._address, error))
+            return
+
+        # Stepping replaces the contents of the buffer, a reset replaces the buffer
+        self._published = self._model.grid_data
+        self._stale = False
+        if self._metrics.enabled:
+            self._population = sum(self._published)
+
+        if self._checkpoint_filename:
+            self.stop_checkpoints()
+            self._checkpointer = Checkpointer(self._checkpoint_filename,
+                                              rows=self._model.rows,
+                                              cols=self._model.cols,
+                                              rule=self._model.rule,
+                                              engine=self._model.engine,
+                                              interval=self._checkpoint_interval)
+
+        self._pipeline = GenerationPipeline(
+            rows=self._model.rows,
+            cols=self._model.cols,
+            cells=bytearray(self._published),
+            generation=self._model.generation,
+            engine=self._model.engine,
+            lookahead=self._lookahead,
+            interval=self._sleep,
+            detector=CycleDetector() if self._auto_stop else None,
+            rule=self._model.rule,
+            metrics=self._metrics,
+            tracer=self._tracer,
+            checkpointer=self._checkpointer
+        )
+        self._pipeline.start()
 
-                time.sleep(self._sleep)
+    def start(self):
 
         self._run = True
 
-        self._game_thread = threading.Thread(target=calculate_generations_loop)
-        self._game_thread.daemon = True
-        self._game_thread.start()
+        self.start_pipeline()
+        self._tick_id = self._widget_grid.add_tick_callback(self.on_frame)
 
     def stop(self):
 
         self._run = False
+
+        if self._tick_id is not None:
+            self._widget_grid.remove_tick_callback(self._tick_id)
+            self._tick_id = None
+
+        if self._pipeline is not None:
+            self._pipeline.stop()
+            self._pipeline = None
+
+        self.stop_checkpoints()
+
+    def stop_checkpoints(self):
+        """Write a checkpoint of the board on display and stop checkpointing."""
+        if self._checkpointer is None:
+            return
+
+        checkpointer, self._checkpointer = self._checkpointer, None
+        checkpointer.offer(self._model.generation, self._model.grid_data, force=True)
+        checkpointer.close()
+
+        if checkpointer.error:
+            logger.warning('Could not write checkpoint {}: {}'.format(checkpointer.filename,
+                                                                      checkpointer.error))
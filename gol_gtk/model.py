@@ -2,43 +2,165 @@ import logging
 
 from gi.repository import GObject
 
+from gol_core.engines import DEFAULT_ENGINE
+
 logger = logging.getLogger(__name__)
 
 
+def _line(x0, y0, x1, y1):
+    """Yield the cells on a straight line between two cells (Bresenham)."""
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    step_x = 1 if x0 < x1 else -1
+    step_y = 1 if y0 < y1 else -1
+    error = dx + dy
+
+    while True:
+        yield x0, y0
+        if (x0, y0) == (x1, y1):
+            return
+
+        double_error = 2 * error
+        if double_error >= dy:
+            error += dy
+            x0 += step_x
+        if double_error <= dx:
+            error += dx
+            y0 += step_y
+
+
+class CellEdit(object):
+    """A batch of cell changes, see :meth:`GameOfLifeModel.edit`.
+
+    Cells outside of the board are ignored.
+    """
+
+    def __init__(self, model):
+        self._model = model
+        self.changed = set()
+
+    def set(self, pos_x, pos_y, state):
+        model = self._model
+        if not (0 <= pos_x < model.cols and 0 <= pos_y < model.rows):
+            return
+
+        index = (model.cols * pos_y) + pos_x
+        state = int(bool(state))
+
+        if model.grid_data[index] != state:
+            model.grid_data[index] = state
+            self.changed.add(index)
+
+    def line(self, x0, y0, x1, y1, state):
+        """Set all cells of a brush stroke from one cell to another."""
+        for pos_x, pos_y in _line(x0, y0, x1, y1):
+            self.set(pos_x, pos_y, state)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._model.commit(self)
+
+
 class GameOfLifeModel(GObject.GObject):
+    """The board, stored as a ``bytearray`` with one byte (0 or 1) per cell.
+
+    Stepping replaces the contents of the buffer and notifies ``grid-data``,
+    unless the changes are known: :meth:`apply_delta` only touches the changed
+    cells and emits ``delta`` with the births and deaths. Edits change the
+    buffer in place and only emit ``cells-changed`` with the indices of the
+    changed cells and the ``(x, y, width, height)`` rectangle around them.
+    """
+
+    __gsignals__ = {
+        'cells-changed': (GObject.SignalFlags.RUN_FIRST, None, (object, object)),
+        'delta': (GObject.SignalFlags.RUN_FIRST, None, (object, object)),
+    }
 
     cols = GObject.property(type=GObject.TYPE_INT, default=0, flags=GObject.PARAM_READWRITE)
     rows = GObject.property(type=GObject.TYPE_INT, default=0, flags=GObject.PARAM_READWRITE)
     grid_data = GObject.property(type=GObject.TYPE_PYOBJECT, flags=GObject.PARAM_READWRITE)
     generation = GObject.property(type=GObject.TYPE_INT, default=0, flags=GObject.PARAM_READWRITE)
+    # Rulestring, see gol_core.rules
+    rule = GObject.property(type=GObject.TYPE_STRING, default='B3/S23', flags=GObject.PARAM_READWRITE)
+    # Stepping engine, see gol_core.engines
+    engine = GObject.property(type=GObject.TYPE_STRING, default=DEFAULT_ENGINE,
+                              flags=GObject.PARAM_READWRITE)
 
     def __init__(self, cols=0, rows=0, grid_data=list()):
         GObject.GObject.__init__(self)
 
         self.reset(cols=cols, rows=rows, grid_data=grid_data)
 
-    def next_generation(self, grid_data):
+    def next_generation(self, grid_data, generations=1):
         """Populate with data for the next generation.
 
-        This increases the generation counter.
+        This increases the generation counter, by more than one when
+        intermediate generations were skipped.
         """
         assert len(grid_data) == self.rows * self.cols
 
-        self.set_property('grid_data', grid_data)
-        self.set_property('generation', self.get_property('generation') + 1)
+        self.grid_data[:] = bytearray(grid_data)
+        self.notify('grid-data')
+        self.set_property('generation', self.get_property('generation') + generations)
+
+    def apply_delta(self, births, deaths, generations=1):
+        """Advance to a next generation given by the cells which changed.
+
+        ``births`` and ``deaths`` are the indices of the cells which came to
+        life and died, see :func:`gol.calculate_next_generation_delta`.
+        """
+        grid_data = self.grid_data
+        for index in births:
+            grid_data[index] = 1
+        for index in deaths:
+            grid_data[index] = 0
+
+        self.emit('delta', births, deaths)
+        self.set_property('generation', self.get_property('generation') + generations)
+
+    def region(self, left, top, right, bottom):
+        """Return the cells of a rectangle as a ``bytearray``, row by row.
+
+        Right and bottom are exclusive. Only the rows of the rectangle are read.
+        """
+        grid_data = self.grid_data
+        cols = self.cols
+
+        return bytearray().join(grid_data[row * cols + left:row * cols + right]
+                                for row in range(top, bottom))
 
     def reset(self, cols=0, rows=0, grid_data=list()):
         """Reset to given or empty state."""
         self.set_property('cols', cols)
         self.set_property('rows', rows)
-        self.set_property('grid_data', grid_data)
+        self.set_property('grid_data', bytearray(grid_data))
         self.set_property('generation', 0)
 
-    def set_cell_state(self, pos_x, pos_y, state):
-        """Set state (alive/death) of given cell"""
-        index = (self.cols * pos_y) + pos_x
+    def edit(self):
+        """Start a batch of edits, use it as a context manager.
+
+        All changes are announced with a single ``cells-changed`` signal when
+        the batch ends::
+
+            with model.edit() as edit:
+                edit.line(0, 0, 10, 5, True)
+        """
+        return CellEdit(self)
 
-        grid_data = list(self.grid_data)
-        grid_data[index] = state
+    def commit(self, edit):
+        """Announce the changes of a batch of edits."""
+        if not edit.changed:
+            return
 
-        self.set_property('grid_data', tuple(grid_data))
+        indices = sorted(edit.changed)
+        xs = [index % self.cols for index in indices]
+        ys = [index // self.cols for index in indices]
+        rectangle = (min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1)
+
+        self.emit('cells-changed', indices, rectangle)
+
+    def set_cell_state(self, pos_x, pos_y, state):
+        """Set state (alive/death) of given cell"""
+        with self.edit() as edit:
+            edit.set(pos_x, pos_y, state)
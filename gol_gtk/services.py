@@ -2,7 +2,9 @@ import logging
 
 from gi.repository import Gtk
 
-from gol import calculate_next_generation
+from gol_core import checkpoint
+from gol_core.loaders import load
+from gol_core.rules import get_rule
 
 logger = logging.getLogger(__name__)
 
@@ -13,27 +15,22 @@ def quit_():
     Gtk.main_quit()
 
 
-def next_generation(model):
-    model.next_generation(calculate_next_generation(rows=model.rows,
-                                                    cols=model.cols,
-                                                    cells=model.grid_data))
-
-
 def load_file(filename, model):
-        cols = None
-        rows = 0
-        cells = []
+    pattern = load(filename)
+
+    model.reset(cols=pattern.cols, rows=pattern.rows, grid_data=pattern.cells())
 
-        file = open(filename)
+    if pattern.rule:
+        try:
+            model.set_property('rule', get_rule(pattern.rule).rulestring)
+        except ValueError:
+            logger.warning('Unsupported rule {} in {}'.format(pattern.rule, filename))
 
-        for line in file:
-            line = line.strip()
-            if cols is None:
-                cols = len(line)
-            else:
-                assert cols == len(line)
 
-            cells += [x == 'X' for x in line]
-            rows += 1
+def load_checkpoint(filename, model):
+    resumed = checkpoint.load(filename)
 
-        model.reset(cols=cols, rows=rows, grid_data=cells)
\ No newline at end of file
+    model.reset(cols=resumed.cols, rows=resumed.rows, grid_data=resumed.cells())
+    model.set_property('generation', resumed.generation)
+    model.set_property('rule', resumed.rule)
+    model.set_property('engine', resumed.engine)
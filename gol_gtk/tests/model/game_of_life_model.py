@@ -29,11 +29,23 @@ class GameOfLifModelTestCase(TestCase):
         model.next_generation([False, True, False, False])
 
         self.assertEqual(model.generation, current_generation + 1)
-        self.assertEqual(model.grid_data, [False, True, False, False])
+        self.assertEqual(list(model.grid_data), [False, True, False, False])
 
         self.assertEqual(grid_data_event_callback.call_count, 1)
         self.assertEqual(generation_event_callback.call_count, 1)
 
+    def test_skipped_generations(self):
+        """
+        Case: A generation is given after intermediate generations were skipped
+        Expected: The generation counter is increased by the number of generations
+        """
+
+        model = GameOfLifeModel(rows=2, cols=2, grid_data=[False for _ in range(4)])
+
+        model.next_generation([False, True, False, False], generations=5)
+
+        self.assertEqual(model.generation, 5)
+
     def test_wrong_grid_size(self):
 
         model = GameOfLifeModel()  # empty grid
@@ -51,19 +63,119 @@ class GameOfLifModelTestCase(TestCase):
 
         self.assertEqual(model.rows, 2)
         self.assertEqual(model.cols, 2)
-        self.assertEqual(model.grid_data, [False, False, False, False])
+        self.assertEqual(list(model.grid_data), [False, False, False, False])
         self.assertEqual(model.generation, 0)
 
         model.reset()  # Reset to empty state
 
         self.assertEqual(model.rows, 0)
         self.assertEqual(model.cols, 0)
-        self.assertEqual(model.grid_data, [])
+        self.assertEqual(list(model.grid_data), [])
         self.assertEqual(model.generation, 0)
 
         model.reset(rows=3, cols=3, grid_data=[False for _ in range(9)])
 
         self.assertEqual(model.rows, 3)
         self.assertEqual(model.cols, 3)
-        self.assertEqual(model.grid_data, [False, False, False, False, False, False, False, False, False])
-        self.assertEqual(model.generation, 0)
\ No newline at end of file
+        self.assertEqual(list(model.grid_data),
+                         [False, False, False, False, False, False, False, False, False])
+        self.assertEqual(model.generation, 0)
+
+    def test_set_cell_state(self):
+        """
+        Case: A single cell is set
+        Expected: The buffer is changed in place and the changed cell is announced
+        """
+
+        cells_changed_callback = mock.MagicMock()
+        grid_data_event_callback = mock.MagicMock()
+
+        model = GameOfLifeModel(rows=2, cols=3, grid_data=[False for _ in range(6)])
+        buffer = model.grid_data
+
+        model.connect('cells-changed', cells_changed_callback)
+        model.connect('notify::grid-data', grid_data_event_callback)
+
+        model.set_cell_state(pos_x=2, pos_y=1, state=True)
+
+        self.assertIs(model.grid_data, buffer)
+        self.assertEqual(list(model.grid_data), [False, False, False, False, False, True])
+
+        cells_changed_callback.assert_called_once_with(model, [5], (2, 1, 1, 1))
+        self.assertEqual(grid_data_event_callback.call_count, 0)
+
+    def test_edit_line(self):
+        """
+        Case: A brush stroke is drawn in a batch of edits
+        Expected:
+            - The cells between both ends are set
+            - Cells outside of the board are ignored
+            - One signal with all changed cells and their rectangle is emitted
+        """
+
+        cells_changed_callback = mock.MagicMock()
+
+        model = GameOfLifeModel(rows=4, cols=4, grid_data=[False for _ in range(16)])
+        model.connect('cells-changed', cells_changed_callback)
+
+        with model.edit() as edit:
+            edit.line(0, 0, 3, 3, True)
+            edit.set(4, 0, True)
+
+        self.assertEqual(cells_changed_callback.call_count, 1)
+        cells_changed_callback.assert_called_once_with(model, [0, 5, 10, 15], (0, 0, 4, 4))
+
+    def test_edit_without_changes(self):
+        """
+        Case: A batch of edits sets cells to the state they already have
+        Expected: No signal is emitted
+        """
+
+        cells_changed_callback = mock.MagicMock()
+
+        model = GameOfLifeModel(rows=2, cols=2, grid_data=[True, False, False, False])
+        model.connect('cells-changed', cells_changed_callback)
+
+        with model.edit() as edit:
+            edit.set(0, 0, True)
+            edit.set(1, 1, False)
+
+        self.assertEqual(cells_changed_callback.call_count, 0)
+
+    def test_apply_delta(self):
+        """
+        Case: A next generation is given as births and deaths
+        Expected:
+            - Only the given cells are changed
+            - The delta is broadcast instead of a grid data notification
+            - The generation counter is increased
+        """
+
+        delta_callback = mock.MagicMock()
+        grid_data_event_callback = mock.MagicMock()
+
+        model = GameOfLifeModel(rows=2, cols=2, grid_data=[True, False, True, False])
+
+        model.connect('delta', delta_callback)
+        model.connect('notify::grid-data', grid_data_event_callback)
+
+        model.apply_delta(births=(1, 3), deaths=(0,), generations=2)
+
+        self.assertEqual(list(model.grid_data), [False, True, True, True])
+        self.assertEqual(model.generation, 2)
+
+        delta_callback.assert_called_once_with(model, (1, 3), (0,))
+        self.assertEqual(grid_data_event_callback.call_count, 0)
+
+    def test_region(self):
+        """
+        Case: The cells of a rectangle are requested
+        Expected: Only those cells are returned, row by row
+        """
+
+        model = GameOfLifeModel(rows=3, cols=4, grid_data=[0, 1, 2, 3,
+                                                            4, 5, 6, 7,
+                                                            8, 9, 10, 11])
+
+        self.assertEqual(model.region(1, 1, 3, 3), bytearray([5, 6, 9, 10]))
+        self.assertEqual(model.region(0, 0, 0, 3), bytearray())
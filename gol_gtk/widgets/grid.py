@@ -1,33 +1,76 @@
 import logging
+import math
+import time
 
+import cairo
+import numpy
 from gi.repository import Gdk, Gtk, GObject
 
+from gol_core.viewport import DensityPyramid, Viewport
+
 logger = logging.getLogger(__name__)
 
+# Zoom factor of one step of the scroll wheel
+ZOOM_STEP = 1.25
+# Largest size (in pixels) the grid asks for, larger boards are browsed by
+# zooming and panning
+MAX_SIZE_REQUEST = 600
+
 
 class GameOfLiveGrid(Gtk.DrawingArea):
+    """Zoomable and pannable view on the board of a model.
+
+    Scroll to zoom, drag with the middle or right button to pan and with the
+    left button to bring cells to life. Only the visible part of the board is
+    read and drawn. Below one pixel per cell the board is drawn from a
+    :class:`gol_core.viewport.DensityPyramid`, in grey levels.
+    """
 
     # Percentage (0 - 1)
     cell_spacing = GObject.property(type=GObject.TYPE_FLOAT,
                                     default=0.1,
                                     flags=GObject.PARAM_READWRITE)
 
-    # width & height of one cell in pixels
+    # width & height of one cell in pixels when a board is shown
     cell_size = GObject.property(type=GObject.TYPE_INT,
                                  default=10,
                                  flags=GObject.PARAM_READWRITE)
 
     _data_provider = None
-
-    def __init__(self, data_provider, *args, **kwargs):
+    _metrics = None
+    _tracer = None
+
+    _viewport = None
+    # Living cells per block, built once zoomed out below one pixel per cell
+    # and kept up to date from then on
+    _pyramid = None
+
+    # Backing surface with the visible cells painted on it, together with the
+    # view it was painted for and the grid data it shows
+    _surface = None
+    _surface_view = None
+    _surface_grid_data = None
+
+    # Cell under the pointer when it last painted, to continue the stroke from
+    _last_painted_cell = None
+    # Pointer position while panning
+    _pan_position = None
+
+    def __init__(self, data_provider, metrics=None, tracer=None, *args, **kwargs):
         super(GameOfLiveGrid, self).__init__(*args, **kwargs)
 
         self._init_data_provider(data_provider)
+        self._metrics = metrics
+        self._tracer = tracer
+
+        self.set_hexpand(True)
+        self.set_vexpand(True)
 
         self.connect('draw', self.on_draw)
         self.connect('configure-event', self.on_configure_event)
         self.connect('button-press-event', self.on_button_press_event)
         self.connect('motion-notify-event', self.on_motion_notify_event)
+        self.connect('scroll-event', self.on_scroll_event)
 
         # Ask to receive events the drawing area doesn't normally
         # subscribe to
@@ -35,19 +78,125 @@ class GameOfLiveGrid(Gtk.DrawingArea):
                         | Gdk.EventMask.LEAVE_NOTIFY_MASK  # the pointer has left the window.
                         | Gdk.EventMask.BUTTON_PRESS_MASK  # a mouse button has been pressed.
                         | Gdk.EventMask.POINTER_MOTION_MASK  # the pointer (usually a mouse) has moved.
-                        | Gdk.EventMask.POINTER_MOTION_HINT_MASK)
+                        | Gdk.EventMask.POINTER_MOTION_HINT_MASK
+                        | Gdk.EventMask.SCROLL_MASK  # the scroll wheel has been turned.
+                        | Gdk.EventMask.SMOOTH_SCROLL_MASK)
 
     def _init_data_provider(self, data_provider):
 
         self._data_provider = data_provider
 
         data_provider.connect('notify::grid-data', self.on_grid_data_update)
+        data_provider.connect('cells-changed', self.on_cells_changed)
+        data_provider.connect('delta', self.on_delta)
+
+    @property
+    def viewport(self):
+        """The :class:`gol_core.viewport.Viewport`, following the board and widget size."""
+        provider = self._data_provider
+        width, height = self.get_allocated_width(), self.get_allocated_height()
+        viewport = self._viewport
+
+        if viewport is None or (viewport.rows, viewport.cols) != (provider.rows, provider.cols):
+            # A new board, the pyramid of the old one is of no use
+            self._pyramid = None
+
+            scale = self.cell_size
+            if width > 1 and height > 1:
+                # Show large boards as a whole
+                scale = min(scale, float(width) / max(provider.cols, 1),
+                            float(height) / max(provider.rows, 1))
+
+            viewport = self._viewport = Viewport(provider.rows, provider.cols, width, height,
+                                                 scale=scale)
+            self.set_size_request(min(provider.cols * self.cell_size, MAX_SIZE_REQUEST),
+                                  min(provider.rows * self.cell_size, MAX_SIZE_REQUEST))
+        elif (viewport.width, viewport.height) != (width, height):
+            viewport.resize(width, height)
+
+        return viewport
+
+    def _view(self):
+        viewport = self.viewport
+        spacing = int(round(viewport.scale * self.cell_spacing)) if viewport.scale >= 1 else 0
+
+        return (viewport.rows, viewport.cols, viewport.width, viewport.height,
+                viewport.x, viewport.y, viewport.scale, spacing)
 
     def on_grid_data_update(self, model, gdata_grid_data):
-        self.queue_draw()
+        grid_data = model.grid_data
+
+        if self._surface_grid_data is None or len(grid_data) != len(self._surface_grid_data):
+            # Another board, repaint everything on the next draw
+            self._surface = None
+            self._surface_grid_data = None
+            self._pyramid = None
+            self.queue_draw()
+            return True
+
+        changed = [index for index, (old, new) in enumerate(zip(self._surface_grid_data, grid_data))
+                   if old != new]
+
+        self._update_cells(changed, grid_data)
+
+        return True
+
+    def on_delta(self, model, births, deaths):
+        """Paint the births and deaths of a generation, nothing has to be compared."""
+        self._update_cells(list(births) + list(deaths), model.grid_data)
+
+        return True
+
+    def on_cells_changed(self, model, indices, rectangle):
+        """Paint edited cells, the model tells which ones so nothing is compared."""
+        self._update_cells(indices, model.grid_data)
 
         return True
 
+    def _update_cells(self, indices, grid_data):
+        """Take changed cells into account and queue the visible ones for drawing."""
+        if not indices or self._surface_grid_data is None:
+            # Nothing painted yet, the first draw paints everything
+            return
+
+        for index in indices:
+            self._surface_grid_data[index] = grid_data[index]
+        if self._pyramid is not None:
+            self._pyramid.update(births=[index for index in indices if grid_data[index]],
+                                 deaths=[index for index in indices if not grid_data[index]])
+
+        view = self._view()
+        if self._surface is None or view != self._surface_view:
+            self._surface = None
+            self.queue_draw()
+            return
+
+        viewport = self._viewport
+        left, top, right, bottom = viewport.visible()
+        cols = viewport.cols
+        visible = [index for index in indices
+                   if left <= index % cols < right and top <= index // cols < bottom]
+        if not visible:
+            return
+
+        if viewport.level:
+            # A changed cell changes the grey level of its block, the visible
+            # blocks are redrawn as a whole
+            self._surface = None
+            self.queue_draw()
+            return
+
+        self._paint_cells(cairo.Context(self._surface), visible, grid_data)
+
+        # Only the changed cells need to be copied to the screen
+        damage = cairo.Region([cairo.RectangleInt(*self._damage_rectangle(index))
+                               for index in visible])
+        if self._tracer is not None and self._tracer.enabled:
+            with self._tracer.span('queue_draw', 'gtk'):
+                self.queue_draw_region(damage)
+        else:
+            self.queue_draw_region(damage)
+
     def on_configure_event(self, drawing_area, event):
         logger.debug('configure-event')
 
@@ -57,85 +206,194 @@ class GameOfLiveGrid(Gtk.DrawingArea):
         logger.debug('button-press-event')
 
         if event.button == 1:
+            self._last_painted_cell = self.cell_at_position(event.x, event.y)
             self.enable_cell_by_position(event.x, event.y)
+        elif event.button in (2, 3):
+            self._pan_position = (event.x, event.y)
 
         return True
 
     def on_motion_notify_event(self, drawing_area, event):
         (window, x, y, state) = event.window.get_pointer()
 
-        if state & Gdk.ModifierType.BUTTON1_MASK:
-            self.enable_cell_by_position(x, y)
+        if state & (Gdk.ModifierType.BUTTON2_MASK | Gdk.ModifierType.BUTTON3_MASK):
+            last_x, last_y = self._pan_position or (x, y)
+            self.viewport.pan(x - last_x, y - last_y)
+            self._pan_position = (x, y)
+            self.queue_draw()
+            return True
 
-        return True
+        self._pan_position = None
 
-    def on_draw(self, drawing_area, cairo_context):
-        logger.debug('Handle Draw-event')
+        if not state & Gdk.ModifierType.BUTTON1_MASK:
+            self._last_painted_cell = None
+            return True
 
-        # Get available width and height of visible drawing area
-        width = drawing_area.get_allocated_width()
-        height = drawing_area.get_allocated_height()
+        # Motion events are sparse when the pointer moves fast, fill the gap
+        # since the previous event with a line of cells
+        pos_x, pos_y = self.cell_at_position(x, y)
+        last_x, last_y = self._last_painted_cell or (pos_x, pos_y)
 
-        cell_spacing = self.cell_spacing
-        cell_size = self.cell_size
+        with self._data_provider.edit() as edit:
+            edit.line(last_x, last_y, pos_x, pos_y, True)
 
-        cols = self._data_provider.cols
-        rows = self._data_provider.rows
-        grid_data = self._data_provider.grid_data
+        self._last_painted_cell = (pos_x, pos_y)
 
-        def is_alive(x, y):
-            try:
-                return grid_data[(cols * y + x)]
-            except IndexError:
-                return False
+        return True
 
-        # Calculate spacing size to whole pixel size
-        spacing_size = float(cell_size) * cell_spacing
-        spacing_size = int(round(spacing_size))
+    def on_scroll_event(self, drawing_area, event):
+        if event.direction == Gdk.ScrollDirection.UP:
+            factor = ZOOM_STEP
+        elif event.direction == Gdk.ScrollDirection.DOWN:
+            factor = 1 / ZOOM_STEP
+        elif event.direction == Gdk.ScrollDirection.SMOOTH:
+            _, _, delta_y = event.get_scroll_deltas()
+            factor = ZOOM_STEP ** -delta_y
+        else:
+            return False
+
+        self.viewport.zoom(factor, event.x, event.y)
+        self.queue_draw()
 
-        # Set correct size
-        widget_width = (cell_size * cols) + (spacing_size * cols + 1)
-        widget_height = (cell_size * rows) + (spacing_size * rows + 1)
+        return True
 
-        drawing_area.set_size_request(widget_width, widget_height)
+    def on_draw(self, drawing_area, cairo_context):
+        logger.debug('Handle Draw-event')
 
-        pos_y = spacing_size
-        current_row = 0
+        measure = self._metrics is not None and self._metrics.enabled
+        if measure:
+            started = time.time()
+        tracing = self._tracer is not None and self._tracer.enabled
+        if tracing:
+            trace_started = self._tracer.now()
 
-        while pos_y < height and current_row < rows:
-            pos_x = spacing_size
-            current_col = 0
-            while pos_x < width and current_col < cols:
-                if is_alive(current_col, current_row):
-                    cairo_context.set_source_rgb(0, 0, 0)
-                else:
-                    cairo_context.set_source_rgb(1, 1, 1)
+        view = self._view()
 
-                # If we're outside the clip this will do nothing.
-                cairo_context.rectangle(pos_x, pos_y,
-                                        cell_size,
-                                        cell_size)
-                cairo_context.fill()
+        if self._surface is None or view != self._surface_view:
+            self._repaint_surface(view, self._data_provider.grid_data)
 
-                pos_x += spacing_size + cell_size
-                current_col += 1
+        # Painting is limited to the clip, which covers the damaged area
+        cairo_context.set_source_surface(self._surface, 0, 0)
+        cairo_context.paint()
 
-            pos_y += spacing_size + cell_size
-            current_row += 1
+        if measure:
+            self._metrics.record_draw(time.time() - started)
+        if tracing:
+            self._tracer.add('draw', trace_started, self._tracer.now(), 'gtk')
 
         return True
 
-    def enable_cell_by_position(self, x, y):
+    def _cell_rectangle(self, index):
+        viewport = self._viewport
+        spacing = self._surface_view[-1]
+        current_row, current_col = divmod(index, viewport.cols)
+        x, y = viewport.to_pixels(current_col, current_row)
+
+        return x + spacing, y + spacing, viewport.scale - spacing, viewport.scale - spacing
+
+    def _damage_rectangle(self, index):
+        x, y, width, height = self._cell_rectangle(index)
+
+        return (int(math.floor(x)), int(math.floor(y)),
+                int(math.ceil(width)) + 1, int(math.ceil(height)) + 1)
+
+    def _paint_cells(self, cairo_context, indices, grid_data):
+        """Paint the given cells, with a single fill per colour."""
+        alive = []
+        dead = []
+        for index in indices:
+            is_alive = index < len(grid_data) and grid_data[index]
+            (alive if is_alive else dead).append(self._cell_rectangle(index))
+
+        self._paint_rectangles(cairo_context, alive, dead)
+
+    def _paint_rectangles(self, cairo_context, alive, dead):
+        for colour, rectangles in (((0, 0, 0), alive), ((1, 1, 1), dead)):
+            if not rectangles:
+                continue
+
+            cairo_context.set_source_rgb(*colour)
+            for rectangle in rectangles:
+                cairo_context.rectangle(*rectangle)
+            cairo_context.fill()
+
+    def _paint_image(self, cairo_context, values, pos_x, pos_y, block):
+        """Paint an array of living fractions (0 - 1) per block of cells in grey levels.
+
+        ``pos_x`` and ``pos_y`` are the cell of the top left corner of the
+        first block, ``block`` the number of cells a block is wide and high.
+        """
+        grey = (255 - numpy.rint(values * 255.0)).astype(numpy.uint32)
+        height, width = grey.shape
+
+        stride = cairo.ImageSurface.format_stride_for_width(cairo.FORMAT_RGB24, width)
+        pixels = numpy.zeros((height, stride // 4), dtype=numpy.uint32)
+        pixels[:, :width] = (grey << 16) | (grey << 8) | grey
+        image = cairo.ImageSurface.create_for_data(pixels, cairo.FORMAT_RGB24, width, height,
+                                                   stride)
+
+        viewport = self._viewport
+        scale = viewport.scale * block
+
+        cairo_context.save()
+        cairo_context.translate(*viewport.to_pixels(pos_x, pos_y))
+        cairo_context.scale(scale, scale)
+        cairo_context.set_source_surface(image, 0, 0)
+        # Blocks of a few pixels stay sharp, smaller ones are averaged
+        cairo_context.get_source().set_filter(cairo.FILTER_NEAREST if scale >= 1
+                                              else cairo.FILTER_GOOD)
+        cairo_context.rectangle(0, 0, width, height)
+        cairo_context.fill()
+        cairo_context.restore()
+
+    def _repaint_surface(self, view, grid_data):
+        """Paint the visible part of the board, at most about one block per pixel."""
+        viewport = self._viewport
+        spacing = view[-1]
+
+        # Outside of the board and the spacing between the cells stays transparent
+        self._surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, max(viewport.width, 1),
+                                           max(viewport.height, 1))
+        self._surface_view = view
+        if self._surface_grid_data is None or len(self._surface_grid_data) != len(grid_data):
+            self._surface_grid_data = bytearray(grid_data)
+
+        left, top, right, bottom = viewport.visible()
+        if right <= left or bottom <= top:
+            return
+
+        cairo_context = cairo.Context(self._surface)
+        level = viewport.level
+
+        if level:
+            if self._pyramid is None:
+                self._pyramid = DensityPyramid(viewport.rows, viewport.cols, grid_data)
+
+            density, block_left, block_top = self._pyramid.density(level, left, top, right, bottom)
+            self._paint_image(cairo_context, density, block_left << level, block_top << level,
+                              1 << level)
+            return
+
+        region = self._data_provider.region(left, top, right, bottom)
+        if spacing:
+            cols = viewport.cols
+            width = right - left
+            alive = []
+            dead = []
+            for offset, is_alive in enumerate(region):
+                rectangle = self._cell_rectangle((top + offset // width) * cols + left + offset % width)
+                (alive if is_alive else dead).append(rectangle)
+
+            self._paint_rectangles(cairo_context, alive, dead)
+        else:
+            cells = numpy.frombuffer(bytes(region), dtype=numpy.uint8)
+            self._paint_image(cairo_context, cells.reshape(bottom - top, right - left), left, top, 1)
+
+    def cell_at_position(self, x, y):
+        """Return the ``(pos_x, pos_y)`` of the cell underneath the given coordinates."""
+        return self.viewport.cell_at(x, y)
 
-        # Calculate which cell is underneath the given coordinates
-        cell_spacing = self.cell_spacing
-        cell_size = self.cell_size
-
-        # Calculate spacing size to whole pixel size
-        spacing_size = float(cell_size) * cell_spacing
-        spacing_size = int(round(spacing_size))
-
-        pos_x = (x - (cell_spacing * 2)) / (spacing_size + cell_size)
-        pos_y = (y - (cell_spacing * 2)) / (spacing_size + cell_size)
+    def enable_cell_by_position(self, x, y):
+        pos_x, pos_y = self.cell_at_position(x, y)
 
-        self._data_provider.set_cell_state(pos_x=int(round(pos_x)), pos_y=int(round(pos_y)), state=True)
+        self._data_provider.set_cell_state(pos_x=pos_x, pos_y=pos_y, state=True)